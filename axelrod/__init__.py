@@ -5,7 +5,7 @@ from .version import __version__
 from .load_data_ import load_pso_tables, load_weights
 from . import graph
 from .action import Action
-from .random_ import random_choice, seed, Pdf
+from .random_ import random_choice, seed, derive_seed, Pdf
 from .plot import Plot
 from .game import DefaultGame, Game
 from .player import (
@@ -16,9 +16,15 @@ from .match import Match
 from .moran import MoranProcess, ApproximateMoranProcess
 from .case import CaseProcess, ApproximateCaseProcess
 from .strategies import *
-from .deterministic_cache import DeterministicCache
+from .deterministic_cache import (BoundedDeterministicCache,
+                                  DeterministicCache,
+                                  PersistentDeterministicCache,
+                                  SharedDeterministicCache)
 from .match_generator import *
+from .session import Session
 from .tournament import Tournament
+from .sweep import TournamentSweep
+from .cache_builder import build_deterministic_cache
 from .result_set import ResultSet
 from .ecosystem import Ecosystem
 from .fingerprint import AshlockFingerprint, TransitiveFingerprint
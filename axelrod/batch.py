@@ -0,0 +1,251 @@
+"""
+Vectorised simulation of all the repetitions of a match at once.
+
+For players whose next play only depends on a bounded window of the history
+of the match (and possibly on a hidden state that is updated from that
+window), every repetition of a match can be simulated at the same time: each
+turn is a handful of NumPy operations on arrays with one row per repetition
+and the random numbers of all the repetitions are drawn in a single call.
+
+The supported players are:
+
+- Memory one players (as identified by `axelrod.markov.is_memory_one`),
+- Lookup table players: LookerUp and Gambler,
+- Hidden Markov model players: HMMPlayer,
+- Finite state machine players (as identified by
+  `axelrod.compiled_fsm.is_fsm_player`).
+
+Random numbers are drawn from the NumPy random number generator, so for a
+given seed the repetitions are not the same as the ones obtained by playing
+the match repeatedly.
+"""
+import numpy as np
+
+from axelrod.action import Action
+from .compiled_fsm import ACTIONS, compile_fsm, is_fsm_player
+from .markov import STATES, is_memory_one
+
+from typing import List
+
+C, D = Action.C, Action.D
+
+
+def _uses_strategy(player, *qualnames) -> bool:
+    """Whether the strategy method of a player is one of the given ones."""
+    strategy = getattr(type(player), 'strategy', None)
+    return getattr(strategy, '__qualname__', None) in qualnames
+
+
+def is_lookup_player(player) -> bool:
+    """
+    Whether the play of a player is entirely given by a lookup table: True for
+    instances of LookerUp and Gambler that do not override their strategy
+    method.
+    """
+    return (_uses_strategy(player, 'LookerUp.strategy', 'Gambler.strategy')
+            and hasattr(player, '_lookup') and
+            hasattr(player, 'initial_actions'))
+
+
+def is_hmm_player(player) -> bool:
+    """
+    Whether the play of a player is entirely given by a hidden Markov model:
+    True for instances of HMMPlayer that do not override its strategy method.
+    """
+    return (_uses_strategy(player, 'HMMPlayer.strategy') and
+            hasattr(player, 'hmm') and hasattr(player, 'initial_action'))
+
+
+def is_batchable(player) -> bool:
+    """Whether the repetitions of the matches of a player can be simulated
+    at once."""
+    return (is_memory_one(player) or is_lookup_player(player) or
+            is_hmm_player(player) or is_fsm_player(player))
+
+
+class BatchMemoryOne(object):
+    """The probabilities of cooperating of a memory one player."""
+
+    def __init__(self, player) -> None:
+        # Indexed by 2 * (last play) + (last opponent play) with D = 0, C = 1
+        self.probabilities = np.zeros(4)
+        for state in STATES:
+            index = 2 * state[0].value + state[1].value
+            self.probabilities[index] = player._four_vector[state]
+        self.initial = float(player._initial.value)
+
+    def reset(self, repetitions: int) -> None:
+        pass
+
+    def cooperation_probabilities(self, actions: np.ndarray, turn: int,
+                                  index: int) -> np.ndarray:
+        if turn == 0:
+            return np.full(actions.shape[0], self.initial)
+        last_turn = 2 * actions[:, turn - 1, index] + \
+            actions[:, turn - 1, 1 - index]
+        return self.probabilities[last_turn]
+
+
+class BatchLookup(object):
+    """The probabilities of cooperating of a lookup table player."""
+
+    def __init__(self, player) -> None:
+        lookup = player._lookup
+        self.player_depth = lookup.player_depth
+        self.op_depth = lookup.op_depth
+        self.op_openings_depth = lookup.op_openings_depth
+        size = self.player_depth + self.op_depth + self.op_openings_depth
+        # The plays of a key read as a binary number, oldest play first
+        self.weights = 2 ** np.arange(size - 1, -1, -1)
+        self.probabilities = np.zeros(2 ** size)
+        for plays, reaction in lookup.dictionary.items():
+            key = plays.self_plays + plays.op_plays + plays.op_openings
+            position = int(np.dot([a.value for a in key], self.weights))
+            if isinstance(reaction, Action):
+                reaction = reaction.value
+            self.probabilities[position] = reaction
+        self.initial_actions = [float(a.value)
+                                for a in player.initial_actions]
+
+    def reset(self, repetitions: int) -> None:
+        pass
+
+    def cooperation_probabilities(self, actions: np.ndarray, turn: int,
+                                  index: int) -> np.ndarray:
+        if turn < len(self.initial_actions):
+            return np.full(actions.shape[0], self.initial_actions[turn])
+        keys = np.concatenate(
+            [actions[:, turn - self.player_depth:turn, index],
+             actions[:, turn - self.op_depth:turn, 1 - index],
+             actions[:, :self.op_openings_depth, 1 - index]], axis=1)
+        return self.probabilities[keys.dot(self.weights)]
+
+
+class BatchHMM(object):
+    """The probabilities of cooperating of a hidden Markov model player,
+    whose hidden states are drawn for all repetitions at once."""
+
+    def __init__(self, player) -> None:
+        hmm = player.hmm
+        # Indexed by the last opponent play with D = 0, C = 1
+        self.cumulative_transitions = np.array(
+            [np.cumsum(hmm.transitions_D, axis=1),
+             np.cumsum(hmm.transitions_C, axis=1)])
+        self.emission_probabilities = np.array(hmm.emission_probabilities,
+                                               dtype=float)
+        self.initial_state = hmm.state
+        self.initial = float(player.initial_action.value)
+        self.states = None  # type: np.ndarray
+
+    def reset(self, repetitions: int) -> None:
+        self.states = np.full(repetitions, self.initial_state, dtype=int)
+
+    def cooperation_probabilities(self, actions: np.ndarray, turn: int,
+                                  index: int) -> np.ndarray:
+        if turn == 0:
+            return np.full(actions.shape[0], self.initial)
+        cumulative = self.cumulative_transitions[
+            actions[:, turn - 1, 1 - index], self.states]
+        draws = np.random.random((actions.shape[0], 1))
+        self.states = np.minimum((cumulative <= draws).sum(axis=1),
+                                 len(self.emission_probabilities) - 1)
+        return self.emission_probabilities[self.states]
+
+
+class BatchFSM(object):
+    """The (deterministic) plays of a finite state machine player."""
+
+    def __init__(self, player) -> None:
+        self.fsm = compile_fsm(player)
+        self.states = None  # type: np.ndarray
+
+    def reset(self, repetitions: int) -> None:
+        self.states = np.full(repetitions, self.fsm.initial_state, dtype=int)
+
+    def cooperation_probabilities(self, actions: np.ndarray, turn: int,
+                                  index: int) -> np.ndarray:
+        if turn == 0:
+            return np.full(actions.shape[0], float(self.fsm.initial_action))
+        last_action = actions[:, turn - 1, 1 - index]
+        probabilities = self.fsm.next_action[self.states, last_action]
+        self.states = self.fsm.next_state[self.states, last_action]
+        return probabilities.astype(float)
+
+
+def batch_player(player):
+    """Return the vectorised version of a player."""
+    if is_memory_one(player):
+        return BatchMemoryOne(player)
+    if is_lookup_player(player):
+        return BatchLookup(player)
+    if is_hmm_player(player):
+        return BatchHMM(player)
+    if is_fsm_player(player):
+        return BatchFSM(player)
+    raise ValueError(
+        "{} can not be simulated in batch.".format(player))
+
+
+def sample_lengths(prob_end: float, repetitions: int) -> np.ndarray:
+    """Sample the lengths of a number of matches, as match.sample_length
+    does for a single match."""
+    if prob_end is None or prob_end == 0:
+        return np.full(repetitions, float('inf'))
+    return np.random.geometric(prob_end, repetitions)
+
+
+def play_repetitions(players, turns: int, repetitions: int,
+                     noise: float = 0, noise_bias: bool = False,
+                     prob_end: float = None) -> List[np.ndarray]:
+    """
+    Play all the repetitions of a match between two batchable players at
+    once. The players are reset first, as Match.play does.
+
+    Parameters
+    ----------
+    players : tuple
+        A pair of players for which is_batchable is True
+    turns : integer
+        The (maximum) number of turns per repetition
+    repetitions : integer
+        The number of repetitions
+    noise : float
+        The probability that a player's intended action should be flipped
+    noise_bias : bool
+        If true, only cooperations are flipped
+    prob_end : float
+        The probability of a given turn ending a match
+
+    Returns
+    -------
+    list
+        One array of shape (length, 2) per repetition of the values of the
+        actions played by both players.
+    """
+    lengths = np.minimum(sample_lengths(prob_end, repetitions), turns)
+    max_length = int(lengths.max()) if repetitions else 0
+    for player in players:
+        player.reset()
+    batch_players = [batch_player(player) for player in players]
+    for player in batch_players:
+        player.reset(repetitions)
+
+    actions = np.zeros((repetitions, max_length, 2), dtype=np.int8)
+    for turn in range(max_length):
+        probabilities = [player.cooperation_probabilities(actions, turn, i)
+                         for i, player in enumerate(batch_players)]
+        draws = np.random.random((repetitions, 2))
+        actions[:, turn] = draws < np.column_stack(probabilities)
+        if noise:
+            flips = np.random.random((repetitions, 2)) < noise
+            if noise_bias:
+                flips &= actions[:, turn] == C.value
+            actions[:, turn] ^= flips
+    return [actions[repetition, :int(length)]
+            for repetition, length in enumerate(lengths)]
+
+
+def to_interactions(actions: np.ndarray) -> list:
+    """Convert an array of action values to a list of pairs of actions."""
+    return [(ACTIONS[action1], ACTIONS[action2])
+            for action1, action2 in actions.tolist()]
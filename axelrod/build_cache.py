@@ -0,0 +1,63 @@
+"""
+Build a persistent cache of the matches between deterministic players from
+the command line (see axelrod.cache_builder)::
+
+    python -m axelrod.build_cache basic.db --strategies basic --turns 200
+
+The matches are those of tournaments of a fixed number of turns with the
+default game, unless a probability of ending or a game is given::
+
+    python -m axelrod.build_cache basic.db --turns 500 --prob-end 0.01 --game 3 0 5 1
+"""
+import argparse
+
+import axelrod as axl
+
+STRATEGY_LISTS = {
+    "basic": axl.basic_strategies,
+    "demo": axl.demo_strategies,
+    "short_run_time": axl.short_run_time_strategies,
+    "strategies": axl.strategies,
+    "all": axl.all_strategies,
+}
+
+
+def main(args=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Play the matches between the deterministic players of "
+                    "a list of strategies and write them to a persistent "
+                    "cache.")
+    parser.add_argument("file_name", help="the database of the cache")
+    parser.add_argument("--strategies", choices=sorted(STRATEGY_LISTS),
+                        default="basic", help="the list of strategies")
+    parser.add_argument("--turns", type=int, nargs="+",
+                        default=[axl.DEFAULT_TURNS],
+                        help="the numbers of turns of the matches")
+    parser.add_argument("--prob-end", type=float, default=None,
+                        help="build the matches of tournaments with this "
+                             "probability of ending (whose length is not "
+                             "known to the players)")
+    parser.add_argument("--game", type=float, nargs=4, default=None,
+                        metavar=("R", "S", "T", "P"),
+                        help="the payoffs of the game (the default game if "
+                             "not given)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="the number of processes (0 for all the CPUs)")
+    parser.add_argument("--no-progress-bar", action="store_true",
+                        help="do not show a progress bar")
+    arguments = parser.parse_args(args)
+
+    game = None
+    if arguments.game is not None:
+        game = axl.Game(*arguments.game)
+    cache = axl.build_deterministic_cache(
+        STRATEGY_LISTS[arguments.strategies], arguments.turns,
+        arguments.file_name, processes=arguments.processes,
+        progress_bar=not arguments.no_progress_bar,
+        prob_end=arguments.prob_end, game=game)
+    print("{} matches in {}".format(len(cache), arguments.file_name))
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Warm up of a persistent cache of the matches between deterministic players.
+
+The matches between every ordered pair of deterministic players of a list
+are played (in parallel if required) for a set of lengths and written to a
+PersistentDeterministicCache.
+
+The entries of the cache are keyed by the context of their matches: whether
+the length is known to the players, the game and the other match
+attributes. The matches are played in the context of a tournament with the
+given game and without noise: of a fixed number of turns or, if a
+probability of ending is given, of a length not known to the players. Only
+the tournaments, Moran and Case processes of the same context (same game,
+same kind of length and no noise) then find these matches in the cache
+rather than playing them.
+
+As the cache keeps the longest match of a pair (which gives the shorter
+ones), only the longest length is played for the pairs of players that do
+not make use of the length of their matches (or when the length is not
+known).
+
+The cache can also be built from the command line, for example::
+
+    python -m axelrod.build_cache basic.db --strategies basic --turns 200
+"""
+import tqdm
+
+from .deterministic_cache import PersistentDeterministicCache, _uses_length
+from .game import Game
+from .match import Match
+from .player import Player
+from .session import Session
+
+from typing import List
+
+PAIRS_PER_TASK = 64
+
+
+def deterministic_players(strategies) -> List[Player]:
+    """Return an instance of every deterministic strategy (class or player)
+    of a list."""
+    players = []
+    for strategy in strategies:
+        player = strategy() if isinstance(strategy, type) else strategy
+        if not player.classifier['stochastic']:
+            players.append(player)
+    return players
+
+
+class _WarmUp(object):
+    """The matches of a warm up, sent once to the workers of a session."""
+
+    def __init__(self, players: List[Player], lengths: List[int],
+                 file_name: str, prob_end: float = None,
+                 game: Game = None) -> None:
+        self.players = players
+        self.lengths = lengths
+        self.file_name = file_name
+        self.prob_end = prob_end
+        self.game = game
+
+    def play_pairs(self, start: int, stop: int) -> int:
+        """Play the matches of the ordered pairs of players from the position
+        start to the position stop and return the number of pairs."""
+        cache = PersistentDeterministicCache(self.file_name)
+        size = len(self.players)
+        for position in range(start, stop):
+            player, opponent = (self.players[i]
+                                for i in divmod(position, size))
+            if self.prob_end is None and (_uses_length(player) or
+                                          _uses_length(opponent)):
+                lengths = self.lengths
+            else:
+                lengths = self.lengths[-1:]
+            for turns in lengths:
+                # With a probability of ending of 0 the match has all its
+                # turns but its length is not known to the players
+                prob_end = None if self.prob_end is None else 0
+                match = Match((player.clone(), opponent.clone()), turns=turns,
+                              prob_end=prob_end, game=self.game,
+                              deterministic_cache=cache)
+                match.play()
+        cache.close()
+        return stop - start
+
+
+def build_deterministic_cache(strategies, lengths: List[int], file_name: str,
+                              processes: int = None, session: Session = None,
+                              progress_bar: bool = True,
+                              prob_end: float = None, game: Game = None
+                              ) -> PersistentDeterministicCache:
+    """
+    Play the matches between every ordered pair of deterministic players of
+    a list of strategies and write them to a persistent cache. The matches
+    already in the cache are not played again.
+
+    The matches are stored in the context of a tournament without noise with
+    the same game and probability of ending (or lack of one): they are only
+    read by the tournaments and processes of that context.
+
+    Parameters
+    ----------
+    strategies : list
+        Strategy classes or players (the stochastic ones are ignored)
+    lengths : list
+        The numbers of turns of the matches
+    file_name : str
+        The database of the PersistentDeterministicCache
+    processes : int
+        The number of processes to play the matches with. If None (and no
+        session is given) the matches are played in this process.
+    session : axelrod.Session
+        A started session whose worker processes play the matches
+    progress_bar : bool
+        Whether or not to show a progress bar of the pairs of players
+    prob_end : float
+        If given, the matches are those of tournaments with a probability of
+        ending: their length is not known to the players and the longest
+        length (which gives the shorter ones) is played. The value itself
+        does not change the matches.
+    game : axelrod.Game
+        The game of the matches (the default game if None)
+
+    Returns
+    -------
+    axelrod.PersistentDeterministicCache
+        The cache
+    """
+    players = deterministic_players(strategies)
+    job = _WarmUp(players, sorted(set(lengths)), file_name, prob_end=prob_end,
+                  game=game)
+    cache = PersistentDeterministicCache(file_name)
+    size = len(players) ** 2
+    tasks = [(start, min(start + PAIRS_PER_TASK, size))
+             for start in range(0, size, PAIRS_PER_TASK)]
+
+    bar = None
+    if progress_bar:
+        bar = tqdm.tqdm(total=size, desc="Warming up the cache")
+    if session is None and processes is not None:
+        with Session(processes) as session:
+            _play_in_session(session, job, tasks, bar)
+    elif session is not None:
+        _play_in_session(session, job, tasks, bar)
+    else:
+        for start, stop in tasks:
+            pairs = job.play_pairs(start, stop)
+            if bar is not None:
+                bar.update(pairs)
+    if bar is not None:
+        bar.close()
+    return cache
+
+
+def _play_in_session(session: Session, job: _WarmUp, tasks, bar) -> None:
+    job_id = session.register(job)
+    try:
+        for pairs in session.imap_unordered(job_id, 'play_pairs', tasks):
+            if bar is not None:
+                bar.update(pairs)
+    finally:
+        session.forget(job_id)
@@ -0,0 +1,186 @@
+"""
+Checkpoints of tournaments, so that an interrupted tournament can be resumed.
+
+A checkpointed tournament keeps a manifest next to its output file (with the
+MANIFEST_SUFFIX appended to the filename). The manifest is a text file of
+JSON lines, only ever appended to:
+
+- the first line describes the tournament (so that a manifest is not used to
+  resume a different tournament) and holds the seed from which the random
+  seed of every repetition of every match is derived,
+- every other line records a completed chunk: the player index pair, the
+  range of repetitions (a chunk may hold part of the repetitions of a
+  match), the number of interactions written so far and the size of the
+  output file once the chunk was written.
+
+On resuming, the output file is truncated to the size recorded by the last
+completed chunk (dropping any partially written chunk) and only the
+repetitions that are not in the manifest are played. As every repetition is
+played from its own seed, a resumed tournament writes the same interactions
+as one that was not interrupted (provided its chunks are the same).
+"""
+from bisect import insort
+import json
+import os
+import random
+
+from .match_generator import chunk_repetitions
+from .random_ import derive_seed
+
+from typing import Dict, List, Set, Tuple
+
+MANIFEST_SUFFIX = '.manifest'
+
+ChunkKey = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+def chunk_key(chunk) -> ChunkKey:
+    """Return the player index pair and the range of repetitions of a chunk
+    of matches as built by MatchGenerator.build_match_chunks."""
+    repetitions = chunk_repetitions(chunk)
+    return (tuple(chunk[0]), (repetitions.start, repetitions.stop))
+
+
+def chunk_seed(seed: int, key: ChunkKey) -> int:
+    """Derive the random seed of a chunk of matches from the seed of a
+    tournament. The seed does not depend on the process playing the chunk
+    or on the order in which the chunks are played."""
+    return derive_seed(seed, key)
+
+
+class Manifest(object):
+    """
+    The manifest of a checkpointed tournament.
+
+    Attributes
+    ----------
+    output_filename : str
+        The name of the output file of the tournament
+    filename : str
+        The name of the manifest file
+    seed : int
+        The seed from which the seeds of the repetitions are derived
+    completed : set
+        The keys (as given by chunk_key) of the completed chunks, also
+        indexed as the sorted ranges of repetitions of every player index
+        pair
+    num_interactions : int
+        The number of interactions written by the completed chunks
+    offset : int
+        The size of the output file once the last completed chunk was written
+    """
+
+    def __init__(self, output_filename: str, description: Dict,
+                 seed: int = None) -> None:
+        """
+        Load the manifest of the given output file or start a new one.
+
+        Parameters
+        ----------
+        output_filename : str
+            The name of the output file of the tournament
+        description : dict
+            A JSON serialisable description of the tournament. Resuming a
+            tournament with a different description raises a ValueError.
+        seed : int
+            The seed of the tournament. If None, a new manifest draws a
+            random seed. Resuming a tournament with a different seed raises
+            a ValueError.
+        """
+        self.output_filename = output_filename
+        self.filename = output_filename + MANIFEST_SUFFIX
+        self.completed = set()  # type: Set[ChunkKey]
+        self._ranges = {}  # type: Dict[Tuple, List[Tuple[int, int]]]
+        self.num_interactions = 0
+        self.offset = 0
+        self.seed = None  # type: int
+
+        if os.path.exists(self.filename):
+            self._load(description, seed)
+        if self.seed is None:
+            self.seed = random.getrandbits(32) if seed is None else seed
+            with open(self.filename, 'w') as manifest:
+                manifest.write(json.dumps({"tournament": description,
+                                           "seed": self.seed}) + '\n')
+
+    def _load(self, description: Dict, seed: int = None) -> None:
+        with open(self.filename, 'r') as manifest:
+            lines = manifest.read().split('\n')
+        # The last line is either empty or an incomplete record
+        records = []
+        for line in lines[:-1]:
+            records.append(json.loads(line))
+        if not records:
+            return
+        header = records[0]
+        if (header["tournament"] != json.loads(json.dumps(description)) or
+                seed is not None and header["seed"] != seed):
+            raise ValueError(
+                "The checkpoint {} is for a different tournament.".format(
+                    self.filename))
+        self.seed = header["seed"]
+        for record in records[1:]:
+            key = (tuple(record["index_pair"]), tuple(record["repetitions"]))
+            self._add(key)
+            self.num_interactions = record["interactions"]
+            self.offset = record["offset"]
+        if self.completed and (not os.path.exists(self.output_filename) or
+                               os.path.getsize(self.output_filename) <
+                               self.offset):
+            raise ValueError(
+                "The output file {} is missing the interactions recorded by "
+                "its checkpoint.".format(self.output_filename))
+        if lines[-1]:
+            # Drop an incomplete record so that the next one starts on its
+            # own line
+            with open(self.filename, 'w') as manifest:
+                manifest.write('\n'.join(lines[:-1]) + '\n')
+
+    def _add(self, key: ChunkKey) -> None:
+        if key not in self.completed:
+            self.completed.add(key)
+            insort(self._ranges.setdefault(key[0], []), key[1])
+
+    @property
+    def resuming(self) -> bool:
+        """Whether some chunks have already been completed."""
+        return len(self.completed) > 0
+
+    def remaining(self, chunk) -> List[range]:
+        """Return the ranges of the repetitions of a chunk that are not
+        covered by completed chunks (of any size) of the same pair."""
+        index_pair = tuple(chunk[0])
+        repetitions = chunk_repetitions(chunk)
+        ranges = []
+        start = repetitions.start
+        for completed_start, completed_stop in self._ranges.get(index_pair,
+                                                                []):
+            if completed_start > start:
+                ranges.append(range(start, min(completed_start,
+                                               repetitions.stop)))
+            start = max(start, completed_stop)
+            if start >= repetitions.stop:
+                break
+        if start < repetitions.stop:
+            ranges.append(range(start, repetitions.stop))
+        return [r for r in ranges if len(r) > 0]
+
+    def is_completed(self, chunk) -> bool:
+        return not self.remaining(chunk)
+
+    def seed_for(self, key: ChunkKey) -> int:
+        return chunk_seed(self.seed, key)
+
+    def record(self, key: ChunkKey, num_interactions: int,
+               offset: int) -> None:
+        """Record a completed chunk, once its interactions are written."""
+        self._add(key)
+        self.num_interactions = num_interactions
+        self.offset = offset
+        with open(self.filename, 'a') as manifest:
+            manifest.write(json.dumps({"index_pair": list(key[0]),
+                                       "repetitions": list(key[1]),
+                                       "interactions": num_interactions,
+                                       "offset": offset}) + '\n')
+            manifest.flush()
+            os.fsync(manifest.fileno())
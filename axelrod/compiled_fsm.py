@@ -0,0 +1,202 @@
+"""
+Compiled simulation of matches between finite state machine players.
+
+A finite state machine is compiled to two integer arrays indexed by a state
+and the last action of the opponent (as given by `Action.value`): the next
+state and the action played. A match between two such machines is then a
+single product automaton which can be run in a tight loop, or across many
+repetitions at once with NumPy.
+"""
+import random
+
+import numpy as np
+
+from axelrod.action import Action
+
+from typing import List, Tuple
+
+C, D = Action.C, Action.D
+ACTIONS = {C.value: C, D.value: D}
+
+
+def is_fsm_player(player) -> bool:
+    """
+    Whether the play of a player is entirely given by its finite state
+    machine: True for instances of FSMPlayer that do not override its strategy
+    method.
+    """
+    strategy = getattr(type(player), 'strategy', None)
+    return (getattr(strategy, '__qualname__', None) == 'FSMPlayer.strategy' and
+            hasattr(player, 'fsm') and
+            hasattr(player, 'initial_action'))
+
+
+class CompiledFSM(object):
+    """
+    The transitions of a finite state machine as integer arrays.
+
+    Parameters
+    ----------
+    transitions : dict
+        Mapping (state, opponent action) to (next state, action) as given by
+        SimpleFSM.state_transitions
+    initial_state :
+        The state the machine is in
+    initial_action : axelrod.Action
+        The action played on the first turn
+
+    Attributes
+    ----------
+    states : list
+        The original states, in the order of their indices
+    next_state : numpy.ndarray
+        Entry [i, a] is the index of the state that follows state i when the
+        opponent has played the action of value a
+    next_action : numpy.ndarray
+        Entry [i, a] is the value of the action played in that case
+    """
+
+    def __init__(self, transitions: dict, initial_state,
+                 initial_action: Action) -> None:
+        self.states = sorted(set(state for state, _ in transitions))
+        index = {state: i for i, state in enumerate(self.states)}
+        self.next_state = np.zeros((len(self.states), 2), dtype=int)
+        self.next_action = np.zeros((len(self.states), 2), dtype=int)
+        for (state, action), (next_state, next_action) in transitions.items():
+            self.next_state[index[state], action.value] = index[next_state]
+            self.next_action[index[state], action.value] = next_action.value
+        self.initial_state = index[initial_state]
+        self.initial_action = initial_action.value
+
+
+def compile_fsm(player) -> CompiledFSM:
+    """Compile the finite state machine of an FSMPlayer in its current
+    state."""
+    return CompiledFSM(player.fsm.state_transitions, player.fsm.state,
+                       player.initial_action)
+
+
+def _flip(action: int, noise: float, noise_bias: bool) -> int:
+    """Flip an action with probability noise as Player._add_noise does."""
+    if random.random() < noise:
+        if not noise_bias or action == C.value:
+            return 1 - action
+    return action
+
+
+def play_fsms(fsm1: CompiledFSM, fsm2: CompiledFSM, turns: int,
+              noise: float = 0,
+              noise_bias: bool = False) -> Tuple[List[int], List[int],
+                                                 int, int]:
+    """
+    Play a match between two compiled finite state machines.
+
+    With noise, random numbers are drawn in the same order as Match.play does
+    so that a seeded match gives the same result. Without noise the product
+    automaton is deterministic: as soon as its state repeats, the rest of the
+    match is obtained by repeating the cycle.
+
+    Returns
+    -------
+    tuple
+        The action values played by each machine and the indices of their
+        final states.
+    """
+    next_state1, next_action1 = (fsm1.next_state.tolist(),
+                                 fsm1.next_action.tolist())
+    next_state2, next_action2 = (fsm2.next_state.tolist(),
+                                 fsm2.next_action.tolist())
+    state1, state2 = fsm1.initial_state, fsm2.initial_state
+    actions1, actions2 = [], []  # type: List[int], List[int]
+    if turns <= 0:
+        return actions1, actions2, state1, state2
+
+    action1, action2 = fsm1.initial_action, fsm2.initial_action
+    if noise:
+        action1 = _flip(action1, noise, noise_bias)
+        action2 = _flip(action2, noise, noise_bias)
+    actions1.append(action1)
+    actions2.append(action2)
+
+    seen = {}
+    turn = 1
+    while turn < turns:
+        if not noise:
+            joint_state = (state1, state2, action1, action2)
+            if joint_state in seen:
+                break
+            seen[joint_state] = turn
+        action1, state1 = (next_action1[state1][action2],
+                           next_state1[state1][action2])
+        action2, state2 = (next_action2[state2][actions1[-1]],
+                           next_state2[state2][actions1[-1]])
+        if noise:
+            action1 = _flip(action1, noise, noise_bias)
+            action2 = _flip(action2, noise, noise_bias)
+        actions1.append(action1)
+        actions2.append(action2)
+        turn += 1
+    else:
+        return actions1, actions2, state1, state2
+
+    # The product automaton is back in a previous state: repeat the cycle
+    cycle_start = seen[joint_state]
+    period = turn - cycle_start
+    repeats, remainder = divmod(turns - turn, period)
+    cycle1, cycle2 = actions1[cycle_start:], actions2[cycle_start:]
+    actions1.extend(cycle1 * repeats + cycle1[:remainder])
+    actions2.extend(cycle2 * repeats + cycle2[:remainder])
+    if remainder:
+        # The state after playing turn t is recorded when reaching turn t + 1
+        states = {t: (s1, s2) for (s1, s2, _, _), t in seen.items()}
+        state1, state2 = states[cycle_start + remainder]
+    return actions1, actions2, state1, state2
+
+
+def play_fsm_repetitions(players, turns: int, repetitions: int,
+                         noise: float = 0,
+                         noise_bias: bool = False) -> np.ndarray:
+    """
+    Play a number of repetitions of a match between two FSM players at once.
+
+    The turns are played in a loop but each turn is vectorised across all the
+    repetitions. Noise is drawn from the NumPy random number generator so the
+    repetitions do not match those of Match.play for a given seed.
+
+    Parameters
+    ----------
+    players : tuple
+        A pair of FSM players (as identified by is_fsm_player)
+    turns : integer
+        The number of turns per repetition
+    repetitions : integer
+        The number of repetitions
+    noise : float
+        The probability that a player's intended action should be flipped
+    noise_bias : bool
+        If true, only cooperations are flipped
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of shape (repetitions, turns, 2) of the values of the actions
+        played by both players.
+    """
+    fsms = [compile_fsm(player) for player in players]
+    actions = np.zeros((repetitions, turns, 2), dtype=int)
+    states = [np.full(repetitions, fsm.initial_state, dtype=int)
+              for fsm in fsms]
+    for turn in range(turns):
+        for i, fsm in enumerate(fsms):
+            if turn == 0:
+                actions[:, turn, i] = fsm.initial_action
+            else:
+                last_action = actions[:, turn - 1, 1 - i]
+                actions[:, turn, i] = fsm.next_action[states[i], last_action]
+                states[i] = fsm.next_state[states[i], last_action]
+        if noise:
+            flips = np.random.random((repetitions, 2)) < noise
+            if noise_bias:
+                flips &= actions[:, turn] == C.value
+            actions[:, turn] ^= flips
+    return actions
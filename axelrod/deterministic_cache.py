@@ -1,14 +1,27 @@
-from collections import UserDict
+from collections import OrderedDict, UserDict
+from io import BufferedReader, FileIO
+import json
+import os
 import pickle
+import sqlite3
+import struct
+import sys
 
-from .action import Action
+import numpy as np
+
+from .action import Action, actions_to_str, str_to_actions
+from .game import DefaultGame
 from .player import Player
 
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 CachePlayerKey = Tuple[Player, Player, int]
 CacheKey = Tuple[str, str, int]
 
+_RECORD = struct.Struct('<II')
+
+DEFAULT_MAX_BYTES = 1 << 26
+
 
 class DeterministicCache(UserDict):
     """A class to cache the results of deterministic matches.
@@ -50,12 +63,16 @@ class DeterministicCache(UserDict):
     @staticmethod
     def _key_transform(key: CachePlayerKey) -> CacheKey:
         """
+        The players are identified by their representation (their name and
+        parameters) so that players of the same strategy with different
+        parameters have different entries.
+
         Parameters
         ----------
         key: tuple
             A 3-tuple: (player instance, player instance, match length)
         """
-        return key[0].name, key[1].name, key[2]
+        return repr(key[0]), repr(key[1]), key[2]
 
     def __delitem__(self, key: CachePlayerKey):
         return super().__delitem__(self._key_transform(key))
@@ -166,3 +183,555 @@ class DeterministicCache(UserDict):
                 "Cache file exists but is not the correct format. "
                 "Try deleting and re-building the cache file.")
         return True
+
+
+class SharedDeterministicCache(DeterministicCache):
+    """A DeterministicCache shared by several processes through a file.
+
+    The file is an append-only log of records: the sizes of the key and of
+    the value, the key (the representations of the players and the match
+    length as JSON) and the value (the actions of both players as a string
+    of C and D). Every entry is appended with a single write of a file
+    opened in append mode, so that the processes do not need a lock to add
+    entries.
+
+    Every process reads the records appended since its last read when a key
+    is not found: the entries added by one process are then found by all the
+    others. Only the position of the value of every entry is held in memory
+    and values are read from the file when they are looked up.
+
+    The cache can be pickled (for example with a tournament sent to worker
+    processes): only the name of its file is.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        """
+        Parameters
+        ----------
+        file_name : string
+            Path to the file of the cache, created if it does not exist
+        """
+        UserDict.__init__(self)
+        self._open(file_name)
+
+    def _open(self, file_name: str) -> None:
+        """Open the cache on a file (when it is built or unpickled)."""
+        self.mutable = True
+        self.file_name = file_name
+        # Created as a log (rather than loaded as a pickled dictionary)
+        with open(file_name, 'ab'):
+            pass
+        self._position = 0
+        self._reader = None  # type: Optional[BufferedReader]
+        self._writer = None  # type: Optional[FileIO]
+        self._pid = None  # type: Optional[int]
+
+    def __getstate__(self) -> Dict:
+        return {"file_name": self.file_name, "mutable": self.mutable}
+
+    def __setstate__(self, state: Dict) -> None:
+        UserDict.__init__(self)
+        self._open(state["file_name"])
+        self.mutable = state["mutable"]
+
+    def _files(self) -> Tuple[BufferedReader, FileIO]:
+        """The file objects of this process: a process forked with the cache
+        must not share the file objects (and their positions) of its
+        parent."""
+        if (self._reader is None or self._writer is None or
+                self._pid != os.getpid()):
+            self._reader = open(self.file_name, 'rb')
+            self._writer = FileIO(self.file_name, 'ab')
+            self._pid = os.getpid()
+        return self._reader, self._writer
+
+    def refresh(self) -> None:
+        """Read the entries appended to the file since the last read."""
+        reader, _ = self._files()
+        reader.seek(self._position)
+        data = reader.read()
+        offset = 0
+        # A record that is not complete yet is read by a later refresh
+        while offset + _RECORD.size <= len(data):
+            key_size, value_size = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            end = start + key_size + value_size
+            if end > len(data):
+                break
+            key = tuple(json.loads(data[start:start + key_size].decode()))
+            self.data[key] = (self._position + start + key_size, value_size)
+            offset = end
+        self._position += offset
+
+    def _value(self, key: CacheKey) -> List[Tuple[Action, Action]]:
+        position, size = self.data[key]
+        reader, _ = self._files()
+        reader.seek(position)
+        actions = str_to_actions(reader.read(size).decode())
+        return list(zip(actions[0::2], actions[1::2]))
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.data)
+
+    def __contains__(self, key) -> bool:
+        key = self._key_transform(key)
+        if key not in self.data:
+            self.refresh()
+        return key in self.data
+
+    def __getitem__(self, key: CachePlayerKey) -> List[Tuple[Action, Action]]:
+        transformed_key = self._key_transform(key)
+        if transformed_key not in self.data:
+            self.refresh()
+        if transformed_key not in self.data:
+            raise KeyError(key)
+        return self._value(transformed_key)
+
+    def __setitem__(self, key: CachePlayerKey, value):
+        if not self.mutable:
+            raise ValueError('Cannot update cache unless mutable is True.')
+
+        if not self._is_valid_key(key):
+            raise ValueError(
+                "Key must be a tuple of 2 deterministic axelrod Player classes "
+                "and an integer")
+
+        if not self._is_valid_value(value):
+            raise ValueError(
+                'Value must be a list with length equal to turns attribute')
+
+        self._append(self._key_transform(key), value)
+
+    def _append(self, key: CacheKey, value: List) -> None:
+        """Append the record of an entry with a single write."""
+        _, writer = self._files()
+        key_bytes = json.dumps(key).encode()
+        value_bytes = actions_to_str(
+            action for actions in value for action in actions).encode()
+        writer.write(b''.join([
+            _RECORD.pack(len(key_bytes), len(value_bytes)), key_bytes,
+            value_bytes]))
+
+    def __delitem__(self, key: CachePlayerKey):
+        raise ValueError('Cannot delete an entry of an append-only cache.')
+
+    def save(self, file_name: str) -> bool:
+        """Serialise the cache dictionary to a file (which can be loaded by a
+        DeterministicCache).
+
+        Parameters
+        ----------
+        file_name : string
+            File path to which the cache should be saved
+        """
+        self.refresh()
+        data = {key: self._value(key) for key in self.data}
+        with open(file_name, 'wb') as io:
+            pickle.dump(data, io)
+        return True
+
+    def load(self, file_name: str) -> bool:
+        """Append the entries of a previously saved cache.
+
+        Parameters
+        ----------
+        file_name : string
+            Path to a previously saved cache file
+        """
+        cache = DeterministicCache(file_name)
+        for key, value in cache.data.items():
+            self._append(key, value)
+        return True
+
+    def close(self) -> None:
+        """Close the file objects of this process."""
+        for file_obj in (self._reader, self._writer):
+            if file_obj is not None:
+                file_obj.close()
+        self._reader = self._writer = None
+        self._pid = None
+
+
+def _uses_length(player: Player) -> bool:
+    makes_use_of = player.classifier.get('makes_use_of') or ()
+    return 'length' in makes_use_of
+
+
+def _length_known(player: Player) -> bool:
+    """Whether the length of its match is known to a player (it is not for
+    the matches with a probability of ending)."""
+    return 0 < player.match_attributes["length"] < float('inf')
+
+
+def _exact_length(player: Player, opponent: Player) -> bool:
+    """Whether the result of a match of two players depends on its length
+    (rather than being a prefix of the result of any longer match)."""
+    return any(_uses_length(p) and _length_known(p)
+               for p in (player, opponent))
+
+
+def _attributes_context(match_attributes: Dict, exact_length: bool) -> tuple:
+    """The part of the context of a match given by the attributes of one of
+    its players."""
+    attributes = dict(match_attributes)
+    length = attributes.pop("length")
+    game = attributes.pop("game")
+    known = 0 < length < float('inf')
+    # The payoffs as floats: Game(3, 0, 5, 1) and Game(3.0, 0.0, 5.0, 1.0)
+    # give the same matches
+    return (length if exact_length and known else known,
+            tuple(float(payoff) for payoff in game.RPST()),
+            sorted(attributes.items()))
+
+
+def _context(player: Player, opponent: Player) -> str:
+    """The context of a match of two players: for both, whether the length
+    is known (the length itself if the result depends on it), the game and
+    the other match attributes."""
+    exact_length = _exact_length(player, opponent)
+    return repr(tuple(_attributes_context(p.match_attributes, exact_length)
+                      for p in (player, opponent)))
+
+
+def _default_context(turns: int, exact_length: bool) -> str:
+    """The context of a match of a fixed number of turns with the default
+    game and no noise."""
+    attributes = {"length": turns, "game": DefaultGame, "noise": 0,
+                  "noise_bias": False}
+    return repr((_attributes_context(attributes, exact_length),) * 2)
+
+
+def _interactions_to_str(value: List) -> str:
+    return actions_to_str(action for actions in value for action in actions)
+
+
+def _str_to_interactions(text: str) -> List[Tuple[Action, Action]]:
+    actions = str_to_actions(text)
+    return list(zip(actions[0::2], actions[1::2]))
+
+
+class PersistentDeterministicCache(DeterministicCache):
+    """A DeterministicCache held in an SQLite database.
+
+    The first turns of a match between two deterministic players are the
+    same whatever its length, unless one of them makes use of the length of
+    the match. For the other pairs, the database holds a single entry: the
+    longest match played, which gives the result of any shorter match (in
+    particular of the matches of random lengths of tournaments with a
+    probability of ending). The pairs where a player makes use of the
+    length have an entry per length.
+
+    Every entry is also keyed by the context of the match (see _context):
+    whether its length is known to the players, the game and the other
+    match attributes. A match is only read from the entries of the same
+    context, as it can change the actions of some players (for example
+    those making use of the length of the match or of the game).
+
+    The entries are read from the database when they are looked up: the
+    database can be much larger than the memory of the process. It can be
+    used by several processes (the cache is pickled as the name of its
+    file).
+    """
+
+    def __init__(self, file_name: str) -> None:
+        """
+        Parameters
+        ----------
+        file_name : string
+            Path to the database of the cache, created if it does not exist
+        """
+        UserDict.__init__(self)
+        self._open(file_name)
+
+    def _open(self, file_name: str) -> None:
+        """Open the cache on a database (when it is built or unpickled)."""
+        self.mutable = True
+        self.file_name = file_name
+        self._connection = None  # type: Optional[sqlite3.Connection]
+        self._pid = None  # type: Optional[int]
+        self._connect()
+
+    def __getstate__(self) -> Dict:
+        return {"file_name": self.file_name, "mutable": self.mutable}
+
+    def __setstate__(self, state: Dict) -> None:
+        UserDict.__init__(self)
+        self._open(state["file_name"])
+        self.mutable = state["mutable"]
+
+    def _connect(self) -> sqlite3.Connection:
+        """The connection of this process to the database."""
+        connection = self._connection
+        if connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.file_name, timeout=60)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS interactions ("
+                "player TEXT, opponent TEXT, context TEXT, length INTEGER, "
+                "actions TEXT, PRIMARY KEY (player, opponent, context, "
+                "length))")
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def _row_key(key: CachePlayerKey) -> Tuple[str, str, str, int]:
+        """The key of the row of a match: the length is 0 for the pairs whose
+        longest match gives the results of the shorter ones."""
+        player, opponent, turns = key
+        length = turns if _exact_length(player, opponent) else 0
+        return repr(player), repr(opponent), _context(player, opponent), length
+
+    def _row(self, key: CachePlayerKey) -> Optional[Tuple[str]]:
+        return self._connect().execute(
+            "SELECT actions FROM interactions WHERE player = ? AND "
+            "opponent = ? AND context = ? AND length = ?",
+            self._row_key(key)).fetchone()
+
+    def __contains__(self, key) -> bool:
+        if not self._is_valid_key(key):
+            return False
+        row = self._row(key)
+        return row is not None and len(row[0]) >= 2 * key[2]
+
+    def __getitem__(self, key: CachePlayerKey) -> List[Tuple[Action, Action]]:
+        row = self._row(key) if self._is_valid_key(key) else None
+        if row is None or len(row[0]) < 2 * key[2]:
+            raise KeyError(key)
+        return _str_to_interactions(row[0][:2 * key[2]])
+
+    def __setitem__(self, key: CachePlayerKey, value):
+        """Store the result of a match, unless a longer one of the same pair
+        is already stored."""
+        if not self.mutable:
+            raise ValueError('Cannot update cache unless mutable is True.')
+
+        if not self._is_valid_key(key):
+            raise ValueError(
+                "Key must be a tuple of 2 deterministic axelrod Player classes "
+                "and an integer")
+
+        if not self._is_valid_value(value):
+            raise ValueError(
+                'Value must be a list with length equal to turns attribute')
+
+        row = self._row(key)
+        if row is not None and len(row[0]) >= 2 * len(value):
+            return
+        self._store(self._row_key(key), value)
+
+    def _store(self, row_key: Tuple[str, str, str, int],
+               value: List) -> None:
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO interactions VALUES (?, ?, ?, ?, ?)",
+                row_key + (_interactions_to_str(value),))
+
+    def __delitem__(self, key: CachePlayerKey):
+        connection = self._connect()
+        with connection:
+            deleted = connection.execute(
+                "DELETE FROM interactions WHERE player = ? AND opponent = ? "
+                "AND context = ? AND length = ?", self._row_key(key)).rowcount
+        if not deleted:
+            raise KeyError(key)
+
+    def __len__(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+    def __iter__(self) -> Iterator[CacheKey]:
+        """The keys of the entries: the names of the players and the length
+        of the match stored (a pair has an entry per context)."""
+        for player, opponent, size in self._connect().execute(
+                "SELECT player, opponent, LENGTH(actions) FROM interactions"):
+            yield player, opponent, size // 2
+
+    def save(self, file_name: str) -> bool:
+        """Serialise the cache dictionary to a file (which can be loaded by a
+        DeterministicCache).
+
+        Parameters
+        ----------
+        file_name : string
+            File path to which the cache should be saved
+        """
+        data = {}
+        for player, opponent, context, length, actions in \
+                self._connect().execute("SELECT * FROM interactions"):
+            turns = len(actions) // 2
+            # Only the matches of a fixed length with the default game
+            if context == _default_context(turns, bool(length)):
+                data[(player, opponent, turns)] = \
+                    _str_to_interactions(actions)
+        with open(file_name, 'wb') as io:
+            pickle.dump(data, io)
+        return True
+
+    def load(self, file_name: str) -> bool:
+        """Add the entries of a previously saved cache, as matches of an
+        exact length with the default game (the players are only known by
+        their names).
+
+        Parameters
+        ----------
+        file_name : string
+            Path to a previously saved cache file
+        """
+        cache = DeterministicCache(file_name)
+        for (player, opponent, turns), value in cache.data.items():
+            self._store((player, opponent, _default_context(turns, True),
+                         turns), value)
+        return True
+
+    def close(self) -> None:
+        """Close the connection of this process."""
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = None
+        self._pid = None
+
+
+def pack_interactions(value: List) -> bytes:
+    """Pack the actions of a match to 2 bits per turn (C = 1, D = 0)."""
+    bits = np.fromiter((action == Action.C for actions in value
+                        for action in actions), dtype=np.uint8,
+                       count=2 * len(value))
+    return np.packbits(bits).tobytes()
+
+
+def unpack_interactions(packed: bytes,
+                        turns: int) -> List[Tuple[Action, Action]]:
+    """The actions of a match of the given number of turns packed by
+    pack_interactions."""
+    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8))[:2 * turns]
+    actions = [Action.C if bit else Action.D for bit in bits.tolist()]
+    return list(zip(actions[0::2], actions[1::2]))
+
+
+class BoundedDeterministicCache(DeterministicCache):
+    """A DeterministicCache holding at most a given number of bytes.
+
+    The actions of every match are packed to 2 bits per turn. Once the
+    entries take more than the budget, the least recently used ones are
+    evicted. The size of an entry is the size of its key and of its packed
+    value (as given by sys.getsizeof).
+
+    Attributes
+    ----------
+    max_bytes : int
+        The budget of the cache (in bytes)
+    size : int
+        The size of the entries (in bytes)
+    hits : int
+        The number of matches found in the cache
+    misses : int
+        The number of matches not found in the cache
+    evictions : int
+        The number of entries evicted
+    """
+
+    def __init__(self, file_name: str = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Parameters
+        ----------
+        file_name : string
+            Path to a previously saved cache file
+        max_bytes : int
+            The budget of the cache (in bytes)
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        super().__init__()
+        self.data = OrderedDict()  # type: OrderedDict
+        if file_name is not None:
+            self.load(file_name)
+
+    @staticmethod
+    def _entry_size(key: CacheKey, packed: bytes) -> int:
+        return (sys.getsizeof(key) + sum(sys.getsizeof(item) for item in key)
+                + sys.getsizeof(packed))
+
+    def __contains__(self, key) -> bool:
+        if super().__contains__(key):
+            return True
+        self.misses += 1
+        return False
+
+    def __getitem__(self, key: CachePlayerKey) -> List[Tuple[Action, Action]]:
+        transformed_key = self._key_transform(key)
+        if transformed_key not in self.data:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        self.data.move_to_end(transformed_key)
+        turns, packed = self.data[transformed_key]
+        return unpack_interactions(packed, turns)
+
+    def __setitem__(self, key: CachePlayerKey, value):
+        """Pack and store a value, evicting the least recently used entries
+        if the cache is over its budget."""
+        if not self.mutable:
+            raise ValueError('Cannot update cache unless mutable is True.')
+
+        if not self._is_valid_key(key):
+            raise ValueError(
+                "Key must be a tuple of 2 deterministic axelrod Player classes "
+                "and an integer")
+
+        if not self._is_valid_value(value):
+            raise ValueError(
+                'Value must be a list with length equal to turns attribute')
+
+        self._store(self._key_transform(key), value)
+
+    def _store(self, key: CacheKey, value: List) -> None:
+        if key in self.data:
+            self._remove(key)
+        packed = pack_interactions(value)
+        self.data[key] = (len(value), packed)
+        self.size += self._entry_size(key, packed)
+        while self.size > self.max_bytes and self.data:
+            self._remove(next(iter(self.data)))
+            self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        _, packed = self.data.pop(key)
+        self.size -= self._entry_size(key, packed)
+
+    def __delitem__(self, key: CachePlayerKey):
+        self._remove(self._key_transform(key))
+
+    def save(self, file_name: str) -> bool:
+        """Serialise the cache dictionary to a file (which can be loaded by a
+        DeterministicCache).
+
+        Parameters
+        ----------
+        file_name : string
+            File path to which the cache should be saved
+        """
+        data = {key: unpack_interactions(packed, turns)
+                for key, (turns, packed) in self.data.items()}
+        with open(file_name, 'wb') as io:
+            pickle.dump(data, io)
+        return True
+
+    def load(self, file_name: str) -> bool:
+        """Add the entries of a previously saved cache (within the budget).
+
+        Parameters
+        ----------
+        file_name : string
+            Path to a previously saved cache file
+        """
+        cache = DeterministicCache(file_name)
+        for key, value in cache.data.items():
+            self._store(key, value)
+        return True
@@ -14,7 +14,8 @@ import axelrod as axl
 from axelrod import Player
 from axelrod.strategy_transformers import JossAnnTransformer, DualTransformer
 from axelrod.interaction_utils import (
-    compute_final_score_per_turn, read_interactions_from_file)
+    compute_final_score_per_turn, read_interactions_from_file,
+    string_to_values)
 
 from typing import List, Any, Union
 
@@ -161,7 +162,7 @@ def generate_data(interactions: dict, points: list, edges: list) -> dict:
     ----------
     interactions : dict
         A dictionary mapping edges to the corresponding interactions of
-        those players.
+        those players (as lists of pairs of actions or arrays).
     points : list
         of Point objects with coordinates (x, y).
     edges : list of tuples
@@ -269,7 +270,8 @@ class AshlockFingerprint(object):
     def fingerprint(
         self, turns: int = 50, repetitions: int = 10, step: float = 0.01,
         processes: int=None, filename: str = None,
-        progress_bar: bool = True
+        progress_bar: bool = True, session: axl.Session = None,
+        as_arrays: bool = False
 ) -> dict:
         """Build and play the spatial tournament.
 
@@ -295,6 +297,14 @@ class AshlockFingerprint(object):
             if None, will auto-generate a filename.
         progress_bar : bool
             Whether or not to create a progress bar which will be updated
+        session : axelrod.Session, optional
+            A started session whose worker processes play the matches
+        as_arrays : bool, optional
+            If True, self.interactions maps the edges to the interactions
+            encoded as integer arrays (see
+            axelrod.interaction_utils.encode_interactions) rather than to
+            lists of pairs of actions. The arrays are faster to read and
+            score and use less memory.
 
         Returns
         ----------
@@ -317,10 +327,11 @@ class AshlockFingerprint(object):
         self.spatial_tournament.play(build_results=False,
                                      filename=filename,
                                      processes=processes,
-                                     progress_bar=progress_bar)
+                                     progress_bar=progress_bar,
+                                     session=session)
 
         self.interactions = read_interactions_from_file(
-            filename, progress_bar=progress_bar)
+            filename, progress_bar=progress_bar, as_arrays=as_arrays)
 
         if temp_file_descriptor is not None:
             os.close(temp_file_descriptor)
@@ -406,7 +417,8 @@ class TransitiveFingerprint(object):
     def fingerprint(self, turns: int = 50, repetitions: int = 1000,
                     noise: float = None, processes: int = None,
                     filename: str = None,
-                    progress_bar: bool = True) -> np.array:
+                    progress_bar: bool = True,
+                    session: axl.Session = None) -> np.array:
         """Creates a spatial tournament to run the necessary matches to obtain
         fingerprint data.
 
@@ -427,6 +439,8 @@ class TransitiveFingerprint(object):
             if None, a filename will be generated.
         progress_bar : bool
             Whether or not to create a progress bar which will be updated
+        session : axelrod.Session, optional
+            A started session whose worker processes play the matches
 
         Returns
         ----------
@@ -450,7 +464,8 @@ class TransitiveFingerprint(object):
                                     edges=edges, turns=turns, noise=noise,
                                     repetitions=repetitions)
         tournament.play(filename=filename, build_results=False,
-                        progress_bar=progress_bar, processes=processes)
+                        progress_bar=progress_bar, processes=processes,
+                        session=session)
 
         self.data = self.analyse_cooperation_ratio(filename)
 
@@ -479,9 +494,6 @@ class TransitiveFingerprint(object):
             opponent in each turn. The ith row corresponds to the ith opponent
             and the jth column the jth turn.
         """
-        did_c = np.vectorize(lambda actions: [int(action == 'C')
-                                              for action in actions])
-
         cooperation_rates = {}
         df = dd.read_csv(filename)
         # We ignore the actions of all opponents. So we filter the dataframe to
@@ -491,9 +503,11 @@ class TransitiveFingerprint(object):
         for _, row in df.iterrows():
             opponent_index, player_history = row["Opponent index"], row["Actions"]
             if opponent_index in cooperation_rates:
-                cooperation_rates[opponent_index].append(did_c(player_history))
+                cooperation_rates[opponent_index].append(
+                    string_to_values(player_history))
             else:
-                cooperation_rates[opponent_index] = [did_c(player_history)]
+                cooperation_rates[opponent_index] = [
+                    string_to_values(player_history)]
 
         for index, rates in cooperation_rates.items():
             cooperation_rates[index] = np.mean(rates, axis=0)
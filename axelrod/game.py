@@ -1,3 +1,5 @@
+import numpy as np
+
 from .action import Action
 from typing import Tuple, Union
 
@@ -35,6 +37,15 @@ class Game(object):
         """
         return self.scores[pair]
 
+    def payoff_table(self) -> np.ndarray:
+        """Return the scores as an array of shape (2, 2, 2) indexed by the
+        values of the actions of both players (C = 1, D = 0), so that
+        payoff_table()[1, 0] gives the scores of (C, D)."""
+        table = np.zeros((2, 2, 2), dtype=np.array(self.RPST()).dtype)
+        for (action1, action2), scores in self.scores.items():
+            table[action1.value, action2.value] = scores
+        return table
+
     def __repr__(self) -> str:
         return "Axelrod game: (R,P,S,T) = {}".format(self.RPST())
 
@@ -8,6 +8,12 @@ https://github.com/marcharper/stationary/blob/master/stationary/utils/graph.py
 from collections import defaultdict
 
 
+def _weights():
+    """The weights of the edges from (or to) a vertex. A module level
+    function (rather than a lambda) so that graphs can be pickled."""
+    return defaultdict(float)
+
+
 class Graph(object):
     """Weighted and directed graph object intended for the graph associated to a
     Markov process. Gives easy access to the neighbors of a particular state
@@ -26,8 +32,8 @@ class Graph(object):
     def __init__(self, edges=None, directed=False):
         self.directed = directed
         self.original_edges = edges
-        self.out_mapping = defaultdict(lambda: defaultdict(float))
-        self.in_mapping = defaultdict(lambda: defaultdict(float))
+        self.out_mapping = defaultdict(_weights)
+        self.in_mapping = defaultdict(_weights)
         self._edges = []
         if edges:
             self.add_edges(edges)
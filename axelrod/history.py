@@ -0,0 +1,125 @@
+"""
+A compact, list like record of the actions played by a player.
+
+The actions are stored as their values (C = 1, D = 0) in a bytearray, with
+running counts of cooperations and defections. When pickled (for instance
+when sent to a worker process or saved in a cache) the actions are packed to
+one bit each.
+"""
+import numpy as np
+
+from axelrod.action import Action
+
+from typing import Iterable, List
+
+C, D = Action.C, Action.D
+_ACTIONS = (D, C)  # Indexed by the value of an action
+
+
+class History(object):
+    """
+    A sequence of actions that behaves like a list of actions.
+
+    Indexing returns an action and slicing returns a list of actions. A
+    History compares equal to a list (or another History) holding the same
+    actions.
+    """
+
+    __slots__ = ['_actions', '_cooperations']
+
+    def __init__(self, actions: Iterable[Action] = ()) -> None:
+        self._actions = bytearray(action.value for action in actions)
+        self._cooperations = self._actions.count(1)
+
+    @classmethod
+    def from_values(cls, values) -> 'History':
+        """Build a history from an iterable (or array) of action values."""
+        history = cls()
+        history._actions = bytearray(values)
+        history._cooperations = history._actions.count(1)
+        return history
+
+    @property
+    def values(self) -> bytearray:
+        """The values of the actions as a bytearray (C = 1, D = 0)."""
+        return self._actions
+
+    @property
+    def cooperations(self) -> int:
+        return self._cooperations
+
+    @property
+    def defections(self) -> int:
+        return len(self._actions) - self._cooperations
+
+    def append(self, action: Action) -> None:
+        value = action.value
+        self._actions.append(value)
+        self._cooperations += value
+
+    def extend(self, actions: Iterable[Action]) -> None:
+        if isinstance(actions, History):
+            values = actions.values
+        else:
+            values = bytearray(action.value for action in actions)
+        self._actions.extend(values)
+        self._cooperations += values.count(1)
+
+    def pop(self, index: int = -1) -> Action:
+        value = self._actions.pop(index)
+        self._cooperations -= value
+        return _ACTIONS[value]
+
+    def count(self, action: Action) -> int:
+        if action == C:
+            return self._cooperations
+        if action == D:
+            return len(self._actions) - self._cooperations
+        return 0
+
+    def copy(self) -> 'History':
+        return History.from_values(self._actions)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [_ACTIONS[value] for value in self._actions[key]]
+        return _ACTIONS[self._actions[key]]
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def __iter__(self):
+        return (_ACTIONS[value] for value in self._actions)
+
+    def __reversed__(self):
+        return (_ACTIONS[value] for value in reversed(self._actions))
+
+    def __contains__(self, action) -> bool:
+        return self.count(action) > 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, History):
+            return self._actions == other.values
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __add__(self, other) -> List[Action]:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> List[Action]:
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __getstate__(self):
+        """Pack the actions to one bit each."""
+        values = np.frombuffer(bytes(self._actions), dtype=np.uint8)
+        return len(self._actions), np.packbits(values).tobytes()
+
+    def __setstate__(self, state) -> None:
+        length, packed = state
+        values = np.unpackbits(np.frombuffer(packed, dtype=np.uint8))
+        self._actions = bytearray(values[:length].tobytes())
+        self._cooperations = self._actions.count(1)
@@ -0,0 +1,481 @@
+"""
+A binary, columnar alternative to the CSV file of interactions written by the
+Tournament class.
+
+A store is written when the filename given to Tournament.play ends with
+EXTENSION. The file starts with a header:
+
+- the magic bytes MAGIC,
+- the length (as a little endian unsigned 64 bit integer) and content of a
+  UTF-8 JSON object holding the version of the format, the names of the
+  players and the typed columns of the rows (as a NumPy dtype description).
+
+It is followed by any number of chunks, appended as the matches are played:
+
+- the number of rows and the size of the blob of actions (two little endian
+  unsigned 64 bit integers),
+- the rows as a NumPy structured array: one row per player per match
+  repetition, with the same numeric columns as the CSV file,
+- the blob of actions: the actions of the player of each row packed to one
+  bit each (C = 1, D = 0) and padded to a whole number of bytes. The
+  "Actions offset" (relative to the start of the blob of the chunk) and
+  "Actions length" columns locate the actions of a row.
+
+A store is read through a memory map (see InteractionStore) with an index
+file next to it (with INDEX_SUFFIX appended): the positions of the chunks
+and the rows sorted by (player index, opponent index, repetition), for the
+size and modification time of the store it was written for.
+"""
+from collections import defaultdict
+import json
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+EXTENSION = '.axl'
+MAGIC = b'AXELROD-INTERACTIONS\n'
+VERSION = 1
+INDEX_SUFFIX = '.index'
+INDEX_MAGIC = b'AXELROD-INTERACTIONS-INDEX\n'
+
+KEY_COLUMNS = ["Interaction index",
+               "Player index",
+               "Opponent index",
+               "Repetition"]
+RESULT_COLUMNS = ["Score",
+                  "Score difference",
+                  "Turns",
+                  "Score per turn",
+                  "Score difference per turn",
+                  "Win",
+                  "Initial cooperation",
+                  "Cooperation count",
+                  "CC count",
+                  "CD count",
+                  "DC count",
+                  "DD count",
+                  "CC to C count",
+                  "CC to D count",
+                  "CD to C count",
+                  "CD to D count",
+                  "DC to C count",
+                  "DC to D count",
+                  "DD to C count",
+                  "DD to D count",
+                  "Good partner"]
+
+_CHUNK_HEADER = struct.Struct('<QQ')
+_LENGTH = struct.Struct('<Q')
+
+
+def is_store_filename(filename: str) -> bool:
+    """Whether a tournament should write a store (rather than a CSV file) to
+    the given filename."""
+    return filename is not None and str(filename).endswith(EXTENSION)
+
+
+def is_store(filename: str) -> bool:
+    """Whether the given file is a store of interactions."""
+    try:
+        with open(filename, 'rb') as file_obj:
+            return file_obj.read(len(MAGIC)) == MAGIC
+    except (IOError, OSError):
+        return False
+
+
+def row_dtype(build_results: bool = True, score_dtype='<f8',
+              count_dtype='<i4') -> np.dtype:
+    """
+    Return the dtype of the rows of a store.
+
+    Parameters
+    ----------
+    build_results : bool
+        Whether the rows include the results of the matches
+    score_dtype : str
+        The dtype of the scores and score differences
+    count_dtype : str
+        The dtype of the number of turns and of the counts of actions and
+        states (floats for expected values)
+    """
+    fields = [("Interaction index", '<i8'),
+              ("Player index", '<i4'),
+              ("Opponent index", '<i4'),
+              ("Repetition", '<i4'),
+              ("Actions offset", '<i8'),
+              ("Actions length", '<i4')]
+    if build_results:
+        for column in RESULT_COLUMNS:
+            if column in ("Score", "Score difference"):
+                dtype = score_dtype
+            elif column in ("Score per turn", "Score difference per turn"):
+                dtype = '<f8'
+            elif column in ("Win", "Good partner"):
+                dtype = '<i1'
+            else:
+                dtype = count_dtype
+            fields.append((column, dtype))
+    return np.dtype(fields)
+
+
+def pack_rows(rows: List[tuple], actions: List[np.ndarray],
+              dtype: np.dtype) -> Tuple[np.ndarray, bytes]:
+    """
+    Pack rows and the actions of their players as a chunk of a store.
+
+    Parameters
+    ----------
+    rows : list
+        Tuples of the values of the columns of the rows (in the order of the
+        dtype, without the "Actions offset" and "Actions length" columns)
+    actions : list
+        The values of the actions of the player of each row
+    dtype : numpy.dtype
+        The dtype of the rows, as given by row_dtype
+
+    Returns
+    -------
+    tuple
+        The rows as a structured array and the blob of packed actions
+    """
+    packed = [np.packbits(np.asarray(values, dtype=np.uint8))
+              for values in actions]
+    lengths = np.array([len(values) for values in actions], dtype='<i8')
+    sizes = np.array([len(bits) for bits in packed], dtype='<i8')
+    offsets = np.cumsum(sizes) - sizes
+
+    array = np.zeros(len(rows), dtype=dtype)
+    if rows:
+        names = [name for name in dtype.names
+                 if name not in ("Actions offset", "Actions length")]
+        for name, column in zip(names, zip(*rows)):
+            array[name] = column
+    array["Actions offset"] = offsets
+    array["Actions length"] = lengths
+    return array, b''.join(bits.tobytes() for bits in packed)
+
+
+class InteractionWriter(object):
+    """Write the interactions of a tournament to a store, one chunk at a
+    time."""
+
+    def __init__(self, filename: str, players: List[str],
+                 dtype: np.dtype, append: bool = False) -> None:
+        """
+        Parameters
+        ----------
+        filename : str
+            The name of the file to write
+        players : list
+            The names of the players
+        dtype : numpy.dtype
+            The dtype of the rows, as given by row_dtype
+        append : bool
+            If True, chunks are appended to an existing store (written with
+            the same players and dtype) rather than starting a new one
+        """
+        self.filename = filename
+        self.dtype = dtype
+        self.columns = [name for name in dtype.names
+                        if name not in ("Actions offset", "Actions length")]
+        if append:
+            self.file_obj = open(filename, 'ab')
+            return
+        if os.path.exists(filename + INDEX_SUFFIX):
+            os.remove(filename + INDEX_SUFFIX)
+        header = json.dumps({"version": VERSION,
+                             "players": list(players),
+                             "dtype": dtype.descr}).encode('utf-8')
+        self.file_obj = open(filename, 'wb')
+        self.file_obj.write(MAGIC)
+        self.file_obj.write(_LENGTH.pack(len(header)))
+        self.file_obj.write(header)
+
+    def write(self, rows: List[tuple], actions: List[np.ndarray]) -> None:
+        """
+        Append a chunk of rows to the store.
+
+        Parameters
+        ----------
+        rows : list
+            Tuples of the values of the columns of the rows (in the order of
+            the dtype, without the "Actions offset" and "Actions length"
+            columns)
+        actions : list
+            The values of the actions of the player of each row
+        """
+        self.write_packed(*pack_rows(rows, actions, self.dtype))
+
+    def write_packed(self, array: np.ndarray, blob: bytes) -> None:
+        """Append a chunk of rows already packed by pack_rows."""
+        self.file_obj.write(_CHUNK_HEADER.pack(len(array), len(blob)))
+        self.file_obj.write(array.tobytes())
+        self.file_obj.write(blob)
+        self.file_obj.flush()
+
+    def flush(self) -> None:
+        self.file_obj.flush()
+
+    def tell(self) -> int:
+        return self.file_obj.tell()
+
+    def close(self) -> None:
+        self.file_obj.close()
+
+
+class InteractionStore(object):
+    """
+    A store of interactions opened for reading.
+
+    The file is memory mapped: the rows and the actions are read from it as
+    they are used rather than loaded at once. The positions of the chunks and
+    the index of the rows by (player index, opponent index, repetition) are
+    kept in a file next to the store (with INDEX_SUFFIX appended), so that
+    they are only built again when the store has changed.
+
+    Attributes
+    ----------
+    filename : str
+        The name of the file of the store
+    players : list
+        The names of the players
+    dtype : numpy.dtype
+        The dtype of the rows
+    """
+
+    def __init__(self, filename: str) -> None:
+        if not is_store(filename):
+            raise ValueError(
+                "{} is not a store of interactions.".format(filename))
+        self.filename = filename
+        self.index_filename = filename + INDEX_SUFFIX
+        stat = os.stat(filename)
+        self._data = np.asarray(np.memmap(filename, dtype=np.uint8,
+                                          mode='r'))
+        # The store the index file is valid for
+        self._signature = {"size": len(self._data),
+                           "mtime": stat.st_mtime_ns}
+
+        position = len(MAGIC)
+        header_length, = _LENGTH.unpack_from(self._data, position)
+        position += _LENGTH.size
+        header = json.loads(self._data[position:position + header_length]
+                            .tobytes().decode('utf-8'))
+        position += header_length
+        if header["version"] != VERSION:
+            raise ValueError(
+                "Unsupported store version: {}".format(header["version"]))
+        self.players = header["players"]
+        self.dtype = np.dtype([tuple(field) for field in header["dtype"]])
+
+        self._keys = None  # type: Optional[np.ndarray]
+        self._order = None  # type: Optional[np.ndarray]
+        self._repetitions = 0
+        self._index = None  # type: Optional[Dict]
+        if not self._load_index():
+            self._starts, self._sizes = self._scan(position)
+            self._save_index()
+        self._row_starts = np.concatenate([[0], np.cumsum(self._sizes)])
+
+    def _scan(self, position: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the headers of the chunks from a position of the file and
+        return the positions of their rows and their numbers of rows."""
+        starts, sizes = [], []
+        while len(self._data) - position >= _CHUNK_HEADER.size:
+            n_rows, size = _CHUNK_HEADER.unpack_from(self._data, position)
+            position += _CHUNK_HEADER.size
+            end = position + n_rows * self.dtype.itemsize + size
+            if end > len(self._data):
+                break  # A truncated chunk
+            starts.append(position)
+            sizes.append(n_rows)
+            position = end
+        return (np.array(starts, dtype=np.int64),
+                np.array(sizes, dtype=np.int64))
+
+    def _load_index(self) -> bool:
+        """Read the index file, if it was written for the store as it is."""
+        try:
+            with open(self.index_filename, 'rb') as file_obj:
+                if file_obj.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                    return False
+                header_length, = _LENGTH.unpack(file_obj.read(_LENGTH.size))
+                header = json.loads(
+                    file_obj.read(header_length).decode('utf-8'))
+                position = file_obj.tell()
+        except (IOError, OSError, ValueError, struct.error):
+            return False
+        if any(header.get(key) != value
+               for key, value in self._signature.items()):
+            return False
+        n_chunks, n_rows = header["chunks"], header.get("rows")
+        count = 2 * n_chunks + (0 if n_rows is None else 2 * n_rows)
+        if count == 0:
+            arrays = np.zeros(0, dtype='<i8')
+        else:
+            arrays = np.asarray(np.memmap(self.index_filename, dtype='<i8',
+                                          mode='r', offset=position,
+                                          shape=(count,)))
+        self._starts = np.array(arrays[:n_chunks])
+        self._sizes = np.array(arrays[n_chunks:2 * n_chunks])
+        if n_rows is not None:
+            self._keys = arrays[2 * n_chunks:2 * n_chunks + n_rows]
+            self._order = arrays[2 * n_chunks + n_rows:]
+            self._repetitions = header["repetitions"]
+        return True
+
+    def _save_index(self) -> None:
+        """Write the index file. A store in a directory that can not be
+        written to is indexed again every time it is opened."""
+        header = dict(self._signature, chunks=len(self._starts))
+        arrays = [self._starts, self._sizes]
+        if self._keys is not None:
+            header.update(rows=len(self._keys),
+                          repetitions=self._repetitions)
+            arrays += [self._keys, self._order]
+        header_bytes = json.dumps(header).encode('utf-8')
+        temporary = "{}.{}".format(self.index_filename, os.getpid())
+        try:
+            with open(temporary, 'wb') as file_obj:
+                file_obj.write(INDEX_MAGIC)
+                file_obj.write(_LENGTH.pack(len(header_bytes)))
+                file_obj.write(header_bytes)
+                for array in arrays:
+                    file_obj.write(np.asarray(array, dtype='<i8').tobytes())
+            os.replace(temporary, self.index_filename)
+        except (IOError, OSError):
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def __len__(self) -> int:
+        return int(self._row_starts[-1])
+
+    @property
+    def columns(self) -> List[str]:
+        """The names of the columns, as in the CSV file."""
+        return [name for name in self.dtype.names
+                if name not in ("Actions offset", "Actions length")]
+
+    def _chunk(self, chunk: int) -> np.ndarray:
+        return np.frombuffer(self._data, dtype=self.dtype,
+                             count=int(self._sizes[chunk]),
+                             offset=int(self._starts[chunk]))
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """Yield the rows of every chunk as a structured array read from the
+        file (the "Actions offset" column is relative to the actions of the
+        chunk)."""
+        for chunk in range(len(self._starts)):
+            yield self._chunk(chunk)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a column of all the rows."""
+        values = [rows[name] for rows in self.chunks()]
+        if not values:
+            return np.zeros(0, dtype=self.dtype[name])
+        return np.concatenate(values)
+
+    @property
+    def rows(self) -> np.ndarray:
+        """A structured array of all the rows, read into memory, where the
+        "Actions offset" column is the position of the actions in the
+        file."""
+        chunks = []
+        for chunk, rows in enumerate(self.chunks()):
+            rows = rows.copy()
+            rows["Actions offset"] += (self._starts[chunk] +
+                                       len(rows) * self.dtype.itemsize)
+            chunks.append(rows)
+        return np.concatenate(chunks) if chunks else np.zeros(
+            0, dtype=self.dtype)
+
+    def _row_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The sorted keys of the rows (see _key) and the positions of the
+        rows in that order."""
+        if self._keys is None:
+            repetitions = self.column("Repetition").astype(np.int64)
+            self._repetitions = int(repetitions.max()) + 1 if len(
+                repetitions) else 0
+            keys = self._key(self.column("Player index").astype(np.int64),
+                             self.column("Opponent index").astype(np.int64),
+                             repetitions)
+            # A stable sort keeps the rows of a key in the order of the file
+            order = np.argsort(keys, kind='mergesort')
+            self._keys, self._order = keys[order], order
+            self._save_index()
+        return self._keys, self._order
+
+    def _key(self, player_index, opponent_index, repetition):
+        return ((player_index * len(self.players) + opponent_index) *
+                self._repetitions + repetition)
+
+    def positions(self, player_index: int, opponent_index: int,
+                  repetition: int) -> List[int]:
+        """Return the positions of the rows of a player in a match
+        repetition (two rows for a player playing against itself)."""
+        keys, order = self._row_index()
+        if not (0 <= player_index < len(self.players) and
+                0 <= opponent_index < len(self.players) and
+                0 <= repetition < self._repetitions):
+            return []
+        key = self._key(player_index, opponent_index, repetition)
+        start = np.searchsorted(keys, key, side='left')
+        stop = np.searchsorted(keys, key, side='right')
+        return order[start:stop].tolist()
+
+    @property
+    def index(self) -> Dict[Tuple[int, int, int], List[int]]:
+        """A dictionary mapping (player index, opponent index, repetition)
+        to the positions of the corresponding rows (two rows for a player
+        playing against itself)."""
+        if self._index is None:
+            keys = zip(self.column("Player index").tolist(),
+                       self.column("Opponent index").tolist(),
+                       self.column("Repetition").tolist())
+            index = defaultdict(list)  # type: Dict
+            for position, key in enumerate(keys):
+                index[key].append(position)
+            self._index = dict(index)
+        return self._index
+
+    def actions(self, position: int) -> np.ndarray:
+        """Return the values of the actions (C = 1, D = 0) of the row at the
+        given position as an int8 array."""
+        if not 0 <= position < len(self):
+            raise IndexError("No row at position {}.".format(position))
+        chunk = int(np.searchsorted(self._row_starts, position,
+                                    side='right')) - 1
+        rows = self._chunk(chunk)
+        row = rows[position - self._row_starts[chunk]]
+        length = int(row["Actions length"])
+        offset = (int(self._starts[chunk]) + len(rows) * self.dtype.itemsize +
+                  int(row["Actions offset"]))
+        packed = self._data[offset:offset + (length + 7) // 8]
+        return np.unpackbits(packed)[:length].astype(np.int8)
+
+    def interaction(self, player_index: int, opponent_index: int,
+                    repetition: int) -> np.ndarray:
+        """Return the actions of a match repetition as an array of shape
+        (turns, 2), the actions of the given player first."""
+        players = self.positions(player_index, opponent_index, repetition)
+        opponents = self.positions(opponent_index, player_index, repetition)
+        if not players or not opponents:
+            raise KeyError((player_index, opponent_index, repetition))
+        return np.column_stack([self.actions(players[0]),
+                                self.actions(opponents[-1])])
+
+    def dataframe(self) -> pd.DataFrame:
+        """Return the rows as a pandas DataFrame with the numeric columns of
+        the CSV file. Integer columns are widened to 64 bits so that they can
+        be summed without overflowing."""
+        data = {}
+        for column in self.columns:
+            values = self.column(column)
+            if values.dtype.kind == 'i':
+                values = values.astype(np.int64)
+            data[column] = values
+        return pd.DataFrame(data, columns=self.columns)
@@ -6,23 +6,55 @@ form:
 
 This is used by both the Match class and the ResultSet class which analyse
 interactions.
+
+The compute_ functions also accept encoded interactions: an integer array of
+shape (turns, 2) of the values of the actions (C = 1, D = 0) or a pair of
+History objects. They then return NumPy results, where distributions over the
+states are arrays indexed by the values of the actions of both players:
+
+    state_distribution[1, 0]  # The count of (C, D)
 """
 from collections import Counter, defaultdict
 import csv
+import numpy as np
 import tqdm
 import pandas as pd
 
 from axelrod.action import Action, str_to_actions
 from .game import Game
+from .history import History
+from .interaction_store import InteractionStore, is_store
 
 
 C, D = Action.C, Action.D
+STATES = [(C, C), (C, D), (D, C), (D, D)]
+ACTIONS = (D, C)  # Indexed by the value of an action
+
+
+def is_encoded(interactions):
+    """Whether interactions are an array or a pair of History objects rather
+    than a list of pairs of actions."""
+    if isinstance(interactions, np.ndarray):
+        return True
+    return (isinstance(interactions, tuple) and len(interactions) == 2 and
+            all(isinstance(history, History) for history in interactions))
+
+
+def _as_array(interactions):
+    """Returns the encoding of encoded interactions and None for a list of
+    pairs of actions."""
+    if is_encoded(interactions):
+        return encode_interactions(interactions)
+    return None
 
 
 def compute_scores(interactions, game=None):
     """Returns the scores of a given set of interactions."""
     if not game:
         game = Game()
+    actions = _as_array(interactions)
+    if actions is not None:
+        return game.payoff_table()[actions[:, 0], actions[:, 1]]
     return [game.score(plays) for plays in interactions]
 
 
@@ -31,6 +63,8 @@ def compute_final_score(interactions, game=None):
     scores = compute_scores(interactions, game)
     if len(scores) == 0:
         return None
+    if isinstance(scores, np.ndarray):
+        return scores.sum(axis=0)
 
     final_score = tuple(sum([score[player_index] for score in scores])
                         for player_index in [0, 1])
@@ -40,10 +74,12 @@ def compute_final_score(interactions, game=None):
 def compute_final_score_per_turn(interactions, game=None):
     """Returns the mean score per round for a set of interactions"""
     scores = compute_scores(interactions, game)
-    num_turns = len(interactions)
+    num_turns = len(scores)
 
     if len(scores) == 0:
         return None
+    if isinstance(scores, np.ndarray):
+        return scores.mean(axis=0)
 
     final_score_per_turn = tuple(
         sum([score[player_index] for score in scores]) / num_turns
@@ -65,6 +101,11 @@ def compute_winner_index(interactions, game=None):
 def compute_cooperations(interactions):
     """Returns the count of cooperations by each player for a set of
     interactions"""
+    actions = _as_array(interactions)
+    if actions is not None:
+        if len(actions) == 0:
+            return None
+        return actions.sum(axis=0)
 
     if len(interactions) == 0:
         return None
@@ -77,6 +118,12 @@ def compute_cooperations(interactions):
 def compute_normalised_cooperation(interactions):
     """Returns the count of cooperations by each player per turn for a set of
     interactions"""
+    actions = _as_array(interactions)
+    if actions is not None:
+        if len(actions) == 0:
+            return None
+        return actions.mean(axis=0)
+
     if len(interactions) == 0:
         return None
 
@@ -102,8 +149,16 @@ def compute_state_distribution(interactions):
     ----------
     Counter(interactions) : Counter Object
         Dictionary where the keys are the states and the values are the number
-        of times that state occurs.
+        of times that state occurs. For encoded interactions, an array of
+        shape (2, 2) indexed by the values of the actions of both players.
     """
+    actions = _as_array(interactions)
+    if actions is not None:
+        if len(actions) == 0:
+            return None
+        codes = 2 * actions[:, 0] + actions[:, 1]
+        return np.bincount(codes, minlength=4).reshape(2, 2)
+
     if not interactions:
         return None
     return Counter(interactions)
@@ -123,8 +178,16 @@ def compute_normalised_state_distribution(interactions):
     ----------
     normalized_count : Counter Object
         Dictionary where the keys are the states and the values are a normalized
-        count of the number of times that state occurs.
+        count of the number of times that state occurs. For encoded
+        interactions, an array of shape (2, 2) indexed by the values of the
+        actions of both players.
     """
+    if is_encoded(interactions):
+        distribution = compute_state_distribution(interactions)
+        if distribution is None:
+            return None
+        return distribution / distribution.sum()
+
     if not interactions:
         return None
 
@@ -163,8 +226,20 @@ def compute_state_to_action_distribution(interactions):
     state_to_C_distributions : List of Counter Object
         List of Counter objects where the keys are the states and actions and
         the values the counts. The
-        first/second Counter corresponds to the first/second player.
+        first/second Counter corresponds to the first/second player. For
+        encoded interactions, an array of shape (2, 2, 2, 2) indexed by the
+        player and the values of the two actions of the state and of the
+        subsequent action.
     """
+    actions = _as_array(interactions)
+    if actions is not None:
+        if len(actions) == 0:
+            return None
+        states = 4 * actions[:-1, 0] + 2 * actions[:-1, 1]
+        return np.array([
+            np.bincount(states + actions[1:, player_index], minlength=8)
+            for player_index in range(2)]).reshape(2, 2, 2, 2)
+
     if not interactions:
         return None
 
@@ -201,8 +276,19 @@ def compute_normalised_state_to_action_distribution(interactions):
     normalised_state_to_C_distributions : List of Counter Object
         List of Counter objects where the keys are the states and actions and
         the values the normalized counts. The first/second Counter corresponds
-        to the first/second player.
+        to the first/second player. For encoded interactions, an array of
+        shape (2, 2, 2, 2) as given by compute_state_to_action_distribution
+        where states that never occur have a distribution of zeros.
     """
+    if is_encoded(interactions):
+        distribution = compute_state_to_action_distribution(interactions)
+        if distribution is None:
+            return None
+        totals = distribution.sum(axis=3, keepdims=True)
+        return np.divide(distribution, totals,
+                         out=np.zeros(distribution.shape),
+                         where=totals > 0)
+
     if not interactions:
         return None
 
@@ -223,6 +309,92 @@ def compute_normalised_state_to_action_distribution(interactions):
     return normalized_distribution
 
 
+def encode_interactions(interactions):
+    """
+    Returns the interactions (a list of pairs of actions or a pair of History
+    objects) as an array of shape (turns, 2) of the values of the actions
+    (C = 1, D = 0) with dtype int8. Arrays are returned as they are.
+    """
+    if isinstance(interactions, np.ndarray):
+        return interactions.astype(np.int8, copy=False)
+    if is_encoded(interactions):
+        if len(interactions[0]) != len(interactions[1]):
+            raise ValueError("The histories do not have the same length.")
+        return np.column_stack(
+            [np.frombuffer(history.values, dtype=np.int8)
+             for history in interactions]).reshape(-1, 2)
+    values = [(play[0].value, play[1].value) for play in interactions]
+    return np.array(values, dtype=np.int8).reshape(-1, 2)
+
+
+def summarise_interactions(interactions, game=None):
+    """
+    Returns all the results of a set of interactions that are written by the
+    Tournament, computed in a single vectorised pass.
+
+    Every turn is given a state code (0 to 3 for (C, C), (C, D), (D, C) and
+    (D, D)) and every pair of consecutive turns a transition code (twice the
+    code of the state plus 0 for a subsequent C and 1 for a D). All the
+    counts are then obtained with bincount.
+
+    Parameters
+    ----------
+    interactions : list of tuples or numpy.ndarray
+        A list containing the interactions of the match as shown at the top of
+        this file, or its encoding as given by encode_interactions.
+    game : axelrod.Game
+        The game used to score the interactions.
+
+    Returns
+    -------
+    list
+        The scores, score differences, number of turns, scores per turn,
+        score differences per turn, initial cooperations, cooperations, state
+        distribution, state to action distributions and winner index, as
+        given by the corresponding compute_ functions. None if there are no
+        interactions.
+    """
+    actions = encode_interactions(interactions)
+    turns = len(actions)
+    if turns == 0:
+        return None
+    if not game:
+        game = Game()
+
+    codes = 2 * (1 - actions[:, 0]) + (1 - actions[:, 1])
+    state_counts = np.bincount(codes, minlength=4)
+    payoffs = np.array([game.score(state) for state in STATES])
+
+    scores = tuple(state_counts.dot(payoffs).tolist())
+    score_diffs = scores[0] - scores[1], scores[1] - scores[0]
+    score_per_turns = scores[0] / turns, scores[1] / turns
+    score_diffs_per_turns = score_diffs[0] / turns, score_diffs[1] / turns
+    initial_cooperations = tuple(bool(value) for value in actions[0])
+    cooperations = tuple(actions.sum(axis=0, dtype=int).tolist())
+
+    state_distribution = Counter({
+        STATES[code]: count
+        for code, count in enumerate(state_counts.tolist()) if count})
+
+    state_to_action_distributions = []
+    for player_index in range(2):
+        transitions = 2 * codes[:-1] + (1 - actions[1:, player_index])
+        transition_counts = np.bincount(transitions, minlength=8)
+        state_to_action_distributions.append(Counter({
+            (STATES[code // 2], (C, D)[code % 2]): count
+            for code, count in enumerate(transition_counts.tolist())
+            if count}))
+
+    if scores[0] == scores[1]:
+        winner_index = False  # No winner
+    else:
+        winner_index = 0 if scores[0] > scores[1] else 1
+
+    return [scores, score_diffs, turns, score_per_turns,
+            score_diffs_per_turns, initial_cooperations, cooperations,
+            state_distribution, state_to_action_distributions, winner_index]
+
+
 def sparkline(actions, c_symbol='█', d_symbol=' '):
     return ''.join([
         c_symbol if play == C else d_symbol for play in actions])
@@ -230,6 +402,14 @@ def sparkline(actions, c_symbol='█', d_symbol=' '):
 
 def compute_sparklines(interactions, c_symbol='█', d_symbol=' '):
     """Returns the sparklines for a set of interactions"""
+    actions = _as_array(interactions)
+    if actions is not None:
+        if len(actions) == 0:
+            return None
+        symbols = (d_symbol, c_symbol)
+        return '\n'.join(''.join(symbols[value] for value in history)
+                         for history in actions.T.tolist())
+
     if len(interactions) == 0:
         return None
 
@@ -240,11 +420,17 @@ def compute_sparklines(interactions, c_symbol='█', d_symbol=' '):
         sparkline(histories[1], c_symbol, d_symbol))
 
 
-def read_interactions_from_file(filename, progress_bar=True):
+def read_interactions_from_file(filename, progress_bar=True,
+                                as_arrays=False):
     """
     Reads a file and returns a dictionary mapping tuples of player pairs to
-    lists of interactions
+    lists of interactions. If as_arrays is True, the interactions are
+    encoded as arrays (see encode_interactions) read directly from the
+    strings of actions. The file can also be a binary interaction store.
     """
+    if is_store(filename):
+        return _read_interactions_from_store(filename, as_arrays)
+
     df = pd.read_csv(filename)[["Interaction index", "Player index",
                                 "Opponent index", "Actions"]]
     groupby = df.groupby("Interaction index")
@@ -254,11 +440,50 @@ def read_interactions_from_file(filename, progress_bar=True):
     pairs_to_interactions = defaultdict(list)
     for _, d in tqdm.tqdm(groupby):
         key = tuple(d[["Player index", "Opponent index"]].iloc[0])
-        value = list(map(str_to_actions, zip(*d["Actions"])))
+        if as_arrays:
+            value = np.column_stack([string_to_values(actions)
+                                     for actions in d["Actions"]])
+        else:
+            value = list(map(str_to_actions, zip(*d["Actions"])))
+        pairs_to_interactions[key].append(value)
+    return pairs_to_interactions
+
+
+def _read_interactions_from_store(filename, as_arrays=False):
+    """Reads the interactions of a binary interaction store as
+    read_interactions_from_file does."""
+    store = InteractionStore(filename)
+    interaction_indices = store.column("Interaction index")
+    players = store.column("Player index")
+    opponents = store.column("Opponent index")
+    order = np.argsort(interaction_indices, kind='mergesort')
+    boundaries = np.flatnonzero(np.diff(interaction_indices[order])) + 1
+
+    pairs_to_interactions = defaultdict(list)
+    for positions in np.split(order, boundaries):
+        if len(positions) == 0:
+            continue
+        key = (int(players[positions[0]]), int(opponents[positions[0]]))
+        value = np.column_stack([store.actions(position)
+                                 for position in positions])
+        if not as_arrays:
+            value = [(ACTIONS[first], ACTIONS[second])
+                     for first, second in value.tolist()]
         pairs_to_interactions[key].append(value)
     return pairs_to_interactions
 
 
+def string_to_values(string):
+    """
+    Converts a string of actions to an array of the values of the actions
+    with dtype int8:
+
+    'CDD' -> array([1, 0, 0])
+    """
+    codes = np.frombuffer(string.encode(), dtype=np.uint8)
+    return (codes == ord(C.name)).astype(np.int8)
+
+
 def string_to_interactions(string):
     """
     Converts a compact string representation of an interaction to an
@@ -0,0 +1,224 @@
+"""
+Exact analysis of matches between two memory one players.
+
+A match between two players whose plays only depend on the previous round is a
+Markov chain on the four states:
+
+    (C, C), (C, D), (D, C), (D, D)
+
+given from the point of view of the first player. The transition matrix of
+that chain is built from the four-vectors of both players (adjusted for noise)
+which gives the expected state distribution, cooperations and scores of a
+match without having to play it.
+"""
+from collections import Counter
+
+import numpy as np
+
+from axelrod.action import Action
+from .game import Game
+
+from typing import Tuple
+
+C, D = Action.C, Action.D
+STATES = [(C, C), (C, D), (D, C), (D, D)]
+
+
+def is_memory_one(player) -> bool:
+    """
+    Whether the play of a player is entirely given by an initial action and a
+    four-vector: True for instances of MemoryOnePlayer that do not override
+    its strategy method.
+    """
+    strategy = getattr(type(player), 'strategy', None)
+    return (getattr(strategy, '__qualname__', None) ==
+            'MemoryOnePlayer.strategy' and
+            hasattr(player, '_four_vector') and
+            hasattr(player, '_initial'))
+
+
+def four_vector(player) -> np.ndarray:
+    """Return the four-vector (P(C|CC), P(C|CD), P(C|DC), P(C|DD)) of a
+    memory one player."""
+    return np.array([player._four_vector[state] for state in STATES])
+
+
+def noisy_probabilities(probabilities, noise: float = 0,
+                        noise_bias: bool = False) -> np.ndarray:
+    """
+    Return the probabilities of cooperating once noise has been applied to the
+    intended plays.
+
+    Parameters
+    ----------
+    probabilities : array like
+        The probabilities of intending to cooperate
+    noise : float
+        The probability that an intended action is flipped
+    noise_bias : bool
+        If True only cooperations are flipped
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    if noise_bias:
+        return probabilities * (1 - noise)
+    return probabilities * (1 - noise) + (1 - probabilities) * noise
+
+
+def transition_matrix(four_vector_1, four_vector_2, noise: float = 0,
+                      noise_bias: bool = False) -> np.ndarray:
+    """
+    Return the 4 by 4 transition matrix of a match between two memory one
+    players.
+
+    Parameters
+    ----------
+    four_vector_1, four_vector_2 : array like
+        The four-vectors of the two players, each from the point of view of the
+        player in question.
+    noise : float
+    noise_bias : bool
+
+    Returns
+    -------
+    numpy.ndarray
+        Entry [i, j] is the probability of moving from STATES[i] to STATES[j].
+    """
+    p = noisy_probabilities(four_vector_1, noise, noise_bias)
+    # The second player sees (C, D) as (D, C) and vice versa
+    q = noisy_probabilities(four_vector_2, noise, noise_bias)[[0, 2, 1, 3]]
+    return np.column_stack([p * q, p * (1 - q), (1 - p) * q,
+                            (1 - p) * (1 - q)])
+
+
+def initial_distribution(initial_1: Action, initial_2: Action,
+                         noise: float = 0,
+                         noise_bias: bool = False) -> np.ndarray:
+    """Return the distribution of the state of the first turn."""
+    p, q = noisy_probabilities([initial_1 == C, initial_2 == C], noise,
+                               noise_bias)
+    return np.array([p * q, p * (1 - q), (1 - p) * q, (1 - p) * (1 - q)])
+
+
+def geometric_matrix_sum(matrix: np.ndarray, n: int) -> np.ndarray:
+    """
+    Return I + A + A ^ 2 + ... + A ^ (n - 1) using O(log(n)) matrix
+    multiplications.
+    """
+    identity = np.eye(len(matrix))
+    if n <= 0:
+        return np.zeros_like(identity)
+    if n == 1:
+        return identity
+    half = geometric_matrix_sum(matrix, n // 2)
+    total = half + np.linalg.matrix_power(matrix, n // 2).dot(half)
+    if n % 2:
+        total = identity + matrix.dot(total)
+    return total
+
+
+def _discounted_sum(matrix: np.ndarray, turns: float, continuation: float):
+    """Return sum of (continuation * matrix) ^ t for t < turns."""
+    if turns == float('inf'):
+        if continuation == 1:
+            raise ValueError("A match with no end has no expected outcome.")
+        identity = np.eye(len(matrix))
+        return np.linalg.inv(identity - continuation * matrix)
+    return geometric_matrix_sum(continuation * matrix, int(turns))
+
+
+def expected_length(turns: float, prob_end: float = 0) -> float:
+    """Return the expected length of a match."""
+    if turns == float('inf'):
+        if prob_end == 0:
+            raise ValueError("A match with no end has no expected outcome.")
+        return 1 / prob_end
+    if prob_end == 0:
+        return turns
+    return (1 - (1 - prob_end) ** turns) / prob_end
+
+
+class MarkovChain(object):
+    """
+    The Markov chain of a match between two memory one players.
+
+    Parameters
+    ----------
+    players : tuple
+        A pair of memory one axelrod.Player objects
+    turns : integer or float('inf')
+        The maximum number of turns of the match
+    prob_end : float
+        The probability of a given turn ending the match
+    noise : float
+        The probability that a player's intended action should be flipped
+    noise_bias : bool
+        If True only cooperations are flipped
+    """
+
+    def __init__(self, players, turns: float, prob_end: float = 0,
+                 noise: float = 0, noise_bias: bool = False) -> None:
+        player_1, player_2 = players
+        self.turns = turns
+        self.prob_end = prob_end
+        self.transition_matrix = transition_matrix(
+            four_vector(player_1), four_vector(player_2), noise, noise_bias)
+        self.initial_distribution = initial_distribution(
+            player_1._initial, player_2._initial, noise, noise_bias)
+
+    def expected_length(self) -> float:
+        return expected_length(self.turns, self.prob_end)
+
+    def expected_state_counts(self) -> np.ndarray:
+        """
+        Return the expected number of times each state occurs in a match, in
+        the order of STATES.
+        """
+        continuation = 1 - self.prob_end
+        total = _discounted_sum(self.transition_matrix, self.turns,
+                                continuation)
+        return self.initial_distribution.dot(total)
+
+    def expected_transition_counts(self) -> np.ndarray:
+        """
+        Return the expected number of times each pair of consecutive states
+        occurs in a match: entry [i, j] is the expected number of times
+        STATES[i] is followed by STATES[j].
+        """
+        continuation = 1 - self.prob_end
+        total = continuation * _discounted_sum(
+            self.transition_matrix, self.turns - 1, continuation)
+        previous = self.initial_distribution.dot(total)
+        return previous[:, np.newaxis] * self.transition_matrix
+
+    def expected_state_distribution(self) -> Counter:
+        """Return a Counter of the expected number of times each state
+        occurs."""
+        return Counter(dict(zip(STATES, self.expected_state_counts())))
+
+    def expected_cooperations(self) -> Tuple[float, float]:
+        """Return the expected number of cooperations of each player."""
+        counts = self.expected_state_counts()
+        return counts[0] + counts[1], counts[0] + counts[2]
+
+    def expected_scores(self, game: Game = None) -> Tuple[float, float]:
+        """Return the expected total score of each player."""
+        if game is None:
+            game = Game()
+        counts = self.expected_state_counts()
+        payoffs = np.array([game.score(state) for state in STATES])
+        return tuple(counts.dot(payoffs))
+
+    def expected_state_to_action_distributions(self):
+        """
+        Return a list (for each player) of Counters of the expected number of
+        times a state is followed by a given action of that player, keyed as
+        in axelrod.interaction_utils.compute_state_to_action_distribution.
+        """
+        transitions = self.expected_transition_counts()
+        distributions = [Counter(), Counter()]
+        for i, state in enumerate(STATES):
+            for j, next_state in enumerate(STATES):
+                for player_index in range(2):
+                    key = (state, next_state[player_index])
+                    distributions[player_index][key] += transitions[i, j]
+        return distributions
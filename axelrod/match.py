@@ -1,11 +1,18 @@
+from collections import Counter
 from math import ceil, log
+import pickle
 import random
 
+import numpy as np
+
 from axelrod.action import Action
 from axelrod.game import Game
 from axelrod import DEFAULT_TURNS
 import axelrod.interaction_utils as iu
+from .compiled_fsm import compile_fsm, is_fsm_player, play_fsms
 from .deterministic_cache import DeterministicCache
+from .history import History
+from .markov import MarkovChain, is_memory_one
 
 
 C, D = Action.C, Action.D
@@ -17,12 +24,53 @@ def is_stochastic(players, noise):
     return (noise or any(p.classifier['stochastic'] for p in players))
 
 
+# Attributes that are updated by Player.play or are constant over a match and
+# so are not part of the state used to detect a cycle.
+_PLAY_ATTRIBUTES = frozenset(['history', 'cooperations', 'defections',
+                              'state_distribution', 'match_attributes',
+                              'init_kwargs'])
+
+
+def has_finite_memory(players):
+    """Determines if the players of a deterministic match only look at a
+    finite number of previous turns -- in which case the match is eventually
+    periodic."""
+    return all(
+        p.classifier['memory_depth'] < float('inf') and
+        not p.classifier['inspects_source'] and
+        not p.classifier['manipulates_source'] and
+        not p.classifier['manipulates_state']
+        for p in players)
+
+
+def player_state(player):
+    """
+    Return a hashable snapshot of the attributes of a player other than its
+    history.
+
+    Raises TypeError (or a pickle error) if the attributes can not be
+    serialised.
+    """
+    attributes = {key: value for key, value in player.__dict__.items()
+                  if key not in _PLAY_ATTRIBUTES}
+    return pickle.dumps(attributes, pickle.HIGHEST_PROTOCOL)
+
+
+def random_state():
+    """Return a comparable snapshot of the state of both random number
+    generators."""
+    name, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+    return (random.getstate(), keys.tobytes(), position, has_gauss,
+            cached_gaussian)
+
+
 class Match(object):
     """The Match class conducts matches between two players."""
 
     def __init__(self, players, turns=None, prob_end=None,
                  game=None, deterministic_cache=None,
-                 noise=0, noise_bias=False, match_attributes=None):
+                 noise=0, noise_bias=False, match_attributes=None,
+                 analytic=False):
         """
         Parameters
         ----------
@@ -44,6 +92,10 @@ class Match(object):
             Mapping attribute names to values which should be passed to players.
             The default is to use the correct values for turns, game and noise
             but these can be overridden if desired.
+        analytic : bool
+            If True and both players are memory one players, the match is not
+            played: the expected outcome is computed exactly from the Markov
+            chain of the match instead.
         """
 
         defaults = {(True, True): (DEFAULT_TURNS, 0),
@@ -55,6 +107,8 @@ class Match(object):
         self.result = []
         self.noise = noise
         self.noise_bias = noise_bias
+        self.analytic = analytic
+        self.markov_chain = None
 
         if game is None:
             self.game = Game()
@@ -99,6 +153,30 @@ class Match(object):
         """
         return is_stochastic(self.players, self.noise)
 
+    @property
+    def _analytic(self):
+        """
+        A boolean to show whether the outcome of the match is computed
+        exactly rather than played.
+        """
+        return self.analytic and all(is_memory_one(p) for p in self.players)
+
+    @property
+    def _fsm(self):
+        """
+        A boolean to show whether the match is between two finite state
+        machine players and can be played as a product automaton.
+        """
+        return all(is_fsm_player(p) for p in self.players)
+
+    @property
+    def _periodic(self):
+        """
+        A boolean to show whether the match is bound to become periodic, in
+        which case it can be fast forwarded once a cycle has been detected.
+        """
+        return not self._stochastic and has_finite_memory(self.players)
+
     @property
     def _cache_update_required(self):
         """
@@ -128,7 +206,14 @@ class Match(object):
             [(C, C), (C, D)]
 
         i.e. One entry per turn containing a pair of actions.
+
+        In analytic mode (for two memory one players) no actions are played:
+        the result is an empty list and the exact expected outcome is given by
+        the `markov_chain` attribute and the other methods of the match.
         """
+        if self._analytic:
+            return self._play_analytic()
+
         turns = min(sample_length(self.prob_end), self.turns)
         cache_key = (self.players[0], self.players[1], turns)
 
@@ -136,8 +221,14 @@ class Match(object):
             for p in self.players:
                 p.reset()
                 p.set_match_attributes(**self.match_attributes)
-            for _ in range(turns):
-                self.players[0].play(self.players[1], self.noise, self.noise_bias)
+            if self._fsm:
+                self._play_fsms(turns)
+            elif self._periodic:
+                self._play_periodic(turns)
+            else:
+                for _ in range(turns):
+                    self.players[0].play(self.players[1], self.noise,
+                                         self.noise_bias)
             result = list(
                 zip(self.players[0].history, self.players[1].history))
 
@@ -147,22 +238,135 @@ class Match(object):
             result = self._cache[cache_key]
 
         self.result = result
+        self.markov_chain = None
         return result
 
+    def _play_fsms(self, turns):
+        """
+        Play a match between two finite state machine players as a single
+        compiled product automaton and set the histories and states of the
+        players at once.
+        """
+        fsms = [compile_fsm(p) for p in self.players]
+        actions1, actions2, state1, state2 = play_fsms(
+            fsms[0], fsms[1], turns, self.noise, self.noise_bias)
+        history1 = History.from_values(actions1)
+        history2 = History.from_values(actions2)
+        for player, fsm, state, history, opponent_history in (
+                (self.players[0], fsms[0], state1, history1, history2),
+                (self.players[1], fsms[1], state2, history2, history1)):
+            player.history = history
+            player.cooperations = history.count(C)
+            player.defections = history.count(D)
+            for last_turn, count in Counter(
+                    zip(history, opponent_history)).items():
+                player.state_distribution[last_turn] += count
+            player.fsm.state = fsm.states[state]
+
+    def _play_periodic(self, turns):
+        """
+        Play a deterministic match between two players with finite memory.
+
+        The next play of such players only depends on the last `memory_depth`
+        turns and on their other attributes, so the match is periodic as soon
+        as this joint state repeats. Once a repeated state has been found, the
+        histories of the players are extended by whole cycles and only the
+        remaining turns are actually played.
+        """
+        player1, player2 = self.players
+        # One more turn than the memory depth is kept: some strategies also
+        # behave differently until their history is longer than their depth.
+        depth = max(p.classifier['memory_depth'] for p in self.players) + 1
+        seen = {}
+        for turn in range(turns):
+            start = max(turn - depth, 0)
+            try:
+                state = (tuple(player1.history[start:]),
+                         tuple(player2.history[start:]),
+                         player_state(player1), player_state(player2))
+            except (TypeError, AttributeError, pickle.PicklingError):
+                # The players can not be compared: play the match out.
+                for _ in range(turns - turn):
+                    player1.play(player2)
+                return
+            if state in seen:
+                break
+            seen[state] = turn
+            player1.play(player2)
+        else:
+            return
+
+        cycle_start = seen[state]
+        period = turn - cycle_start
+        # Some players are classified as deterministic but still draw random
+        # numbers: the cycle can only be skipped if playing it once more
+        # leaves the random number generators untouched.
+        before = random_state()
+        for _ in range(min(period, turns - turn)):
+            player1.play(player2)
+        turn += period
+        if turn >= turns:
+            return
+        if random_state() != before:
+            for _ in range(turns - turn):
+                player1.play(player2)
+            return
+
+        cycle_start += period
+        repeats, remainder = divmod(turns - turn, period)
+        cycle = list(zip(player1.history[cycle_start:],
+                         player2.history[cycle_start:]))
+        for player, index in ((player1, 0), (player2, 1)):
+            actions = [pair[index] for pair in cycle]
+            player.history.extend(actions * repeats)
+            player.cooperations += actions.count(C) * repeats
+            player.defections += actions.count(D) * repeats
+            for pair in cycle:
+                last_turn = (pair[index], pair[1 - index])
+                player.state_distribution[last_turn] += repeats
+        for _ in range(remainder):
+            player1.play(player2)
+
+    def _play_analytic(self):
+        """
+        Build the Markov chain of a match between two memory one players
+        instead of playing it.
+        """
+        for p in self.players:
+            p.reset()
+            p.set_match_attributes(**self.match_attributes)
+        self.markov_chain = MarkovChain(self.players, turns=self.turns,
+                                        prob_end=self.prob_end,
+                                        noise=self.noise,
+                                        noise_bias=self.noise_bias)
+        self.result = []
+        return self.result
+
     def scores(self):
         """Returns the scores of the previous Match plays."""
         return iu.compute_scores(self.result, self.game)
 
     def final_score(self):
         """Returns the final score for a Match."""
+        if self.markov_chain is not None:
+            return self.markov_chain.expected_scores(self.game)
         return iu.compute_final_score(self.result, self.game)
 
     def final_score_per_turn(self):
         """Returns the mean score per round for a Match."""
+        if self.markov_chain is not None:
+            length = self.markov_chain.expected_length()
+            return tuple(score / length for score in
+                         self.markov_chain.expected_scores(self.game))
         return iu.compute_final_score_per_turn(self.result, self.game)
 
     def winner(self):
         """Returns the winner of the Match."""
+        if self.markov_chain is not None:
+            scores = self.final_score()
+            if scores[0] == scores[1]:
+                return False
+            return self.players[scores.index(max(scores))]
         winner_index = iu.compute_winner_index(self.result, self.game)
         if winner_index is False:  # No winner
             return False
@@ -172,22 +376,33 @@ class Match(object):
 
     def cooperation(self):
         """Returns the count of cooperations by each player."""
+        if self.markov_chain is not None:
+            return self.markov_chain.expected_cooperations()
         return iu.compute_cooperations(self.result)
 
     def normalised_cooperation(self):
         """Returns the count of cooperations by each player per turn."""
+        if self.markov_chain is not None:
+            length = self.markov_chain.expected_length()
+            return tuple(c / length for c in self.cooperation())
         return iu.compute_normalised_cooperation(self.result)
 
     def state_distribution(self):
         """
         Returns the count of each state for a set of interactions.
         """
+        if self.markov_chain is not None:
+            return self.markov_chain.expected_state_distribution()
         return iu.compute_state_distribution(self.result)
 
     def normalised_state_distribution(self):
         """
         Returns the normalized count of each state for a set of interactions.
         """
+        if self.markov_chain is not None:
+            length = self.markov_chain.expected_length()
+            return Counter({state: count / length for state, count in
+                            self.state_distribution().items()})
         return iu.compute_normalised_state_distribution(self.result)
 
     def sparklines(self, c_symbol='█', d_symbol=' '):
@@ -2,7 +2,8 @@
 class MatchGenerator(object):
 
     def __init__(self, players, repetitions, turns=None, game=None, noise=0,
-                 noise_bias=False, prob_end=None, edges=None, match_attributes=None):
+                 noise_bias=False, prob_end=None, edges=None, match_attributes=None,
+                 analytic=False):
         """
         A class to generate matches. This is used by the Tournament class which
         is in charge of playing the matches and collecting the results.
@@ -27,6 +28,9 @@ class MatchGenerator(object):
             Mapping attribute names to values which should be passed to players.
             The default is to use the correct values for turns, game and noise
             but these can be overridden if desired.
+        analytic : bool
+            Whether matches between memory one players are computed exactly
+            rather than played
         """
         self.players = players
         self.turns = turns
@@ -37,6 +41,7 @@ class MatchGenerator(object):
         self.opponents = players
         self.prob_end = prob_end
         self.match_attributes = match_attributes
+        self.analytic = analytic
 
         self.edges = edges
         if edges is not None:
@@ -50,20 +55,32 @@ class MatchGenerator(object):
     def __len__(self):
         return self.size
 
-    def build_match_chunks(self):
+    def build_match_chunks(self, start: int = 0, stop: int = None):
         """
         A generator that returns player index pairs and match parameters for a
         round robin tournament.
 
+        Parameters
+        ----------
+        start : int
+            The position (in the order of the generator) of the first pair of
+            players
+        stop : int
+            The position after the last pair of players (all the pairs if
+            None). A range of positions describes chunks that can be built
+            independently, for example by a worker process.
+
         Yields
         -------
         tuples
-            ((player1 index, player2 index), match object)
+            ((player1 index, player2 index), match parameters, repetitions)
         """
+        if stop is None or stop > self.size:
+            stop = self.size
         if self.edges is None:
-            edges = complete_graph(self.players)
+            edges = complete_graph_pairs(len(self.players), start, stop)
         else:
-            edges = self.edges
+            edges = self.edges[start:stop]
 
         for index_pair in edges:
             match_params = self.build_single_match_params()
@@ -75,7 +92,20 @@ class MatchGenerator(object):
         """
         return {"turns": self.turns, "game": self.game,
                 "noise": self.noise, "noise_bias": self.noise_bias,
-                "prob_end": self.prob_end, "match_attributes": self.match_attributes}
+                "prob_end": self.prob_end, "match_attributes": self.match_attributes,
+                "analytic": self.analytic}
+
+
+def chunk_repetitions(chunk) -> range:
+    """
+    Return the range of repetitions of a chunk of matches: the third element
+    of a chunk is either a number of repetitions (for all the repetitions of
+    a match) or the range of repetitions of part of them.
+    """
+    repetitions = chunk[2]
+    if isinstance(repetitions, range):
+        return repetitions
+    return range(repetitions)
 
 
 def complete_graph(players):
@@ -87,6 +117,25 @@ def complete_graph(players):
             yield (player1_index, player2_index)
 
 
+def complete_graph_pairs(n: int, start: int, stop: int):
+    """
+    Return generator of the edges of a complete graph (with loops) on n
+    players from the position start to the position stop, in the order of
+    complete_graph, without generating the edges before start.
+    """
+    first, offset = 0, 0
+    while first < n and offset + n - first <= start:
+        offset += n - first
+        first += 1
+    second = first + start - offset
+    for _ in range(start, stop):
+        if second == n:
+            first += 1
+            second = first
+        yield (first, second)
+        second += 1
+
+
 def graph_is_connected(edges, players):
     """
     Test if the set of edges defines a graph in which each player is connected
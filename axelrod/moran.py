@@ -44,7 +44,8 @@ class MoranProcess(object):
                  deterministic_cache: DeterministicCache = None,
                  mutation_rate: float = 0., mode: str = 'bd',
                  interaction_graph: Graph = None,
-                 reproduction_graph: Graph = None) -> None:
+                 reproduction_graph: Graph = None,
+                 analytic: bool = False) -> None:
         """
         An agent based Moran process class. In each round, each player plays a
         Match with each other player. Players are assigned a fitness score by
@@ -92,11 +93,15 @@ class MoranProcess(object):
         reproduction_graph: Axelrod.graph.Graph
             The reproduction graph, set equal to the interaction graph if not
             given
+        analytic:
+            If True, the fitness obtained from a match between two memory one
+            players is its exact expected value rather than a sampled one
         """
         self.turns = turns
         self.prob_end = prob_end
         self.game = game
         self.noise = noise
+        self.analytic = analytic
         self.initial_players = players  # save initial population
         self.players = []  # type: List
         self.populations = []  # type: List
@@ -325,7 +330,8 @@ class MoranProcess(object):
                           turns=self.turns, prob_end=self.prob_end,
                           noise=self.noise,
                           game=self.game,
-                          deterministic_cache=self.deterministic_cache)
+                          deterministic_cache=self.deterministic_cache,
+                          analytic=self.analytic)
             match.play()
             match_scores = match.final_score_per_turn()
             scores[i] += match_scores[0]
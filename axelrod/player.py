@@ -1,4 +1,4 @@
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 import copy
 import inspect
 import itertools
@@ -8,6 +8,7 @@ import numpy as np
 
 from axelrod.action import Action
 from .game import DefaultGame
+from .history import History
 
 import types
 from typing import Dict, Any
@@ -15,6 +16,13 @@ from typing import Dict, Any
 C, D = Action.C, Action.D
 
 
+# The parameters of the __init__ method of a player class: their names (in
+# order), the names that can be given positionally and the default values.
+# If __init__ takes *args or **kwargs, only its signature is given.
+InitSpec = namedtuple('InitSpec',
+                      'names, name_set, positional, defaults, signature')
+
+
 # Strategy classifiers
 
 def is_basic(s):
@@ -102,6 +110,47 @@ class Player(object):
         Use *args and *kwargs as value if specified
         and complete the rest with the default values.
         """
+        spec = cls._init_spec()
+        if spec.signature is not None:
+            # __init__ takes *args or **kwargs: bind them in full
+            boundargs = spec.signature.bind_partial(*args, **kwargs)
+            boundargs.apply_defaults()
+            return boundargs.arguments
+
+        if len(args) > len(spec.positional):
+            raise TypeError('too many positional arguments')
+        arguments = dict(zip(spec.positional, args))
+        for name, value in kwargs.items():
+            if name not in spec.name_set:
+                raise TypeError(
+                    'got an unexpected keyword argument {!r}'.format(name))
+            if name in arguments:
+                raise TypeError(
+                    'multiple values for argument {!r}'.format(name))
+            arguments[name] = value
+        params = {}
+        for name in spec.names:
+            if name in arguments:
+                params[name] = arguments[name]
+            elif name in spec.defaults:
+                params[name] = spec.defaults[name]
+        return params
+
+    @classmethod
+    def _init_spec(cls) -> InitSpec:
+        """
+        Return the parameters of the __init__ method of the class, computed
+        once per class from its signature.
+
+        The spec is stored on the class itself (and not inherited) along with
+        the __init__ method it was computed from, so that new classes (for
+        example those built by StrategyTransformerFactory) and classes with a
+        replaced __init__ get their own spec.
+        """
+        cached = cls.__dict__.get('_cached_init_spec')
+        if cached is not None and cached[0] is cls.__init__:
+            return cached[1]
+
         sig = inspect.signature(cls.__init__)
         # The 'self' parameter needs to be removed or the first *args will be
         # assigned to it
@@ -109,14 +158,29 @@ class Player(object):
         new_params = list(sig.parameters.values())
         new_params.remove(self_param)
         sig = sig.replace(parameters=new_params)
-        boundargs = sig.bind_partial(*args, **kwargs)
-        boundargs.apply_defaults()
-        return boundargs.arguments
+
+        if any(param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+               for param in new_params):
+            spec = InitSpec((), frozenset(), (), {}, sig)
+        else:
+            names = tuple(param.name for param in new_params)
+            positional = tuple(
+                param.name for param in new_params
+                if param.kind == param.POSITIONAL_OR_KEYWORD)
+            defaults = {param.name: param.default for param in new_params
+                        if param.default is not param.empty}
+            spec = InitSpec(names, frozenset(names), positional, defaults,
+                            None)
+        cls._cached_init_spec = (cls.__init__, spec)
+        return spec
 
     def __init__(self):
         """Initiates an empty history and 0 score for a player."""
-        self.history = []
-        self.classifier = copy.deepcopy(self.classifier)
+        self.history = History()
+        # The values of a classifier are numbers, booleans or sets of
+        # strings: copying each value is a deep copy.
+        self.classifier = {dimension: copy.copy(value) for dimension, value
+                           in self.classifier.items()}
         for dimension in self.default_classifier:
             if dimension not in self.classifier:
                 self.classifier[dimension] = self.default_classifier[dimension]
@@ -255,7 +319,7 @@ class Player(object):
         of players) to reset a player's state to its initial starting point.
         It ensures that no 'memory' of previous matches is carried forward.
         """
-        self.history = []
+        self.history = History()
         self.cooperations = 0
         self.defections = 0
         self.state_distribution = defaultdict(int)
@@ -1,3 +1,4 @@
+import hashlib
 import random
 import numpy
 from axelrod.action import Action
@@ -44,6 +45,28 @@ def seed(seed_):
     numpy.random.seed(seed_)
 
 
+def derive_seed(seed_: int, *key) -> int:
+    """
+    Derive a 32 bit seed from a seed and a key (for example a player index
+    pair and a repetition), so that independent streams of random numbers
+    can be played in any order and in any process.
+
+    Parameters
+    ----------
+    seed_ : int
+        The seed the new seed is derived from
+    key
+        Any values with a stable representation (integers, tuples of
+        integers...) identifying the stream
+
+    Returns
+    -------
+    int
+    """
+    digest = hashlib.sha256(repr((seed_,) + key).encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'little')
+
+
 class Pdf(object):
     """A class for a probability distribution"""
     def __init__(self, counter):
@@ -1,22 +1,23 @@
 from collections import namedtuple, Counter
-from multiprocessing import cpu_count
 import csv
-import itertools
+import warnings
 
 import numpy as np
+import pandas as pd
 import tqdm
 
-import dask as da
-import dask.dataframe as dd
-
 from axelrod.action import Action, str_to_actions
 import axelrod.interaction_utils as iu
 from . import eigen
 from .game import Game
+from .interaction_store import (InteractionStore, KEY_COLUMNS,
+                                RESULT_COLUMNS, is_store)
 
 
 C, D = Action.C, Action.D
 
+READ_CHUNK_ROWS = 100000
+
 
 def update_progress_bar(method):
     """A decorator to update a progress bar if it exists"""
@@ -35,10 +36,14 @@ def update_progress_bar(method):
 
 class ResultSet():
     """
-    A class to hold the results of a tournament. Reads in a CSV file produced
-    by the tournament class.
+    A class to hold the results of a tournament. Reads in a CSV file or a
+    binary interaction store produced by the tournament class.
     """
 
+    _states = [(C, C), (C, D), (D, C), (D, D)]
+    _states_to_actions = [(state, action) for state in _states
+                          for action in (C, D)]
+
     def __init__(self, filename,
                  players, repetitions,
                  processes=None, progress_bar=True):
@@ -54,8 +59,13 @@ class ResultSet():
                 The number of repetitions of each match. If not know will be
                 efficiently read from file.
             processes : integer
-                The number of processes to be used for parallel processing
+                Deprecated and not used: the results are built in this
+                process from NumPy arrays.
         """
+        if processes is not None:
+            warnings.warn(
+                "The processes argument of ResultSet is deprecated and not "
+                "used.", DeprecationWarning)
         self.filename = filename
         self.players, self.repetitions = players, repetitions
         self.num_players = len(self.players)
@@ -64,63 +74,86 @@ class ResultSet():
             self.progress_bar = tqdm.tqdm(total=25,
                                           desc="Analysing")
 
-        df = dd.read_csv(filename)
-        dask_tasks = self._build_tasks(df)
+        accumulator = ResultAccumulator.read(filename, self.num_players,
+                                             repetitions)
+        self._reshape_out(accumulator)
 
-        if processes == 0:
-            processes = cpu_count()
+        if progress_bar:
+            self.progress_bar.close()
 
-        out = self._compute_tasks(tasks=dask_tasks, processes=processes)
+    @classmethod
+    def from_accumulator(cls, accumulator, players, progress_bar=True):
+        """
+        Build a result set from the results of a tournament accumulated in
+        memory, without reading any file.
 
-        self._reshape_out(*out)
+        Parameters
+        ----------
+            accumulator : ResultAccumulator
+                The accumulated results of all the matches
+            players : list
+                A list of the names of players.
+            progress_bar : bool
+                Whether or not to create a progress bar which will be updated
+        """
+        result_set = cls.__new__(cls)
+        result_set.filename = None
+        result_set.players = players
+        result_set.repetitions = accumulator.repetitions
+        result_set.num_players = len(players)
 
         if progress_bar:
-            self.progress_bar.close()
+            result_set.progress_bar = tqdm.tqdm(total=25, desc="Analysing")
 
-    def _reshape_out(self,
-                     mean_per_reps_player_opponent_df,
-                     sum_per_player_opponent_df,
-                     sum_per_player_repetition_df,
-                     normalised_scores_series,
-                     initial_cooperation_count_series,
-                     interactions_count_series):
-        """
-        Reshape the various pandas series objects to be of the required form and
-        set the corresponding attributes.
-        """
-
-        self.payoffs = self._reshape_three_dim_list(
-                mean_per_reps_player_opponent_df["Score per turn"],
-                first_dimension=range(self.num_players),
-                second_dimension=range(self.num_players),
-                third_dimension=range(self.repetitions),
-                key_order=[2, 0, 1])
-
-        self.score_diffs = self._reshape_three_dim_list(
-                mean_per_reps_player_opponent_df["Score difference per turn"],
-                first_dimension=range(self.num_players),
-                second_dimension=range(self.num_players),
-                third_dimension=range(self.repetitions),
-                key_order=[2, 0, 1],
-                alternative=0)
-
-        self.match_lengths = self._reshape_three_dim_list(
-                mean_per_reps_player_opponent_df["Turns"],
-                first_dimension=range(self.repetitions),
-                second_dimension=range(self.num_players),
-                third_dimension=range(self.num_players),
-                alternative=0)
-
-        self.wins = self._reshape_two_dim_list(sum_per_player_repetition_df["Win"])
-        self.scores = self._reshape_two_dim_list(sum_per_player_repetition_df["Score"])
-        self.normalised_scores = self._reshape_two_dim_list(normalised_scores_series)
-
-        self.cooperation = self._build_cooperation(sum_per_player_opponent_df["Cooperation count"])
-        self.good_partner_matrix = self._build_good_partner_matrix(sum_per_player_opponent_df["Good partner"])
+        result_set._reshape_out(accumulator)
+
+        if progress_bar:
+            result_set.progress_bar.close()
+        return result_set
+
+    def _reshape_out(self, accumulator):
+        """
+        Compute the attributes from the dense arrays of sums (indexed by
+        repetition, player and opponent) of a ResultAccumulator.
+        """
+        played = accumulator.rows > 0
+        rows = np.maximum(accumulator.rows, 1)
+        turns = accumulator.turns / rows
+
+        # Indexed by player, opponent and repetition
+        by_pair = (1, 2, 0)
+        pair_played = np.transpose(played, by_pair)
+        payoffs = np.ascontiguousarray(
+            np.transpose(accumulator.score_per_turn / rows, by_pair))
+        score_diffs = np.ascontiguousarray(
+            np.transpose(accumulator.score_diff_per_turn / rows, by_pair))
+
+        self.payoffs = self._reshape_three_dim_list(payoffs, pair_played)
+        self.score_diffs = self._reshape_three_dim_list(score_diffs,
+                                                        pair_played,
+                                                        alternative=0)
+        self.match_lengths = self._reshape_three_dim_list(turns, played,
+                                                          alternative=0)
+
+        interactions = accumulator.interactions
+        self.wins = self._reshape_two_dim_list(accumulator.wins)
+        self.scores = self._reshape_two_dim_list(accumulator.scores)
+        self.normalised_scores = self._reshape_two_dim_list(
+            accumulator.normalised_scores / np.maximum(interactions, 1))
+
+        pair_sums = dict(zip(accumulator._pair_columns,
+                             np.moveaxis(accumulator.pair_sums, 2, 0)))
+        self.cooperation = self._build_cooperation(
+            pair_sums["Cooperation count"])
+        self.good_partner_matrix = self._build_good_partner_matrix(
+            pair_sums["Good partner"])
 
         columns = ["CC count", "CD count", "DC count", "DD count"]
-        self.state_distribution = self._build_state_distribution(sum_per_player_opponent_df[columns])
-        self.normalised_state_distribution = self._build_normalised_state_distribution()
+        state_counts = np.stack([pair_sums[column] for column in columns],
+                                axis=2)
+        self.state_distribution = self._build_state_distribution(state_counts)
+        self.normalised_state_distribution = self._build_normalised_state_distribution(
+            state_counts)
 
         columns = ["CC to C count",
                    "CC to D count",
@@ -130,156 +163,137 @@ class ResultSet():
                    "DC to D count",
                    "DD to C count",
                    "DD to D count"]
-        self.state_to_action_distribution = self._build_state_to_action_distribution(sum_per_player_opponent_df[columns])
-        self.normalised_state_to_action_distribution = self._build_normalised_state_to_action_distribution()
-
-        self.initial_cooperation_count = self._build_initial_cooperation_count(initial_cooperation_count_series)
-        self.initial_cooperation_rate = self._build_initial_cooperation_rate(interactions_count_series)
-        self.good_partner_rating = self._build_good_partner_rating(interactions_count_series)
-
-        self.normalised_cooperation = self._build_normalised_cooperation()
+        state_to_action_counts = np.stack(
+            [pair_sums[column] for column in columns], axis=2)
+        self.state_to_action_distribution = self._build_state_to_action_distribution(
+            state_to_action_counts)
+        self.normalised_state_to_action_distribution = self._build_normalised_state_to_action_distribution(
+            state_to_action_counts)
+
+        interactions_count = interactions.sum(axis=1)
+        self.initial_cooperation_count = self._build_initial_cooperation_count(
+            accumulator.initial_cooperation)
+        self.initial_cooperation_rate = self._build_initial_cooperation_rate(
+            interactions_count)
+        self.good_partner_rating = self._build_good_partner_rating(
+            interactions_count)
+
+        total_turns = turns.sum(axis=0)
+        self.normalised_cooperation = self._build_normalised_cooperation(
+            total_turns)
         self.ranking = self._build_ranking()
         self.ranked_names = self._build_ranked_names()
 
-        self.payoff_matrix = self._build_summary_matrix(self.payoffs)
-        self.payoff_stddevs = self._build_summary_matrix(self.payoffs,
+        self.payoff_matrix = self._build_summary_matrix(payoffs, pair_played)
+        self.payoff_stddevs = self._build_summary_matrix(payoffs, pair_played,
                                                          func=np.std)
 
-        self.payoff_diffs_means = self._build_payoff_diffs_means()
-        self.cooperating_rating = self._build_cooperating_rating()
+        self.payoff_diffs_means = self._build_payoff_diffs_means(score_diffs)
+        self.cooperating_rating = self._build_cooperating_rating(total_turns)
         self.vengeful_cooperation = self._build_vengeful_cooperation()
         self.eigenjesus_rating = self._build_eigenjesus_rating()
         self.eigenmoses_rating = self._build_eigenmoses_rating()
 
     @update_progress_bar
-    def _reshape_three_dim_list(self, series,
-                                first_dimension,
-                                second_dimension,
-                                third_dimension,
-                                alternative=None,
-                                key_order=[0, 1, 2]):
+    def _reshape_three_dim_list(self, values, played, alternative=None):
         """
         Parameters
         ----------
 
-            payoffs_series : pandas.Series
-            first_dimension : iterable
-            second_dimension : iterable
-            third_dimension : iterable
+            values : numpy.ndarray
+                A three dimensional array
+            played : numpy.ndarray
+                A boolean array of the same shape: whether there is an entry
+                at a given position
             alternative : int
-                What to do if there is no entry at given position
-            key_order : list
-                Indices re-ording the dimensions to the correct keys in the
-                series
+                What to do if there is no entry at given position (the
+                position is skipped if None)
 
         Returns:
         --------
             A three dimensional list across the three dimensions
         """
-        series_dict = series.to_dict()
-        output = []
-        for first_index in first_dimension:
-            matrix = []
-            for second_index in second_dimension:
-                row = []
-                for third_index in third_dimension:
-                    key = (first_index, second_index, third_index)
-                    key = tuple([key[order] for order in key_order])
-                    if key in series_dict:
-                        row.append(series_dict[key])
-                    elif alternative is not None:
-                        row.append(alternative)
-                matrix.append(row)
-            output.append(matrix)
-        return output
+        if alternative is not None:
+            return np.where(played, values, alternative).tolist()
+        if played.all():
+            return values.tolist()
+        return [[row[mask].tolist() for row, mask in zip(matrix, masks)]
+                for matrix, masks in zip(values, played)]
 
     @update_progress_bar
-    def _reshape_two_dim_list(self, series):
+    def _reshape_two_dim_list(self, values):
         """
         Parameters
         ----------
 
-            series : pandas.Series
+            values : numpy.ndarray
+                A two dimensional array across players and repetitions
 
         Returns:
         --------
-            A two dimensional list across repetitions and opponents
+            A two dimensional list across players and repetitions
         """
-        series_dict = series.to_dict()
-        out = [[series_dict.get((player_index, repetition), 0)
-                  for repetition in range(self.repetitions)]
-                 for player_index in range(self.num_players)]
-        return out
+        return values.tolist()
 
     @update_progress_bar
-    def _build_cooperation(self, cooperation_series):
-        cooperation_dict = cooperation_series.to_dict()
-        cooperation = []
+    def _build_cooperation(self, cooperation_counts):
+        cooperation = cooperation_counts.tolist()
         for player_index in range(self.num_players):
-            row = []
-            for opponent_index in range(self.num_players):
-                count = cooperation_dict.get((player_index, opponent_index),0)
-                if player_index == opponent_index:
-					# Address double count
-                    count = int(count / 2)
-                row.append(count)
-            cooperation.append(row)
+            # Address double count
+            count = cooperation[player_index][player_index]
+            cooperation[player_index][player_index] = int(count / 2)
         return cooperation
 
     @update_progress_bar
-    def _build_good_partner_matrix(self, good_partner_series):
-        good_partner_dict = good_partner_series.to_dict()
-        good_partner_matrix = []
-        for player_index in range(self.num_players):
-            row = []
-            for opponent_index in range(self.num_players):
-                if player_index == opponent_index:
-                    # The reduce operation implies a double count of self
-                    # interactions.
-                    row.append(0)
-                else:
-                    row.append(good_partner_dict.get(
-                        (player_index, opponent_index), 0))
-            good_partner_matrix.append(row)
-        return good_partner_matrix
+    def _build_good_partner_matrix(self, good_partner_counts):
+        good_partner_matrix = np.array(good_partner_counts)
+        # The reduce operation implies a double count of self interactions.
+        np.fill_diagonal(good_partner_matrix, 0)
+        return good_partner_matrix.tolist()
 
     @update_progress_bar
-    def _build_summary_matrix(self, attribute, func=np.mean):
+    def _build_summary_matrix(self, values, played, func=np.mean):
+        if values.size and played.all():
+            return func(values, axis=2).tolist()
+
         matrix = [[0 for opponent_index in range(self.num_players)]
                   for player_index in range(self.num_players)]
-
-        pairs = itertools.product(range(self.num_players), repeat=2)
-
-        for player_index, opponent_index in pairs:
-            utilities = attribute[player_index][opponent_index]
-            if utilities:
-                matrix[player_index][opponent_index] = func(utilities)
-
+        for player_index, opponent_index in zip(*np.nonzero(
+                played.any(axis=2))):
+            utilities = values[player_index, opponent_index][
+                played[player_index, opponent_index]]
+            matrix[player_index][opponent_index] = func(utilities)
         return matrix
 
     @update_progress_bar
-    def _build_payoff_diffs_means(self):
-        payoff_diffs_means = [[np.mean(diff) for diff in player]
-                               for player in self.score_diffs]
-
-        return payoff_diffs_means
+    def _build_payoff_diffs_means(self, score_diffs):
+        return np.mean(score_diffs, axis=2).tolist()
+
+    def _build_counters(self, counts, keys):
+        """
+        Return a list of lists of Counter objects mapping the keys to the
+        positive counts (indexed by player, opponent and key) of every pair
+        of distinct players. The counters of self interactions are empty.
+        """
+        counters = []
+        for player_index, row in enumerate(counts.tolist()):
+            player_counters = []
+            for opponent_index, values in enumerate(row):
+                counter = Counter()
+                if player_index != opponent_index:
+                    for key, value in zip(keys, values):
+                        if value > 0:
+                            counter[key] = value
+                player_counters.append(counter)
+            counters.append(player_counters)
+        return counters
 
     @update_progress_bar
-    def _build_state_distribution(self, state_distribution_series):
-        state_key_map = {'CC count': (C, C),
-                         'CD count': (C, D),
-                         'DC count': (D, C),
-                         'DD count': (D, D)}
-        state_distribution = [[create_counter_dict(state_distribution_series,
-                                                   player_index,
-                                                   opponent_index,
-                                                   state_key_map)
-                               for opponent_index in range(self.num_players)]
-                              for player_index in range(self.num_players)]
-        return state_distribution
+    def _build_state_distribution(self, state_counts):
+        return self._build_counters(state_counts, self._states)
 
     @update_progress_bar
-    def _build_normalised_state_distribution(self):
+    def _build_normalised_state_distribution(self, state_counts):
         """
         Returns:
         --------
@@ -290,38 +304,20 @@ class ResultSet():
             Dictionary where the keys are the states and the values are a
             normalized counts of the number of times that state occurs.
         """
-        normalised_state_distribution = []
-        for player in self.state_distribution:
-            counters = []
-            for counter in player:
-                total = sum(counter.values())
-                counters.append(Counter({key: value / total for
-                                         key, value in counter.items()}))
-            normalised_state_distribution.append(counters)
-        return normalised_state_distribution
+        totals = state_counts.sum(axis=2, keepdims=True)
+        normalised_counts = np.divide(
+            state_counts, totals, out=np.zeros(state_counts.shape),
+            where=totals > 0)
+        return self._build_counters(normalised_counts, self._states)
 
     @update_progress_bar
-    def _build_state_to_action_distribution(self,
-                                            state_to_action_distribution_series):
-        state_to_action_key_map = {"CC to C count": ((C, C), C),
-                                   "CC to D count": ((C, C), D),
-                                   "CD to C count": ((C, D), C),
-                                   "CD to D count": ((C, D), D),
-                                   "DC to C count": ((D, C), C),
-                                   "DC to D count": ((D, C), D),
-                                   "DD to C count": ((D, D), C),
-                                   "DD to D count": ((D, D), D)}
-        state_to_action_distribution = [[
-                create_counter_dict(state_to_action_distribution_series,
-                                    player_index,
-                                    opponent_index,
-                                    state_to_action_key_map)
-                                 for opponent_index in range(self.num_players)]
-                                for player_index in range(self.num_players)]
-        return state_to_action_distribution
+    def _build_state_to_action_distribution(self, state_to_action_counts):
+        return self._build_counters(state_to_action_counts,
+                                    self._states_to_actions)
 
     @update_progress_bar
-    def _build_normalised_state_to_action_distribution(self):
+    def _build_normalised_state_to_action_distribution(
+            self, state_to_action_counts):
         """
         Returns:
         --------
@@ -333,44 +329,32 @@ class ResultSet():
             normalized counts of the number of times that state goes to a given
             action.
         """
-        normalised_state_to_action_distribution = []
-        for player in self.state_to_action_distribution:
-            counters = []
-            for counter in player:
-                norm_counter = Counter()
-                for state in [(C, C), (C, D), (D, C), (D, D)]:
-                    total = counter[(state, C)] + counter[(state, D)]
-                    if total > 0:
-                        for action in [C, D]:
-                            if counter[(state, action)] > 0:
-                                norm_counter[(state, action)] = counter[(state, action)] / total
-                counters.append(norm_counter)
-            normalised_state_to_action_distribution.append(counters)
-        return normalised_state_to_action_distribution
+        # Indexed by player, opponent, state and action
+        counts = state_to_action_counts.reshape(
+            state_to_action_counts.shape[:2] + (len(self._states), 2))
+        totals = counts.sum(axis=3, keepdims=True)
+        normalised_counts = np.divide(
+            counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+        return self._build_counters(
+            normalised_counts.reshape(state_to_action_counts.shape),
+            self._states_to_actions)
 
     @update_progress_bar
-    def _build_initial_cooperation_count(self, initial_cooperation_count_series):
-        initial_cooperation_count_dict = initial_cooperation_count_series.to_dict()
-        initial_cooperation_count = [initial_cooperation_count_dict.get(player_index, 0)
-                                     for player_index in
-                                     range(self.num_players)]
-        return initial_cooperation_count
+    def _build_initial_cooperation_count(self, initial_cooperation):
+        return initial_cooperation.sum(axis=1).tolist()
 
     @update_progress_bar
-    def _build_normalised_cooperation(self):
+    def _build_normalised_cooperation(self, total_turns):
         normalised_cooperation = [list(np.nan_to_num(row))
                                   for row in np.array(self.cooperation) /
-                                  sum(map(np.array, self.match_lengths))]
+                                  total_turns]
         return normalised_cooperation
 
     @update_progress_bar
-    def _build_initial_cooperation_rate(self, interactions_series):
-        interactions_dict = interactions_series.to_dict()
-        interactions_array = np.array([interactions_series.get(player_index, 0)
-                                       for player_index in range(self.num_players)])
+    def _build_initial_cooperation_rate(self, interactions):
         initial_cooperation_rate = list(
            np.nan_to_num(np.array(self.initial_cooperation_count) /
-                                  interactions_array))
+                                  interactions))
         return initial_cooperation_rate
 
     @update_progress_bar
@@ -414,7 +398,7 @@ class ResultSet():
         return eigenvector.tolist()
 
     @update_progress_bar
-    def _build_cooperating_rating(self):
+    def _build_cooperating_rating(self, total_turns):
         """
         Returns:
         --------
@@ -433,12 +417,8 @@ class ResultSet():
             player j.
         """
 
-        plist = list(range(self.num_players))
-        total_length_v_opponent = [zip(*[rep[player_index] for
-                                         rep in self.match_lengths])
-                                   for player_index in plist]
-        lengths = [[sum(e) for j, e in enumerate(row) if i != j] for i, row in
-                   enumerate(total_length_v_opponent)]
+        lengths = [[length for j, length in enumerate(row) if i != j]
+                   for i, row in enumerate(total_turns.tolist())]
 
         cooperation = [[col for j, col in enumerate(row) if i != j]
                        for i, row in enumerate(self.cooperation)]
@@ -463,77 +443,16 @@ class ResultSet():
         return vengeful_cooperation
 
     @update_progress_bar
-    def _build_good_partner_rating(self, interactions_series):
+    def _build_good_partner_rating(self, interactions):
         """
         At the end of a read of the data, build the good partner rating
         attribute
         """
-        interactions_dict = interactions_series.to_dict()
         good_partner_rating = [sum(self.good_partner_matrix[player]) /
-                               max(1, interactions_dict.get(player, 0))
+                               max(1, interactions[player])
                                for player in range(self.num_players)]
         return good_partner_rating
 
-    def _compute_tasks(self, tasks, processes):
-        """
-        Compute all dask tasks
-        """
-        if processes is None:
-            out = da.compute(*tasks, get=da.get)
-        else:
-            out = da.compute(*tasks, num_workers=processes)
-        return out
-
-    def _build_tasks(self, df):
-        """
-        Returns a tuple of dask tasks
-        """
-        groups = ["Repetition", "Player index", "Opponent index"]
-        columns = ["Turns", "Score per turn", "Score difference per turn"]
-        mean_per_reps_player_opponent_task = df.groupby(groups)[columns].mean()
-
-        groups = ["Player index", "Opponent index"]
-        columns = ["Cooperation count",
-                   "CC count",
-                   "CD count",
-                   "DC count",
-                   "DD count",
-                   "CC to C count",
-                   "CC to D count",
-                   "CD to C count",
-                   "CD to D count",
-                   "DC to C count",
-                   "DC to D count",
-                   "DD to C count",
-                   "DD to D count",
-                   "Good partner"]
-        sum_per_player_opponent_task = df.groupby(groups)[columns].sum()
-
-        ignore_self_interactions_task = df["Player index"] != df["Opponent index"]
-        adf = df[ignore_self_interactions_task]
-
-        groups = ["Player index", "Repetition"]
-        columns = ["Win", "Score"]
-        sum_per_player_repetition_task = adf.groupby(groups)[columns].sum()
-
-        groups = ["Player index", "Repetition"]
-        column = "Score per turn"
-        normalised_scores_task = adf.groupby(groups)[column].mean()
-
-
-        groups = ["Player index"]
-        column = "Initial cooperation"
-        initial_cooperation_count_task = adf.groupby(groups)[column].sum()
-        interactions_count_task = adf.groupby("Player index")["Player index"].count()
-
-
-        return (mean_per_reps_player_opponent_task,
-                sum_per_player_opponent_task,
-                sum_per_player_repetition_task,
-                normalised_scores_task,
-                initial_cooperation_count_task,
-                interactions_count_task)
-
     def __eq__(self, other):
         """
         Check equality of results set
@@ -659,28 +578,215 @@ class ResultSet():
                 writer.writerow(player)
 
 
-def create_counter_dict(df, player_index, opponent_index, key_map):
+class ResultAccumulator(object):
     """
-    Create a Counter object mapping states (corresponding to columns of df) for
-    players given by player_index, opponent_index. Renaming the variables with
-    `key_map`. Used by `ResultSet._reshape_out`
+    Accumulate the results of the matches of a tournament in NumPy arrays, as
+    an alternative to writing them to file and reading them back.
 
-    Parameters
-    ----------
-        df : a multiindex pandas df
-        player_index: int
-        opponent_index: int
-        key_map : a dict
-            maps cols of df to strings
+    The rows given to `add` have the numeric columns of the file written by
+    the tournament (KEY_COLUMNS followed by RESULT_COLUMNS). The dense arrays
+    hold the sums (and numbers of rows) from which `ResultSet._reshape_out`
+    computes the results. `read` accumulates the rows of a file.
+    """
+
+    _pair_columns = ["Cooperation count",
+                     "CC count",
+                     "CD count",
+                     "DC count",
+                     "DD count",
+                     "CC to C count",
+                     "CC to D count",
+                     "CD to C count",
+                     "CD to D count",
+                     "DC to C count",
+                     "DC to D count",
+                     "DD to C count",
+                     "DD to D count",
+                     "Good partner"]
+
+    def __init__(self, num_players: int, repetitions: int,
+                 score_dtype=np.float64, count_dtype=np.float64) -> None:
+        """
+        Parameters
+        ----------
+            num_players : int
+                The number of players
+            repetitions : int
+                The number of repetitions of each match
+            score_dtype : numpy.dtype
+                The dtype of the scores
+            count_dtype : numpy.dtype
+                The dtype of the counts of actions and states (floats for
+                expected values)
+        """
+        # Integers are summed on 64 bits
+        if np.dtype(score_dtype).kind == 'i':
+            score_dtype = np.int64
+        if np.dtype(count_dtype).kind == 'i':
+            count_dtype = np.int64
+        self.num_players = num_players
+        self.repetitions = repetitions
+        shape = (repetitions, num_players, num_players)
+        # Per repetition, player and opponent
+        self.rows = np.zeros(shape, dtype=np.int64)
+        self.turns = np.zeros(shape)
+        self.score_per_turn = np.zeros(shape)
+        self.score_diff_per_turn = np.zeros(shape)
+        # Per player and opponent
+        self.pair_sums = np.zeros(
+            (num_players, num_players, len(self._pair_columns)),
+            dtype=count_dtype)
+        # Per player and repetition, without self interactions
+        shape = (num_players, repetitions)
+        self.interactions = np.zeros(shape, dtype=np.int64)
+        self.wins = np.zeros(shape, dtype=np.int64)
+        self.scores = np.zeros(shape, dtype=score_dtype)
+        self.normalised_scores = np.zeros(shape)
+        self.initial_cooperation = np.zeros(shape, dtype=count_dtype)
+
+    @classmethod
+    def read(cls, filename: str, num_players: int, repetitions: int,
+             chunksize: int = READ_CHUNK_ROWS) -> 'ResultAccumulator':
+        """
+        Accumulate the rows of a CSV file (read in chunks of rows) or of a
+        binary interaction store written by a tournament.
+
+        Parameters
+        ----------
+            filename : str
+                The file from which to read the interactions
+            num_players : int
+                The number of players
+            repetitions : int
+                The number of repetitions of each match
+            chunksize : int
+                The number of rows of a CSV file read at once
+        """
+        if is_store(filename):
+            store = InteractionStore(filename)
+            accumulator = cls(num_players, repetitions,
+                              score_dtype=store.dtype["Score"],
+                              count_dtype=store.dtype["Cooperation count"])
+            for rows in store.chunks():
+                accumulator.add_columns(rows)
+            return accumulator
+
+        # The dtypes of the columns of a CSV file are only known once all
+        # its rows are read: the sums are accumulated as floats and converted
+        # to integers if all the values read were integers.
+        accumulator = cls(num_players, repetitions)
+        integer_scores = integer_counts = True
+        chunks = pd.read_csv(
+            filename, usecols=KEY_COLUMNS + RESULT_COLUMNS,
+            converters={"Initial cooperation": read_cooperation},
+            chunksize=chunksize)
+        for chunk in chunks:
+            integer_scores &= chunk["Score"].dtype.kind in 'iub'
+            integer_counts &= all(
+                chunk[column].dtype.kind in 'iub'
+                for column in cls._pair_columns + ["Initial cooperation"])
+            accumulator.add_columns(chunk)
+        if integer_scores:
+            accumulator.scores = accumulator.scores.astype(np.int64)
+        if integer_counts:
+            accumulator.pair_sums = accumulator.pair_sums.astype(np.int64)
+            accumulator.initial_cooperation = (
+                accumulator.initial_cooperation.astype(np.int64))
+        return accumulator
+
+    def add(self, rows) -> None:
+        """Add rows with the numeric columns of the tournament file."""
+        if len(rows) == 0:
+            return
+        array = np.array(rows, dtype=np.float64)
+        self.add_columns(dict(zip(KEY_COLUMNS + RESULT_COLUMNS, array.T)))
+
+    def add_columns(self, columns) -> None:
+        """
+        Add rows given by columns: a mapping (such as a DataFrame or a
+        structured array) from the names of the numeric columns of the
+        tournament file to arrays of values.
+        """
+        column = {name: np.asarray(columns[name])
+                  for name in KEY_COLUMNS + RESULT_COLUMNS}
+        player = column["Player index"].astype(np.int64)
+        opponent = column["Opponent index"].astype(np.int64)
+        repetition = column["Repetition"].astype(np.int64)
+
+        groups = group_keys((repetition, player, opponent), self.rows.shape)
+        add_at(self.rows, groups, 1)
+        add_at(self.turns, groups, column["Turns"])
+        add_at(self.score_per_turn, groups, column["Score per turn"])
+        add_at(self.score_diff_per_turn, groups,
+               column["Score difference per turn"])
+
+        pair_values = np.column_stack([column[name]
+                                       for name in self._pair_columns])
+        groups = group_keys((player, opponent), self.pair_sums.shape[:2])
+        add_at(self.pair_sums, groups, pair_values)
+
+        others = player != opponent
+        groups = group_keys((player[others], repetition[others]),
+                            self.interactions.shape)
+        add_at(self.interactions, groups, 1)
+        add_at(self.wins, groups, column["Win"][others])
+        add_at(self.scores, groups, column["Score"][others])
+        add_at(self.normalised_scores, groups,
+               column["Score per turn"][others])
+        add_at(self.initial_cooperation, groups,
+               column["Initial cooperation"][others])
+
+
+def group_keys(keys: tuple, shape: tuple) -> tuple:
+    """
+    Group the positions given by a tuple of index arrays into an array of the
+    given shape.
 
     Returns
     -------
-        A counter dictionary
+        A tuple of the number of cells of the shape, the distinct flat
+        positions and the index of every position among them, as given to
+        `add_at`
+    """
+    positions, inverse = np.unique(np.ravel_multi_index(keys, shape),
+                                   return_inverse=True)
+    return int(np.prod(shape)), positions, inverse
+
+
+def add_at(array: np.ndarray, groups: tuple, values) -> None:
+    """
+    Add values to an array at grouped positions (as `np.add.at`, with the
+    values at a repeated position summed in order) using `np.bincount`.
+
+    Parameters
+    ----------
+        array : numpy.ndarray
+            The C contiguous array to add the values to
+        groups : tuple
+            The positions in the first dimensions of the array, as returned
+            by `group_keys`
+        values : numpy.ndarray or scalar
+            The values to add: a scalar, a value per position or, if the
+            array has more dimensions than the positions, a row of values per
+            position
+    """
+    size, positions, inverse = groups
+    target = array.reshape(size, -1)
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    values = np.broadcast_to(values, (len(inverse), target.shape[1]))
+    for column in range(target.shape[1]):
+        sums = np.bincount(inverse, weights=values[:, column],
+                           minlength=len(positions))
+        target[positions, column] += sums.astype(array.dtype)
+
+
+def read_cooperation(value: str):
+    """
+    Read an entry of the initial cooperation column: a boolean for a played
+    match or an expected value for a match computed analytically.
     """
-    counter = Counter()
-    if player_index != opponent_index:
-        if (player_index, opponent_index) in df.index:
-            for key, value in df.loc[player_index, opponent_index].items():
-                if value > 0:
-                    counter[key_map[key]] = value
-    return counter
+    if value in ("True", "False"):
+        return int(value == "True")
+    return float(value)
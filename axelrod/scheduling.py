@@ -0,0 +1,245 @@
+"""
+Scheduling of the chunks of matches of a tournament played in parallel.
+
+The chunks built by MatchGenerator.build_match_chunks hold all the
+repetitions of the match of a pair of players and are built in the order of
+the player indices. Played in that order, the chunks of slow players (for
+example those classified as `long_run_time`) may start late and leave a
+single process playing them at the end of a tournament.
+
+Instead, the cost of every chunk is estimated and:
+
+- the chunks that are too expensive to be played by a single process are
+  split into chunks of consecutive repetitions,
+- the chunks are dispatched longest first.
+
+At most QUEUED_TASKS_PER_WORKER chunks per process wait in the work queue:
+the others are put on it as the processes take them.
+
+The cost of a chunk is the expected number of turns played times the sum of
+the costs per turn of the two players. The cost per turn of a player is read
+from a TimingProfile if one is given and holds the player, otherwise it is
+estimated from its classifier.
+"""
+from math import ceil
+import json
+import os
+
+from .markov import is_memory_one
+from .match import is_stochastic
+from .match_generator import chunk_repetitions
+
+from typing import Dict, List
+
+LONG_RUN_TIME_COST = 100
+SPLIT_FACTOR = 4
+QUEUED_TASKS_PER_WORKER = 4
+
+
+class TimingProfile(object):
+    """
+    The measured cost per turn (in seconds) of the players, persisted as a
+    JSON file mapping the name of a player to the total time and the total
+    number of turns of the matches attributed to it.
+    """
+
+    def __init__(self, filename: str = None) -> None:
+        """
+        Parameters
+        ----------
+        filename : str
+            The file the profile is read from (if it exists) and saved to
+        """
+        self.filename = filename
+        self.timings = {}  # type: Dict[str, List[float]]
+        if filename is not None and os.path.exists(filename):
+            with open(filename, 'r') as profile_file:
+                self.timings = json.load(profile_file)
+
+    def __contains__(self, player) -> bool:
+        return str(player) in self.timings
+
+    def cost_per_turn(self, player) -> float:
+        """The measured time per turn of a player (who must be in the
+        profile)."""
+        seconds, turns = self.timings[str(player)]
+        return seconds / turns
+
+    def record(self, players, seconds: float, turns: int) -> None:
+        """
+        Record the time taken to play a number of turns between two players.
+        The time is shared between the players in proportion to their current
+        costs per turn (or equally if they are not both in the profile).
+        """
+        if turns <= 0:
+            return
+        if all(player in self for player in players):
+            costs = [self.cost_per_turn(player) for player in players]
+        else:
+            costs = [1, 1]
+        total = sum(costs)
+        for player, cost in zip(players, costs):
+            share = seconds * cost / total if total > 0 else seconds / 2
+            timing = self.timings.setdefault(str(player), [0, 0])
+            timing[0] += share
+            timing[1] += turns
+
+    def save(self) -> None:
+        with open(self.filename, 'w') as profile_file:
+            json.dump(self.timings, profile_file, indent=0, sort_keys=True)
+
+
+def expected_turns(turns: int = None, prob_end: float = None) -> float:
+    """The expected number of turns of a match."""
+    expected = float('inf') if turns is None else turns
+    if prob_end is not None and prob_end > 0:
+        expected = min(expected, 1 / prob_end)
+    return expected
+
+
+def player_costs(players, profile: TimingProfile = None) -> List[float]:
+    """
+    The cost per turn of every player: as measured in the profile if it
+    holds the player, otherwise estimated from the classifier (a player
+    classified as `long_run_time` costs LONG_RUN_TIME_COST times as much as
+    the others) and scaled to the median cost of the players of the profile.
+    """
+    measured = []
+    if profile is not None:
+        measured = sorted(profile.cost_per_turn(player)
+                          for player in players if player in profile)
+    unit = measured[len(measured) // 2] if measured else 1
+    costs = []
+    for player in players:
+        if profile is not None and player in profile:
+            costs.append(profile.cost_per_turn(player))
+        elif player.classifier.get("long_run_time", False):
+            costs.append(LONG_RUN_TIME_COST * unit)
+        else:
+            costs.append(unit)
+    return costs
+
+
+def _is_analytic(chunk, players) -> bool:
+    index_pair, match_params, _ = chunk
+    return (match_params.get("analytic", False) and
+            all(is_memory_one(players[i]) for i in index_pair))
+
+
+def _plays_once(chunk, players) -> bool:
+    """Whether the outcome of a chunk of matches is computed once for all
+    its repetitions: analytic matches and deterministic matches of a fixed
+    length."""
+    index_pair, match_params, _ = chunk
+    pair = [players[i] for i in index_pair]
+    deterministic = (not match_params.get("prob_end") and
+                     not is_stochastic(pair, match_params.get("noise", 0)))
+    return deterministic or _is_analytic(chunk, players)
+
+
+def chunk_cost(chunk, players, costs: List[float]) -> float:
+    """
+    The estimated cost of a chunk of matches.
+
+    Parameters
+    ----------
+    chunk : tuple
+        A chunk of matches as built by MatchGenerator.build_match_chunks
+    players : list
+        The players of the tournament
+    costs : list
+        The cost per turn of every player, as given by player_costs
+    """
+    index_pair, match_params, _ = chunk
+    turns = expected_turns(match_params.get("turns"),
+                           match_params.get("prob_end"))
+    repetitions = 1 if _plays_once(chunk, players) else len(
+        chunk_repetitions(chunk))
+    return repetitions * turns * sum(costs[i] for i in index_pair)
+
+
+def split_chunk(chunk, parts: int) -> List[tuple]:
+    """Split a chunk of matches into (at most) the given number of chunks of
+    consecutive repetitions of nearly equal sizes."""
+    index_pair, match_params, _ = chunk
+    repetitions = chunk_repetitions(chunk)
+    parts = max(1, min(parts, len(repetitions)))
+    size, remainder = divmod(len(repetitions), parts)
+    chunks = []
+    start = repetitions.start
+    for part in range(parts):
+        stop = start + size + (part < remainder)
+        chunks.append((index_pair, dict(match_params), range(start, stop)))
+        start = stop
+    return chunks
+
+
+def schedule_chunks(chunks, players, processes: int,
+                    profile: TimingProfile = None,
+                    split: bool = True) -> List[tuple]:
+    """
+    Return the chunks of matches to play in parallel, longest first, with
+    the chunks that cost more than 1 / (processes * SPLIT_FACTOR) of the
+    whole tournament split into chunks of consecutive repetitions.
+
+    Parameters
+    ----------
+    chunks : iterable
+        Chunks of matches as built by MatchGenerator.build_match_chunks
+    players : list
+        The players of the tournament
+    processes : int
+        The number of processes playing the matches
+    profile : TimingProfile
+        The measured costs per turn of the players
+    split : bool
+        Whether the expensive chunks can be split (they can not when the
+        random numbers of all their repetitions are drawn from one seed)
+    """
+    tagged_chunks = ((None, chunk) for chunk in chunks)
+    return [chunk for _, chunk in schedule_tagged_chunks(
+        tagged_chunks, players, processes, profile, split)]
+
+
+def schedule_tagged_chunks(tagged_chunks, players, processes: int,
+                           profile: TimingProfile = None,
+                           split: bool = True) -> List[tuple]:
+    """
+    Schedule the chunks of matches of several tournaments between the same
+    players as a whole (see schedule_chunks).
+
+    Parameters
+    ----------
+    tagged_chunks : iterable
+        Pairs of a tag (identifying the tournament of the chunk) and a chunk
+        of matches
+    players : list
+        The players of the tournaments
+    processes : int
+        The number of processes playing the matches
+    profile : TimingProfile
+        The measured costs per turn of the players
+    split : bool
+        Whether the expensive chunks can be split
+
+    Returns
+    -------
+    list
+        Pairs of a tag and a chunk of matches, longest first
+    """
+    tagged_chunks = list(tagged_chunks)
+    costs = player_costs(players, profile)
+    chunk_costs = [chunk_cost(chunk, players, costs)
+                   for _, chunk in tagged_chunks]
+    target = sum(chunk_costs) / (processes * SPLIT_FACTOR) if split else 0
+
+    scheduled = []
+    for (tag, chunk), cost in zip(tagged_chunks, chunk_costs):
+        if target > 0 and cost > target and not _plays_once(chunk, players):
+            parts = split_chunk(chunk, int(ceil(cost / target)))
+            scheduled.extend((chunk_cost(part, players, costs), tag, part)
+                             for part in parts)
+        else:
+            scheduled.append((cost, tag, chunk))
+    scheduled.sort(key=lambda item: item[0], reverse=True)
+    return [(tag, chunk) for _, tag, chunk in scheduled]
@@ -0,0 +1,289 @@
+"""
+A pool of long lived worker processes shared by many tournaments, Moran
+processes and fingerprints.
+
+Playing a tournament in parallel (with `processes`) starts new processes for
+every tournament. A session starts its processes once and keeps them until
+it is closed, so that many tournaments can be played in parallel without
+paying for the start up of the processes every time::
+
+    >>> import axelrod as axl
+    >>> players = [axl.Cooperator(), axl.Defector(), axl.TitForTat()]
+    >>> with axl.Session(processes=2) as session:
+    ...     for noise in (0, 0.1):
+    ...         tournament = axl.Tournament(players, noise=noise)
+    ...         results = tournament.play(session=session, progress_bar=False)
+
+The work given to the processes is split in jobs and tasks:
+
+- a job is an object (for example a tournament with its players) that is
+  pickled once and sent to every process when it is registered,
+- a task is a call of a method of a job with some arguments (for example
+  playing a chunk of matches): only the arguments are sent to a process.
+
+Independent Moran or Case processes (or any other object with a `play`
+method) can also be played by the processes of a session with
+`Session.play_all`.
+"""
+from multiprocessing import Process, Queue, cpu_count
+import os
+import pickle
+import shutil
+import tempfile
+import traceback
+
+from axelrod.deterministic_cache import SharedDeterministicCache
+from axelrod.random_ import seed
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+
+class _TaskError(object):
+    """An exception raised by a task, sent back from a worker."""
+
+    def __init__(self, exception: Exception) -> None:
+        self.traceback = traceback.format_exc()
+        try:
+            pickle.dumps(exception)
+            self.exception = exception
+        except Exception:
+            self.exception = RuntimeError(repr(exception))
+
+
+class _Function(object):
+    """A job calling a function: the tasks are its arguments."""
+
+    def __init__(self, function: Callable) -> None:
+        self.function = function
+
+    def __call__(self, *args):
+        return self.function(*args)
+
+
+def _play(obj):
+    """Play an object (a Moran process for example) and return it."""
+    obj.play()
+    return obj
+
+
+def _worker(work_queue: Queue, done_queue: Queue, jobs_queue: Queue) -> None:
+    """
+    The loop of a worker process: play the tasks of the work queue until a
+    'STOP' and put their results in the done queue.
+
+    The jobs are read from the jobs queue of the worker (which only this
+    worker reads) when a task of a job that is not known yet is received.
+    """
+    # Processes forked from the same parent share its random state
+    seed(None)
+    jobs = {}  # type: Dict[int, Any]
+    for job_id, key, method, args in iter(work_queue.get, 'STOP'):
+        while job_id not in jobs:
+            message, message_job_id, job = jobs_queue.get()
+            if message == 'register':
+                jobs[message_job_id] = pickle.loads(job)
+            else:
+                jobs.pop(message_job_id, None)
+        try:
+            result = getattr(jobs[job_id], method)(*pickle.loads(args))
+        except Exception as exception:
+            result = _TaskError(exception)
+        done_queue.put((key, result))
+
+
+def n_workers(processes: int = None, minimum: int = 1) -> int:
+    """
+    Return the number of worker processes to use for a requested number of
+    processes.
+
+    Parameters
+    ----------
+    processes : int
+        The requested number of processes. If None, less than minimum or
+        more than the number of CPUs then the number of CPUs is used.
+    minimum : int
+        The smallest number of processes used as requested
+    """
+    if processes is None or not minimum <= processes <= cpu_count():
+        return cpu_count()
+    return processes
+
+
+class Session(object):
+    """
+    A pool of worker processes, started when the session is entered (or
+    started) and stopped when it is exited (or closed).
+
+    Parameters
+    ----------
+    processes : int
+        The number of processes. If None, 0 or more than the number of CPUs
+        then the number of CPUs is used.
+    """
+
+    def __init__(self, processes: int = None) -> None:
+        self.processes = n_workers(processes)
+        self._workers = []  # type: List[Process]
+        self._jobs_queues = []  # type: List[Queue]
+        self._work_queue = None  # type: Queue
+        self._done_queue = None  # type: Queue
+        self._next_job_id = 0
+        self._run_id = 0
+        self._busy = False
+        self._cache_directory = None  # type: str
+        self._caches = {}  # type: Dict[Any, SharedDeterministicCache]
+
+    def __enter__(self) -> 'Session':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        return len(self._workers) > 0
+
+    def start(self) -> None:
+        """Start the worker processes."""
+        if self.running:
+            return
+        self._work_queue = Queue()
+        self._done_queue = Queue()
+        for _ in range(self.processes):
+            jobs_queue = Queue()
+            process = Process(target=_worker,
+                              args=(self._work_queue, self._done_queue,
+                                    jobs_queue))
+            process.daemon = True
+            process.start()
+            self._workers.append(process)
+            self._jobs_queues.append(jobs_queue)
+
+    def close(self) -> None:
+        """Stop the worker processes once they have played all their
+        tasks."""
+        for _ in self._workers:
+            self._work_queue.put('STOP')
+        for process in self._workers:
+            process.join()
+        self._workers = []
+        self._jobs_queues = []
+        for cache in self._caches.values():
+            cache.close()
+        self._caches = {}
+        if self._cache_directory is not None:
+            shutil.rmtree(self._cache_directory, ignore_errors=True)
+            self._cache_directory = None
+
+    def deterministic_cache(self, context) -> SharedDeterministicCache:
+        """
+        Return the cache of the results of deterministic matches shared by
+        the workers and the later jobs of the session, for a context (the
+        parameters other than the players and the number of turns that the
+        results depend on). The caches are removed when the session is
+        closed.
+
+        Parameters
+        ----------
+        context : hashable
+            The context of the matches, for example as given by
+            Tournament._cache_context
+        """
+        if context not in self._caches:
+            if self._cache_directory is None:
+                self._cache_directory = tempfile.mkdtemp(
+                    prefix='axelrod-session-')
+            filename = os.path.join(self._cache_directory,
+                                    'cache-{}'.format(len(self._caches)))
+            self._caches[context] = SharedDeterministicCache(filename)
+        return self._caches[context]
+
+    def register(self, job) -> int:
+        """Send a job to every worker and return its id."""
+        if not self.running:
+            raise RuntimeError("The session is not started.")
+        # Pickled here (rather than by the queues) so that a job that can
+        # not be pickled raises an error and is only pickled once
+        job = pickle.dumps(job, pickle.HIGHEST_PROTOCOL)
+        job_id = self._next_job_id
+        self._next_job_id += 1
+        for jobs_queue in self._jobs_queues:
+            jobs_queue.put(('register', job_id, job))
+        return job_id
+
+    def forget(self, job_id: int) -> None:
+        """Let the workers drop a job that has no more tasks."""
+        for jobs_queue in self._jobs_queues:
+            jobs_queue.put(('forget', job_id, None))
+
+    def imap_unordered(self, job_id: int, method: str,
+                       tasks: Iterable[tuple]) -> Iterator:
+        """
+        Call a method of a registered job with the arguments of every task
+        in the worker processes and yield the results as they are returned.
+        An exception raised by a task is raised again once all the tasks are
+        played.
+
+        Parameters
+        ----------
+        job_id : int
+            The id of the job, as returned by `register`
+        method : str
+            The name of the method of the job to call
+        tasks : iterable
+            The tuples of arguments of every call
+        """
+        for _, result in self._run(job_id, method, tasks):
+            yield result
+
+    def _run(self, job_id: int, method: str,
+             tasks: Iterable[tuple]) -> Iterator:
+        """Yield the index of every task with its result as they are
+        returned."""
+        if self._busy:
+            raise RuntimeError(
+                "The results of the previous tasks of the session have not "
+                "all been read.")
+        self._busy = True
+        # The results of the tasks of a previous run that was not read to
+        # the end are ignored
+        self._run_id += 1
+        error = None
+        try:
+            count = 0
+            for args in tasks:
+                args = pickle.dumps(tuple(args), pickle.HIGHEST_PROTOCOL)
+                self._work_queue.put((job_id, (self._run_id, count), method,
+                                      args))
+                count += 1
+            while count > 0:
+                (run_id, index), result = self._done_queue.get()
+                if run_id != self._run_id:
+                    continue
+                count -= 1
+                if isinstance(result, _TaskError):
+                    error = error or result
+                    continue
+                yield index, result
+        finally:
+            self._busy = False
+        if error is not None:
+            raise error.exception from RuntimeError(error.traceback)
+
+    def map(self, function: Callable, iterable: Iterable) -> List:
+        """Return the list of the results of a function (which must be
+        picklable: defined at the top level of a module) applied to every
+        item of an iterable in the worker processes."""
+        job_id = self.register(_Function(function))
+        try:
+            results = dict(self._run(job_id, '__call__',
+                                     ((item,) for item in iterable)))
+        finally:
+            self.forget(job_id)
+        return [results[index] for index in range(len(results))]
+
+    def play_all(self, objects: Iterable) -> List:
+        """Play every object (a Moran process for example) in the worker
+        processes and return the played objects, in order."""
+        return self.map(_play, objects)
@@ -183,10 +183,21 @@ class ANN(Player):
     def __init__(self, weights: List[float], num_features: int,
                  num_hidden: int) -> None:
         super().__init__()
-        (i2h, h2o, bias) = split_weights(weights, num_features, num_hidden)
-        self.input_to_hidden_layer_weights = np.matrix(i2h)
-        self.hidden_to_output_layer_weights = np.array(h2o)
-        self.bias_weights = np.array(bias)
+        # The weights are not modified by play so they are kept on reset
+        reset_weights = self.__dict__.pop('_reset_weights', None)
+        if reset_weights is None:
+            (i2h, h2o, bias) = split_weights(weights, num_features,
+                                             num_hidden)
+            reset_weights = (np.matrix(i2h), np.array(h2o), np.array(bias))
+        (self.input_to_hidden_layer_weights,
+         self.hidden_to_output_layer_weights,
+         self.bias_weights) = reset_weights
+
+    def reset(self):
+        self._reset_weights = (self.input_to_hidden_layer_weights,
+                               self.hidden_to_output_layer_weights,
+                               self.bias_weights)
+        super().reset()
 
     def strategy(self, opponent: Player) -> Action:
         features = compute_features(self, opponent)
@@ -85,7 +85,17 @@ class FSMPlayer(Player):
         super().__init__()
         self.initial_state = initial_state
         self.initial_action = initial_action
-        self.fsm = SimpleFSM(transitions, initial_state)
+        # The transitions are not modified by play so the machine is kept on
+        # reset and only its state is restored
+        self.fsm = self.__dict__.pop('_reset_fsm', None)
+        if self.fsm is None:
+            self.fsm = SimpleFSM(transitions, initial_state)
+        else:
+            self.fsm.state = initial_state
+
+    def reset(self):
+        self._reset_fsm = self.fsm
+        super().reset()
 
     def strategy(self, opponent: Player) -> Action:
         if len(self.history) == 0:
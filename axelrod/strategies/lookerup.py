@@ -297,7 +297,11 @@ class LookerUp(Player):
                  parameters: Plays = None) -> None:
 
         super().__init__()
-        self._lookup = self._get_lookup_table(lookup_dict, pattern, parameters)
+        # The lookup table is not modified by play so it is kept on reset
+        self._lookup = self.__dict__.pop('_reset_lookup', None)
+        if self._lookup is None:
+            self._lookup = self._get_lookup_table(lookup_dict, pattern,
+                                                  parameters)
 
         self._set_memory_depth()
 
@@ -333,6 +337,10 @@ class LookerUp(Player):
             return initial_actions + tuple([C] * initial_actions_shortfall)
         return initial_actions[:table_depth]
 
+    def reset(self):
+        self._reset_lookup = self._lookup
+        super().reset()
+
     def strategy(self, opponent: Player) -> Reaction:
         while self._initial_actions_pool:
             return self._initial_actions_pool.pop(0)
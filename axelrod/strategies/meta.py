@@ -51,8 +51,13 @@ class MetaPlayer(Player):
         self.team = [t for t in self.team if not issubclass(t, MetaPlayer)]
         self.nteam = len(self.team)
 
-        # Initiate all the player in our team.
-        self.team = [t() for t in self.team]
+        # Initiate all the player in our team, unless the player is being
+        # reset in which case the team has been reset and is kept.
+        reset_team = self.__dict__.pop('_reset_team', None)
+        if reset_team is None:
+            self.team = [t() for t in self.team]
+        else:
+            self.team = reset_team
 
         # This player inherits the classifiers of its team.
         # Note that memory_depth is not simply the max memory_depth of the team.
@@ -69,6 +74,14 @@ class MetaPlayer(Player):
         team_size = len(self.team)
         return '{}: {} player{}'.format(self.name, team_size, 's' if team_size > 1 else '')
 
+    def reset(self):
+        """Resets the player and the players of its team without building the
+        team again."""
+        for player in self.team:
+            player.reset()
+        self._reset_team = self.team
+        super().reset()
+
     def strategy(self, opponent):
         # Get the results of all our players.
         results = []
@@ -1,8 +1,6 @@
 from axelrod.action import Action
 from axelrod.player import Player
 
-from typing import List
-
 C, D = Action.C, Action.D
 
 
@@ -86,7 +84,6 @@ class InversePunisher(Player):
 
     def __init__(self) -> None:
         super().__init__()
-        self.history = [] # type: List[Action]
         self.mem_length = 1
         self.grudged = False
         self.grudge_memory = 1
@@ -5,7 +5,7 @@ from axelrod.action import Action, actions_to_str
 from axelrod.player import Player
 from axelrod.random_ import random_choice
 
-from typing import List, Dict, Union
+from typing import Dict, Union
 
 Score = Union[int, float]
 
@@ -50,7 +50,6 @@ class RiskyQLearner(Player):
 
         self.prev_action = None # type: Action
         self.original_prev_action = None # type: Action
-        self.history = [] # type: List[Action]
         self.score = 0
         self.Qs = OrderedDict({'':  OrderedDict(zip([C, D], [0, 0]))})
         self.Vs = OrderedDict({'': 0})
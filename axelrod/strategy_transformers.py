@@ -13,6 +13,7 @@ import random
 from typing import Any
 from numpy.random import choice
 from .action import Action
+from .history import History
 from .random_ import random_choice
 from .player import defaultdict, Player
 
@@ -346,7 +347,7 @@ def flip_play_attributes(player: Player) -> None:
 
 def flip_history(player: Player) -> None:
     """Flips all the actions in `player.history`."""
-    new_history = [action.flip() for action in player.history]
+    new_history = History(action.flip() for action in player.history)
     player.history = new_history
 
 
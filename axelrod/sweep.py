@@ -0,0 +1,257 @@
+"""
+Sweeps of tournaments between the same players over a grid of parameters.
+
+A sweep plays one tournament per configuration of the grid, with the chunks
+of matches of all the tournaments scheduled as a whole (longest first, see
+axelrod.scheduling) so that the processes playing them stay busy until the
+last configuration is done. The results of every tournament are accumulated
+in memory and summarised in a single table, with one row per configuration
+and player.
+
+    >>> import axelrod as axl
+    >>> players = [axl.Cooperator(), axl.Defector(), axl.TitForTat()]
+    >>> sweep = axl.TournamentSweep(players,
+    ...                             {"noise": [0, 0.1], "seed": [0, 1]},
+    ...                             turns=10, repetitions=2)
+    >>> table = sweep.play(progress_bar=False)
+    >>> len(table)
+    12
+
+If a seed is part of a configuration (or passed to every tournament), every
+repetition of the matches of its tournament is played from a seed derived
+from it, so that the results do not depend on the number of processes. The configurations without noise that
+only differ by their seed share a DeterministicCache (a SharedDeterministicCache
+of the session when they are played in parallel).
+
+Passing a filename saves the table once every configuration is played. A
+sweep played again with the same filename only plays the configurations
+that are not in the table.
+"""
+from collections import OrderedDict
+from itertools import product
+import os
+
+import pandas as pd
+import tqdm
+
+from .deterministic_cache import DeterministicCache
+from .result_set import ResultAccumulator, ResultSet
+from .scheduling import schedule_tagged_chunks
+from .session import Session, n_workers
+from .tournament import Tournament
+
+from typing import Dict, List
+
+PARAMETERS = ["turns", "prob_end", "repetitions", "noise", "noise_bias",
+              "game", "seed"]
+
+
+class _SweepJob(object):
+    """The tournaments of a sweep, sent once to the workers of a session."""
+
+    def __init__(self, tournaments: List[Tournament]) -> None:
+        self.tournaments = tournaments
+
+    def play_chunk(self, index: int, chunk):
+        return index, self.tournaments[index]._play_matches(chunk)
+
+
+class TournamentSweep(object):
+    """
+    Play a tournament between the same players for every configuration of a
+    grid of parameters.
+
+    Attributes
+    ----------
+    configs : list
+        The configurations: dictionaries mapping the parameters of the grid
+        to their values
+    tournaments : list
+        The tournament of every configuration
+    results : dict
+        The ResultSet of every configuration played, by index
+    """
+
+    def __init__(self, players, grid: Dict[str, list], **kwargs) -> None:
+        """
+        Parameters
+        ----------
+        players : list
+            A list of axelrod.Player objects
+        grid : dict
+            Mapping a parameter to the list of its values. The parameters
+            are those in PARAMETERS (arguments of Tournament).
+        kwargs
+            The other arguments of every Tournament
+        """
+        unknown = set(grid) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(
+                "Unknown parameters in the grid: {}".format(sorted(unknown)))
+        self.players = players
+        self.parameters = [p for p in PARAMETERS if p in grid]
+        self.configs = [
+            OrderedDict(zip(self.parameters, values))
+            for values in product(*(grid[p] for p in self.parameters))]
+
+        self.tournaments = []  # type: List[Tournament]
+        caches = {}  # type: Dict[tuple, DeterministicCache]
+        for config in self.configs:
+            arguments = dict(kwargs)
+            arguments.update(config)
+            tournament = Tournament(players, **arguments)
+            if not tournament.noise:
+                tournament._deterministic_cache = caches.setdefault(
+                    tournament._cache_context(), DeterministicCache())
+            self.tournaments.append(tournament)
+        self.results = {}  # type: Dict[int, ResultSet]
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def _config_columns(self, index: int) -> OrderedDict:
+        columns = OrderedDict([("Config", index)])
+        for parameter, value in self.configs[index].items():
+            if parameter == "game":
+                value = str(value.RPST())
+            columns[parameter] = value
+        return columns
+
+    def play(self, processes: int = None, session: Session = None,
+             filename: str = None, progress_bar: bool = True) -> pd.DataFrame:
+        """
+        Play the tournaments of every configuration (that is not already in
+        the table saved to `filename`).
+
+        Parameters
+        ----------
+        processes : int
+            The number of processes to play the matches with. If None (and
+            no session is given) the matches are played in this process.
+        session : axelrod.Session
+            A started session whose worker processes play the matches
+        filename : str
+            The name of a CSV file the table is saved to
+        progress_bar : bool
+            Whether or not to show a progress bar of the chunks of matches
+
+        Returns
+        -------
+        pandas.DataFrame
+            The summary (as given by ResultSet.summarise) of every player for
+            every configuration, with the parameters of the configurations
+        """
+        previous = None
+        done = set()  # type: set
+        if filename is not None and os.path.exists(filename):
+            previous = pd.read_csv(filename)
+            done = set(previous["Config"])
+            self._check_table(previous, filename)
+        to_play = [index for index in range(len(self)) if index not in done]
+
+        for index in to_play:
+            tournament = self.tournaments[index]
+            tournament.num_interactions = 0
+            tournament._seed = tournament.seed
+            score_dtype, count_dtype = tournament._result_dtypes()
+            tournament._accumulator = ResultAccumulator(
+                len(self.players), tournament.repetitions,
+                score_dtype=score_dtype, count_dtype=count_dtype)
+
+        workers = 1
+        if session is not None:
+            workers = session.processes
+        elif processes is not None:
+            workers = n_workers(processes)
+        tagged_chunks = schedule_tagged_chunks(
+            ((index, chunk) for index in to_play
+             for chunk in self.tournaments[index].match_generator
+             .build_match_chunks()),
+            self.players, processes=workers,
+            split=all(self.tournaments[index]._can_split_chunks()
+                      for index in to_play))
+
+        bar = None
+        if progress_bar:
+            bar = tqdm.tqdm(total=len(tagged_chunks), desc="Playing matches")
+
+        if session is None and processes is not None:
+            with Session(processes) as session:
+                self._play_in_session(session, tagged_chunks, bar)
+        elif session is not None:
+            self._play_in_session(session, tagged_chunks, bar)
+        else:
+            for index, chunk in tagged_chunks:
+                results = self.tournaments[index]._play_matches(chunk)
+                self._collect(index, results, bar)
+
+        if bar is not None:
+            bar.close()
+
+        tables = [] if previous is None else [previous]
+        for index in to_play:
+            tournament = self.tournaments[index]
+            self.results[index] = ResultSet.from_accumulator(
+                tournament._accumulator,
+                players=[str(p) for p in self.players],
+                progress_bar=False)
+            tournament._accumulator = None
+            tables.append(self._summary_table(index))
+
+        table = pd.concat(tables, ignore_index=True, sort=False)
+        table = table.sort_values(["Config", "Rank"]).reset_index(drop=True)
+        if filename is not None:
+            table.to_csv(filename, index=False)
+        return table
+
+    def _check_table(self, table: pd.DataFrame, filename: str) -> None:
+        """Raise a ValueError if a saved table is not for this sweep."""
+        for index, rows in table.groupby("Config"):
+            if not 0 <= index < len(self):
+                matches = False
+            else:
+                row = rows.iloc[0]
+                matches = all(
+                    _same_value(value, row[column])
+                    for column, value in self._config_columns(index).items())
+            if not matches:
+                raise ValueError(
+                    "The table {} is for a different sweep.".format(filename))
+
+    def _play_in_session(self, session: Session, tagged_chunks, bar) -> None:
+        """Play the chunks in the worker processes of a session: the
+        tournaments are sent once, with the shared caches of the session."""
+        jobs = [tournament._session_job() for tournament in self.tournaments]
+        for job in jobs:
+            if not job.noise:
+                job._deterministic_cache = session.deterministic_cache(
+                    job._cache_context())
+        job_id = session.register(_SweepJob(jobs))
+        try:
+            for index, results in session.imap_unordered(
+                    job_id, 'play_chunk', tagged_chunks):
+                self._collect(index, results, bar)
+        finally:
+            session.forget(job_id)
+
+    def _collect(self, index: int, results, bar) -> None:
+        self.tournaments[index]._write_interactions_to_file(results, None)
+        if bar is not None:
+            bar.update(1)
+
+    def _summary_table(self, index: int) -> pd.DataFrame:
+        summary = self.results[index].summarise()
+        table = pd.DataFrame([row._asdict() for row in summary])
+        for position, (column, value) in enumerate(
+                self._config_columns(index).items()):
+            table.insert(position, column, value)
+        return table
+
+
+def _same_value(value, saved) -> bool:
+    """Whether a value of a parameter is the one read from a saved table."""
+    if value is None or pd.isnull(value):
+        return pd.isnull(saved)
+    if isinstance(value, str):
+        return value == str(saved)
+    return value == saved
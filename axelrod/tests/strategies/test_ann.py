@@ -42,6 +42,14 @@ class TestEvolvedANN(TestPlayer):
         actions = [(C, C)] * 5
         self.versus_test(axelrod.TitForTat(), expected_actions=actions)
 
+    def test_reset_keeps_weights(self):
+        player = self.player()
+        weights = player.input_to_hidden_layer_weights
+        player.play(axelrod.Defector())
+        player.reset()
+        self.assertIs(player.input_to_hidden_layer_weights, weights)
+        self.assertNotIn('_reset_weights', player.__dict__)
+
 
 class TestEvolvedANN5(TestPlayer):
 
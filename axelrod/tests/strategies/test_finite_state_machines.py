@@ -150,6 +150,17 @@ class TestFSMPlayer(TestPlayer):
         'manipulates_state': False
     }
 
+    def test_reset_keeps_machine(self):
+        player = self.player()
+        fsm = player.fsm
+        player.fsm.state = player.fsm.state_transitions[
+            (player.initial_state, D)][0]
+        player.play(axelrod.Defector())
+        player.reset()
+        self.assertIs(player.fsm, fsm)
+        self.assertEqual(player.fsm.state, player.initial_state)
+        self.assertNotIn('_reset_fsm', player.__dict__)
+
     def transitions_test(self, state_and_action):
         """
         takes a list of [(initial_state, first_opponent_action), (next_state,
@@ -193,6 +193,16 @@ class TestLookerUp(TestPlayer):
     expected_class_classifier = copy.copy(expected_classifier)
     expected_class_classifier['memory_depth'] = float('inf')
 
+    def test_reset_keeps_lookup_table(self):
+        player = self.player()
+        lookup = player._lookup
+        player.play(axelrod.Defector())
+        player.reset()
+        self.assertIs(player._lookup, lookup)
+        self.assertNotIn('_reset_lookup', player.__dict__)
+        self.assertEqual(player._initial_actions_pool,
+                         list(player.initial_actions))
+
     def test_default_init(self):
         player = self.player()
         expected = {Plays((), (D,), ()): D,
@@ -43,6 +43,17 @@ class TestMetaPlayer(TestPlayer):
                              msg="%s - Behaviour: %s != Expected Behaviour: %s" %
                                  (key, player.classifier[key], classifier[key]))
 
+    def test_reset_keeps_team(self):
+        player = self.player()
+        team = list(player.team)
+        player.play(axelrod.Defector())
+        player.reset()
+        self.assertNotIn('_reset_team', player.__dict__)
+        self.assertEqual(len(player.team), len(team))
+        for member, expected_member in zip(player.team, team):
+            self.assertIs(member, expected_member)
+            self.assertEqual(member.history, [])
+
     def test_repr(self):
         player = self.player()
         team_size = len(player.team)
@@ -347,6 +347,44 @@ class TestPlayerClass(unittest.TestCase):
         self.assertRaises(TypeError, ParameterisedTestPlayer, arg_test3='test')
         self.assertRaises(TypeError, ParameterisedTestPlayer, 'other', 'other',
                           'other')
+        # Test that passing an argument both positionally and as a keyword
+        # raises an error.
+        self.assertRaises(TypeError, ParameterisedTestPlayer, 'other',
+                          arg_test1='other')
+
+    def test_init_spec_is_cached(self):
+        spec = ParameterisedTestPlayer._init_spec()
+        self.assertEqual(spec.names, ('arg_test1', 'arg_test2'))
+        self.assertEqual(spec.defaults, {'arg_test1': 'testing1',
+                                         'arg_test2': 'testing2'})
+        self.assertIs(ParameterisedTestPlayer._init_spec(), spec)
+        # Subclasses and transformed classes get their own spec
+        self.assertIsNot(Player._init_spec(), spec)
+        transformed = axelrod.strategy_transformers.FlipTransformer()(
+            ParameterisedTestPlayer)
+        self.assertIsNot(transformed._init_spec(), spec)
+        self.assertEqual(transformed().init_kwargs,
+                         {'arg_test1': 'testing1', 'arg_test2': 'testing2'})
+
+    def test_init_params_in_signature_order(self):
+
+        class OrderedTestPlayer(Player):
+            def __init__(self, b=1, a=2, c=3):
+                super().__init__()
+
+        self.assertEqual(list(OrderedTestPlayer.init_params(c=0, a=0)),
+                         ['b', 'a', 'c'])
+
+    def test_init_params_with_var_arguments(self):
+
+        class VarArgsTestPlayer(Player):
+            def __init__(self, a=1, *args, **kwargs):
+                super().__init__()
+
+        self.assertEqual(VarArgsTestPlayer.init_params(),
+                         {'a': 1, 'args': (), 'kwargs': {}})
+        self.assertEqual(VarArgsTestPlayer.init_params(2, 3, b=4),
+                         {'a': 2, 'args': (3,), 'kwargs': {'b': 4}})
 
 
 class TestOpponent(Player):
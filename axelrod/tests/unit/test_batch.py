@@ -0,0 +1,124 @@
+"""Tests for the vectorised simulation of repetitions of a match."""
+import unittest
+
+import numpy as np
+
+import axelrod
+from axelrod import Action
+from axelrod.batch import (BatchLookup, batch_player, is_batchable,
+                           is_hmm_player, is_lookup_player, play_repetitions,
+                           sample_lengths, to_interactions)
+
+C, D = Action.C, Action.D
+
+
+class TestIsBatchable(unittest.TestCase):
+
+    def test_batchable_players(self):
+        for player in [axelrod.WinStayLoseShift(), axelrod.GTFT(),
+                       axelrod.EvolvedLookerUp2_2_2(),
+                       axelrod.PSOGambler2_2_2(),
+                       axelrod.EvolvedHMM5(), axelrod.Fortress3()]:
+            self.assertTrue(is_batchable(player))
+
+    def test_other_players(self):
+        for player in [axelrod.TitForTat(), axelrod.Grudger(), axelrod.MEM2(),
+                       axelrod.Mikkelson()]:
+            self.assertFalse(is_batchable(player))
+            with self.assertRaises(ValueError):
+                batch_player(player)
+
+    def test_is_lookup_player(self):
+        self.assertTrue(is_lookup_player(axelrod.LookerUp()))
+        self.assertTrue(is_lookup_player(axelrod.PSOGamblerMem1()))
+        self.assertFalse(is_lookup_player(axelrod.EvolvedHMM5()))
+
+    def test_is_hmm_player(self):
+        self.assertTrue(is_hmm_player(axelrod.EvolvedHMM5()))
+        self.assertFalse(is_hmm_player(axelrod.LookerUp()))
+
+
+class TestBatchLookup(unittest.TestCase):
+
+    def test_probabilities(self):
+        player = axelrod.PSOGamblerMem1()
+        lookup = BatchLookup(player)
+        for plays, reaction in player.lookup_dict.items():
+            key = plays.self_plays + plays.op_plays + plays.op_openings
+            position = int(np.dot([a.value for a in key], lookup.weights))
+            self.assertEqual(lookup.probabilities[position], reaction)
+
+
+class TestPlayRepetitions(unittest.TestCase):
+
+    def test_deterministic_matches_play(self):
+        turns = 25
+        for players in [(axelrod.WinStayLoseShift(),
+                         axelrod.MemoryOnePlayer((1, 0, 1, 0))),
+                        (axelrod.EvolvedLookerUp2_2_2(), axelrod.Fortress4()),
+                        (axelrod.LookerUp(), axelrod.MemoryOnePlayer(
+                            (0, 0, 1, 1), initial=D)),
+                        (axelrod.HMMPlayer(
+                            transitions_C=[[0, 1], [1, 0]],
+                            transitions_D=[[1, 0], [0, 1]],
+                            emission_probabilities=[1, 0]),
+                         axelrod.EvolvedFSM16())]:
+            expected = axelrod.Match(players, turns=turns).play()
+            repetitions = play_repetitions(players, turns=turns,
+                                           repetitions=3)
+            self.assertEqual(len(repetitions), 3)
+            for actions in repetitions:
+                self.assertEqual(actions.shape, (turns, 2))
+                self.assertEqual(to_interactions(actions), expected)
+
+    def test_stochastic_cooperation_rates(self):
+        axelrod.seed(0)
+        players = (axelrod.MemoryOnePlayer((0.5, 0.5, 0.5, 0.5)),
+                   axelrod.MemoryOnePlayer((1, 1, 1, 1)))
+        repetitions = play_repetitions(players, turns=100, repetitions=200)
+        actions = np.array(repetitions)
+        self.assertAlmostEqual(actions[:, 1:, 0].mean(), 0.5, places=1)
+        self.assertTrue(np.all(actions[:, :, 1] == C.value))
+
+    def test_hmm_cooperation_rates(self):
+        # Randomly switches between two states that always cooperate or
+        # always defect
+        player = axelrod.HMMPlayer(transitions_C=[[0.5, 0.5], [0.5, 0.5]],
+                                   transitions_D=[[0.5, 0.5], [0.5, 0.5]],
+                                   emission_probabilities=[1, 0])
+        axelrod.seed(0)
+        actions = np.array(play_repetitions(
+            (player, axelrod.WinStayLoseShift()), turns=50,
+            repetitions=200))
+        self.assertAlmostEqual(actions[:, 1:, 0].mean(), 0.5, places=1)
+
+    def test_noise(self):
+        players = (axelrod.WinStayLoseShift(), axelrod.Fortress3())
+        actions = np.array(play_repetitions(players, turns=10,
+                                            repetitions=5, noise=1,
+                                            noise_bias=True))
+        self.assertTrue(np.all(actions == D.value))
+
+        axelrod.seed(1)
+        repetitions = play_repetitions(players, turns=20, repetitions=20,
+                                       noise=0.2)
+        self.assertGreater(len(set(str(to_interactions(actions))
+                                   for actions in repetitions)), 1)
+
+    def test_prob_end(self):
+        axelrod.seed(0)
+        players = (axelrod.WinStayLoseShift(), axelrod.GTFT())
+        repetitions = play_repetitions(players, turns=float('inf'),
+                                       repetitions=100, prob_end=0.1)
+        lengths = [len(actions) for actions in repetitions]
+        self.assertGreater(len(set(lengths)), 1)
+        self.assertAlmostEqual(np.mean(lengths) / 10, 1, places=0)
+
+        repetitions = play_repetitions(players, turns=5, repetitions=100,
+                                       prob_end=0.1)
+        self.assertTrue(all(len(actions) <= 5 for actions in repetitions))
+
+    def test_sample_lengths(self):
+        self.assertTrue(np.all(sample_lengths(None, 3) == float('inf')))
+        self.assertTrue(np.all(sample_lengths(1, 3) == 1))
+        self.assertEqual(len(sample_lengths(0.5, 4)), 4)
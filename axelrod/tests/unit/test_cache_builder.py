@@ -0,0 +1,162 @@
+"""Tests for the warm up of persistent caches of deterministic matches."""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import axelrod
+from axelrod.build_cache import main
+from axelrod.cache_builder import deterministic_players
+
+
+class TestCacheBuilder(unittest.TestCase):
+
+    strategies = [axelrod.Cooperator, axelrod.TitForTat(), axelrod.Random,
+                  axelrod.Alternator, axelrod.BackStabber]
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp(suffix=".db")
+        os.close(file_descriptor)
+        os.remove(self.filename)
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_deterministic_players(self):
+        players = deterministic_players(self.strategies)
+        self.assertEqual([str(p) for p in players],
+                         ["Cooperator", "Tit For Tat", "Alternator",
+                          "BackStabber: (D, D)"])
+        self.assertIs(players[1], self.strategies[1])
+
+    def test_build(self):
+        cache = axelrod.build_deterministic_cache(
+            self.strategies, [20, 10], self.filename, progress_bar=False)
+        # The longest match of every ordered pair and a match per length for
+        # the pairs with BackStabber (which makes use of the length)
+        self.assertEqual(len(cache), 9 + 7 * 2)
+        players = [axelrod.TitForTat(), axelrod.Alternator()]
+        for turns in (5, 10, 20):
+            for player in players:
+                player.set_match_attributes(length=turns)
+            self.assertIn((players[0], players[1], turns), cache)
+            self.assertEqual(cache[(players[0], players[1], turns)],
+                             axelrod.Match(players, turns=turns).play())
+        players = [axelrod.BackStabber(), axelrod.Cooperator()]
+        for turns, cached in ((10, True), (15, False)):
+            for player in players:
+                player.set_match_attributes(length=turns)
+            self.assertEqual((players[0], players[1], turns) in cache, cached)
+
+        # The matches in the cache are not played again
+        with patch.object(axelrod.Player, 'play') as play:
+            axelrod.build_deterministic_cache(
+                self.strategies, [20, 10], self.filename, progress_bar=False)
+        self.assertFalse(play.called)
+        cache.close()
+
+    def test_build_in_parallel(self):
+        expected_filename = self.filename + ".expected"
+        expected = axelrod.build_deterministic_cache(
+            self.strategies, [20], expected_filename, progress_bar=False)
+        cache = axelrod.build_deterministic_cache(
+            self.strategies, [20], self.filename, processes=2,
+            progress_bar=True)
+        self.assertEqual(sorted(cache), sorted(expected))
+        for key in expected:
+            self.assertEqual(cache._connect().execute(
+                "SELECT actions FROM interactions WHERE player = ? AND "
+                "opponent = ?", key[:2]).fetchall(),
+                expected._connect().execute(
+                    "SELECT actions FROM interactions WHERE player = ? AND "
+                    "opponent = ?", key[:2]).fetchall())
+        expected.close()
+        cache.close()
+        os.remove(expected_filename)
+
+        with axelrod.Session(processes=2) as session:
+            cache = axelrod.build_deterministic_cache(
+                self.strategies, [30], self.filename, session=session,
+                progress_bar=False)
+        self.assertEqual(len(cache), 9 + 7 * 2)
+        cache.close()
+
+    def test_tournament_with_warm_cache(self):
+        players = deterministic_players(self.strategies)
+        cache = axelrod.build_deterministic_cache(
+            players, [10], self.filename, progress_bar=False)
+        expected = axelrod.Tournament(players, turns=10,
+                                      repetitions=2).play(progress_bar=False)
+        tournament = axelrod.Tournament(players, turns=10, repetitions=2,
+                                        deterministic_cache=cache)
+        with patch.object(axelrod.Player, 'play') as play:
+            results = tournament.play(progress_bar=False)
+        self.assertFalse(play.called)
+        self.assertEqual(results.scores, expected.scores)
+        cache.close()
+
+    def test_build_in_context(self):
+        players = deterministic_players(self.strategies)
+        game = axelrod.Game(r=4, s=0, t=5, p=1)
+        cache = axelrod.build_deterministic_cache(
+            players, [5, 10], self.filename, progress_bar=False,
+            prob_end=0.5, game=game)
+        # Only the longest match of every ordered pair: the length is not
+        # known to BackStabber
+        self.assertEqual(len(cache), 16)
+
+        axelrod.seed(0)
+        expected = axelrod.Tournament(
+            players, turns=10, prob_end=0.5, game=game,
+            repetitions=2).play(progress_bar=False)
+        axelrod.seed(0)
+        tournament = axelrod.Tournament(players, turns=10, prob_end=0.5,
+                                        game=game, repetitions=2,
+                                        deterministic_cache=cache)
+        with patch.object(axelrod.Player, 'play') as play:
+            results = tournament.play(progress_bar=False)
+        self.assertFalse(play.called)
+        self.assertEqual(results.scores, expected.scores)
+
+        # The matches of another context are played and added to the cache
+        for other in ({"prob_end": None, "game": game},
+                      {"prob_end": 0.5, "game": None}):
+            size = len(cache)
+            tournament = axelrod.Tournament(players, turns=10, repetitions=1,
+                                            deterministic_cache=cache,
+                                            **other)
+            tournament.play(progress_bar=False)
+            self.assertGreater(len(cache), size)
+        cache.close()
+
+    def test_main(self):
+        with patch('builtins.print') as print_:
+            main([self.filename, "--strategies", "demo", "--turns", "5",
+                  "--no-progress-bar"])
+        print_.assert_called_once_with(
+            "16 matches in {}".format(self.filename))
+        cache = axelrod.PersistentDeterministicCache(self.filename)
+        players = [axelrod.Grudger(), axelrod.Defector()]
+        for player in players:
+            player.set_match_attributes(length=5)
+        self.assertIn((players[0], players[1], 5), cache)
+        cache.close()
+
+    def test_main_in_context(self):
+        with patch('builtins.print') as print_:
+            main([self.filename, "--strategies", "demo", "--turns", "5",
+                  "--prob-end", "0.1", "--game", "4", "0", "5", "1",
+                  "--no-progress-bar"])
+        print_.assert_called_once_with(
+            "16 matches in {}".format(self.filename))
+        cache = axelrod.PersistentDeterministicCache(self.filename)
+        players = [axelrod.Grudger(), axelrod.Defector()]
+        for player in players:
+            player.set_match_attributes(length=float('inf'),
+                                        game=axelrod.Game(4, 0, 5, 1))
+        self.assertIn((players[0], players[1], 5), cache)
+        for player in players:
+            player.set_match_attributes(length=5)
+        self.assertNotIn((players[0], players[1], 5), cache)
+        cache.close()
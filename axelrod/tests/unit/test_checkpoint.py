@@ -0,0 +1,200 @@
+"""Tests for the checkpoints of tournaments."""
+import json
+import os
+import tempfile
+import unittest
+
+import axelrod
+from axelrod.checkpoint import (MANIFEST_SUFFIX, Manifest, chunk_key,
+                                chunk_seed)
+from axelrod.interaction_store import INDEX_SUFFIX
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp()
+        os.close(file_descriptor)
+        self.description = {"players": ["Alice", "Bob"], "turns": 10}
+
+    def tearDown(self):
+        for filename in (self.filename, self.filename + MANIFEST_SUFFIX):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_chunk_key(self):
+        chunk = ((0, 1), {"turns": 10}, 5)
+        self.assertEqual(chunk_key(chunk), ((0, 1), (0, 5)))
+        chunk = ((0, 1), {"turns": 10}, range(2, 5))
+        self.assertEqual(chunk_key(chunk), ((0, 1), (2, 5)))
+
+    def test_chunk_seed(self):
+        key = ((0, 1), (0, 5))
+        self.assertEqual(chunk_seed(0, key), chunk_seed(0, key))
+        self.assertNotEqual(chunk_seed(0, key), chunk_seed(1, key))
+        self.assertNotEqual(chunk_seed(0, key),
+                            chunk_seed(0, ((1, 0), (0, 5))))
+
+    def test_new_manifest(self):
+        manifest = Manifest(self.filename, self.description)
+        self.assertFalse(manifest.resuming)
+        self.assertEqual(manifest.filename, self.filename + MANIFEST_SUFFIX)
+        with open(manifest.filename) as manifest_file:
+            header = json.loads(manifest_file.readline())
+        self.assertEqual(header, {"tournament": self.description,
+                                  "seed": manifest.seed})
+
+    def test_record_and_load(self):
+        manifest = Manifest(self.filename, self.description)
+        manifest.record(((0, 1), (0, 5)), 5, 0)
+        manifest.record(((1, 1), (0, 5)), 10, 0)
+
+        loaded = Manifest(self.filename, self.description)
+        self.assertTrue(loaded.resuming)
+        self.assertEqual(loaded.seed, manifest.seed)
+        self.assertEqual(loaded.completed, {((0, 1), (0, 5)),
+                                            ((1, 1), (0, 5))})
+        self.assertEqual(loaded.num_interactions, 10)
+        self.assertTrue(loaded.is_completed(((0, 1), {}, 5)))
+        self.assertFalse(loaded.is_completed(((0, 0), {}, 5)))
+        self.assertEqual(loaded.seed_for(((0, 1), (0, 5))),
+                         manifest.seed_for(((0, 1), (0, 5))))
+
+    def test_remaining(self):
+        manifest = Manifest(self.filename, self.description)
+        chunk = ((0, 1), {}, 10)
+        self.assertEqual(manifest.remaining(chunk), [range(10)])
+        manifest.record(((0, 1), (3, 5)), 2, 0)
+        manifest.record(((0, 1), (7, 10)), 5, 0)
+        manifest.record(((1, 1), (0, 10)), 15, 0)
+        self.assertEqual(manifest.remaining(chunk),
+                         [range(0, 3), range(5, 7)])
+        self.assertEqual(manifest.remaining(((0, 1), {}, range(4, 8))),
+                         [range(5, 7)])
+        self.assertFalse(manifest.is_completed(chunk))
+        self.assertTrue(manifest.is_completed(((0, 1), {}, range(7, 9))))
+        self.assertTrue(manifest.is_completed(((1, 1), {}, 10)))
+
+        # The ranges recorded out of order are read in order once loaded
+        manifest.record(((0, 1), (0, 3)), 18, 0)
+        loaded = Manifest(self.filename, self.description)
+        self.assertEqual(loaded.remaining(chunk), [range(5, 7)])
+        self.assertEqual(loaded.remaining(((1, 0), {}, 10)), [range(10)])
+
+    def test_incomplete_record_is_dropped(self):
+        manifest = Manifest(self.filename, self.description)
+        manifest.record(((0, 1), (0, 5)), 5, 0)
+        with open(manifest.filename, 'a') as manifest_file:
+            manifest_file.write('{"index_pair": [1, ')
+
+        loaded = Manifest(self.filename, self.description)
+        self.assertEqual(loaded.completed, {((0, 1), (0, 5))})
+        loaded.record(((1, 1), (0, 5)), 10, 0)
+        self.assertEqual(Manifest(self.filename, self.description).completed,
+                         {((0, 1), (0, 5)), ((1, 1), (0, 5))})
+
+    def test_different_tournament(self):
+        Manifest(self.filename, self.description)
+        with self.assertRaises(ValueError):
+            Manifest(self.filename, {"players": ["Alice"], "turns": 10})
+
+    def test_seed(self):
+        self.assertEqual(Manifest(self.filename, self.description,
+                                  seed=5).seed, 5)
+        self.assertEqual(Manifest(self.filename, self.description).seed, 5)
+        self.assertEqual(Manifest(self.filename, self.description,
+                                  seed=5).seed, 5)
+        with self.assertRaises(ValueError):
+            Manifest(self.filename, self.description, seed=6)
+
+    def test_missing_output(self):
+        manifest = Manifest(self.filename, self.description)
+        manifest.record(((0, 1), (0, 5)), 5, 100)
+        with self.assertRaises(ValueError):
+            Manifest(self.filename, self.description)
+
+
+class TestCheckpointedTournament(unittest.TestCase):
+
+    players = [axelrod.TitForTat(), axelrod.Random(), axelrod.Grudger(),
+               axelrod.GTFT()]
+
+    def setUp(self):
+        self.filenames = []
+
+    def tearDown(self):
+        for filename in self.filenames:
+            for name in (filename, filename + MANIFEST_SUFFIX,
+                         filename + INDEX_SUFFIX):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    def _filename(self, suffix):
+        file_descriptor, filename = tempfile.mkstemp(suffix=suffix)
+        os.close(file_descriptor)
+        os.remove(filename)
+        self.filenames.append(filename)
+        return filename
+
+    def _tournament(self):
+        return axelrod.Tournament(self.players, turns=10, repetitions=2,
+                                  noise=0.1)
+
+    def _interrupt(self, tournament, after):
+        """Make the tournament fail once it has written (but not recorded)
+        the given number of chunks."""
+        write = tournament._write_interactions_to_file
+        calls = []
+
+        def interrupted_write(results, writer):
+            write(results, writer)
+            calls.append(None)
+            if len(calls) == after:
+                raise KeyboardInterrupt
+        tournament._write_interactions_to_file = interrupted_write
+
+    def _test_resume(self, suffix):
+        filename = self._filename(suffix)
+        expected = self._tournament().play(filename=filename,
+                                           checkpoint=True,
+                                           progress_bar=False)
+        with open(filename, 'rb') as output:
+            expected_output = output.read()
+        with open(filename + MANIFEST_SUFFIX) as manifest_file:
+            header = manifest_file.readline()
+
+        resumed_filename = self._filename(suffix)
+        with open(resumed_filename + MANIFEST_SUFFIX, 'w') as manifest_file:
+            manifest_file.write(header)
+        tournament = self._tournament()
+        self._interrupt(tournament, after=4)
+        with self.assertRaises(KeyboardInterrupt):
+            tournament.play(filename=resumed_filename, checkpoint=True,
+                            progress_bar=False)
+        manifest = Manifest(resumed_filename,
+                            tournament._description(build_results=True))
+        self.assertEqual(len(manifest.completed), 3)
+
+        results = self._tournament().play(filename=resumed_filename,
+                                          checkpoint=True,
+                                          progress_bar=False)
+        with open(resumed_filename, 'rb') as output:
+            self.assertEqual(output.read(), expected_output)
+        self.assertEqual(results, expected)
+
+        # Playing a completed tournament again plays no matches
+        tournament = self._tournament()
+        self._interrupt(tournament, after=1)
+        self.assertEqual(tournament.play(filename=resumed_filename,
+                                         checkpoint=True, processes=2,
+                                         progress_bar=False), expected)
+
+    def test_resume_csv(self):
+        self._test_resume(".csv")
+
+    def test_resume_store(self):
+        self._test_resume(".axl")
+
+    def test_filename_is_required(self):
+        with self.assertRaises(ValueError):
+            self._tournament().play(checkpoint=True, progress_bar=False)
@@ -0,0 +1,126 @@
+"""Tests for the compiled simulation of finite state machine matches."""
+import random
+import unittest
+
+import numpy as np
+
+import axelrod
+from axelrod import Action
+from axelrod.compiled_fsm import (CompiledFSM, compile_fsm, is_fsm_player,
+                                  play_fsm_repetitions, play_fsms)
+from axelrod.strategy_transformers import JossAnnTransformer
+
+C, D = Action.C, Action.D
+
+
+class TestIsFSMPlayer(unittest.TestCase):
+
+    def test_fsm_players(self):
+        for player in [axelrod.Fortress3(), axelrod.EvolvedFSM16(),
+                       axelrod.Colbert(), axelrod.Predator()]:
+            self.assertTrue(is_fsm_player(player))
+
+    def test_other_players(self):
+        for player in [axelrod.TitForTat(), axelrod.Mikkelson(),
+                       JossAnnTransformer((0.1, 0.1))(
+                           axelrod.Fortress3)()]:
+            self.assertFalse(is_fsm_player(player))
+
+
+class TestCompiledFSM(unittest.TestCase):
+
+    def test_arrays(self):
+        # Tit For Tat with an unused state
+        transitions = {(1, C): (1, C), (1, D): (2, D),
+                       (2, C): (1, C), (2, D): (2, D)}
+        fsm = CompiledFSM(transitions, 2, D)
+        self.assertEqual(fsm.states, [1, 2])
+        self.assertEqual(fsm.initial_state, 1)
+        self.assertEqual(fsm.initial_action, D.value)
+        self.assertTrue(np.array_equal(fsm.next_state[:, C.value], [0, 0]))
+        self.assertTrue(np.array_equal(fsm.next_state[:, D.value], [1, 1]))
+        self.assertTrue(np.array_equal(fsm.next_action[:, C.value],
+                                       [C.value, C.value]))
+        self.assertTrue(np.array_equal(fsm.next_action[:, D.value],
+                                       [D.value, D.value]))
+
+    def test_compile_fsm_uses_current_state(self):
+        player = axelrod.Fortress3()
+        player.fsm.state = 3
+        fsm = compile_fsm(player)
+        self.assertEqual(fsm.states[fsm.initial_state], 3)
+
+
+class TestPlayFSMs(unittest.TestCase):
+
+    def expected_play(self, players, turns, noise=0):
+        for player in players:
+            player.reset()
+        for _ in range(turns):
+            players[0].play(players[1], noise)
+        return players
+
+    def test_play_fsms_matches_play(self):
+        for turns in [0, 1, 2, 17, 200]:
+            for strategies in [(axelrod.Fortress3, axelrod.Fortress4),
+                               (axelrod.EvolvedFSM16, axelrod.Predator),
+                               (axelrod.Colbert, axelrod.Thumper)]:
+                players = [s() for s in strategies]
+                actions1, actions2, state1, state2 = play_fsms(
+                    compile_fsm(players[0]), compile_fsm(players[1]), turns)
+                players = self.expected_play(players, turns)
+                self.assertEqual(actions1,
+                                 [a.value for a in players[0].history])
+                self.assertEqual(actions2,
+                                 [a.value for a in players[1].history])
+                fsm1, fsm2 = (compile_fsm(players[0]),
+                              compile_fsm(players[1]))
+                self.assertEqual(fsm1.states[state1], players[0].fsm.state)
+                self.assertEqual(fsm2.states[state2], players[1].fsm.state)
+
+    def test_play_fsms_with_noise_matches_play(self):
+        players = [axelrod.EvolvedFSM16(), axelrod.Fortress4()]
+        axelrod.seed(5)
+        actions1, actions2, _, _ = play_fsms(
+            compile_fsm(players[0]), compile_fsm(players[1]), 50, noise=0.2)
+        axelrod.seed(5)
+        players = self.expected_play(players, 50, noise=0.2)
+        self.assertEqual(actions1, [a.value for a in players[0].history])
+        self.assertEqual(actions2, [a.value for a in players[1].history])
+
+    def test_play_fsms_with_noise_bias(self):
+        players = [axelrod.Predator(), axelrod.Fortress3()]
+        random.seed(0)
+        actions1, actions2, _, _ = play_fsms(
+            compile_fsm(players[0]), compile_fsm(players[1]), 50, noise=1,
+            noise_bias=True)
+        self.assertEqual(actions1, [D.value] * 50)
+        self.assertEqual(actions2, [D.value] * 50)
+
+
+class TestPlayFSMRepetitions(unittest.TestCase):
+
+    def test_without_noise(self):
+        players = [axelrod.Fortress3(), axelrod.EvolvedFSM16()]
+        actions = play_fsm_repetitions(players, turns=30, repetitions=4)
+        self.assertEqual(actions.shape, (4, 30, 2))
+        expected = axelrod.Match(players, turns=30).play()
+        expected = [[a.value for a in pair] for pair in expected]
+        for repetition in actions:
+            self.assertEqual(repetition.tolist(), expected)
+
+    def test_with_noise(self):
+        players = [axelrod.Fortress3(), axelrod.EvolvedFSM16()]
+        axelrod.seed(0)
+        actions = play_fsm_repetitions(players, turns=30, repetitions=50,
+                                       noise=0.5)
+        self.assertEqual(actions.shape, (50, 30, 2))
+        self.assertTrue(set(np.unique(actions)) <= {C.value, D.value})
+        self.assertFalse(all(np.array_equal(actions[0], repetition)
+                             for repetition in actions))
+
+    def test_with_noise_bias(self):
+        players = [axelrod.Fortress3(), axelrod.EvolvedFSM16()]
+        actions = play_fsm_repetitions(players, turns=10, repetitions=3,
+                                       noise=1, noise_bias=True)
+        self.assertTrue(np.all(actions == D.value))
@@ -1,11 +1,27 @@
 import pickle
 import os
+import tempfile
 import unittest
-from axelrod import Action, Defector, DeterministicCache, Random, TitForTat
+from axelrod import (Action, Alternator, BackStabber,
+                     BoundedDeterministicCache, Cooperator, Defector,
+                     DeterministicCache, Game, GTFT,
+                     PersistentDeterministicCache, Random, Retaliate,
+                     SharedDeterministicCache, TitForTat)
+from axelrod.deterministic_cache import (pack_interactions,
+                                         unpack_interactions)
 
 C, D = Action.C, Action.D
 
 
+def match_key(player, opponent, turns, **match_attributes):
+    """The key of a match of a number of turns, the players being given the
+    match attributes of a match of that length (or the given ones)."""
+    match_attributes.setdefault("length", turns)
+    for p in (player, opponent):
+        p.set_match_attributes(**match_attributes)
+    return player, opponent, turns
+
+
 class TestDeterministicCache(unittest.TestCase):
 
     @classmethod
@@ -109,3 +125,302 @@ class TestDeterministicCache(unittest.TestCase):
         self.assertTrue(self.test_key in cache)
         del cache[self.test_key]
         self.assertFalse(self.test_key in cache)
+
+    def test_players_are_identified_by_their_parameters(self):
+        cache = DeterministicCache()
+        cache[(Retaliate(0.1), Defector(), 3)] = self.test_value
+        self.assertIn((Retaliate(0.1), Defector(), 3), cache)
+        self.assertNotIn((Retaliate(0.2), Defector(), 3), cache)
+
+
+class TestSharedDeterministicCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_key = (TitForTat(), Defector(), 3)
+        cls.test_value = [(C, D), (D, D), (D, D)]
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp(suffix=".cache")
+        os.close(file_descriptor)
+        self.cache = SharedDeterministicCache(self.filename)
+
+    def tearDown(self):
+        self.cache.close()
+        os.remove(self.filename)
+
+    def test_setitem(self):
+        self.assertEqual(len(self.cache), 0)
+        self.assertNotIn(self.test_key, self.cache)
+        self.cache[self.test_key] = self.test_value
+        self.assertIn(self.test_key, self.cache)
+        self.assertEqual(self.cache[self.test_key], self.test_value)
+        self.assertEqual(len(self.cache), 1)
+        with self.assertRaises(KeyError):
+            self.cache[(Defector(), TitForTat(), 3)]
+
+    def test_setitem_invalid(self):
+        with self.assertRaises(ValueError):
+            self.cache[(GTFT(), TitForTat(), 2)] = self.test_value
+        with self.assertRaises(ValueError):
+            self.cache[self.test_key] = 5
+        self.cache.mutable = False
+        with self.assertRaises(ValueError):
+            self.cache[self.test_key] = self.test_value
+        with self.assertRaises(ValueError):
+            del self.cache[self.test_key]
+
+    def test_entries_are_shared(self):
+        other = SharedDeterministicCache(self.filename)
+        self.cache[self.test_key] = self.test_value
+        self.assertEqual(other[self.test_key], self.test_value)
+        key = (Retaliate(0.1), Defector(), 3)
+        other[key] = self.test_value
+        self.assertEqual(self.cache[key], self.test_value)
+        self.assertNotIn((Retaliate(0.2), Defector(), 3), self.cache)
+        other.close()
+
+        # Only the name of the file is pickled
+        unpickled = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual(unpickled.file_name, self.filename)
+        self.assertEqual(len(unpickled), 2)
+        self.assertEqual(unpickled[key], self.test_value)
+        unpickled.close()
+
+    def test_incomplete_record_is_read_later(self):
+        self.cache[self.test_key] = self.test_value
+        with open(self.filename, 'rb') as cache_file:
+            record = cache_file.read()
+        with open(self.filename, 'ab') as cache_file:
+            cache_file.write(record[:-2])
+        key = (Defector(), TitForTat(), 3)
+        self.assertNotIn(key, self.cache)
+        with open(self.filename, 'r+b') as cache_file:
+            cache_file.truncate(len(record))
+        self.cache[key] = self.test_value
+        self.assertEqual(self.cache[key], self.test_value)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_save_and_load(self):
+        self.cache[self.test_key] = self.test_value
+        save_file = self.filename + ".pickle"
+        self.cache.save(save_file)
+        self.assertEqual(DeterministicCache(save_file)[self.test_key],
+                         self.test_value)
+
+        file_descriptor, filename = tempfile.mkstemp(suffix=".cache")
+        os.close(file_descriptor)
+        cache = SharedDeterministicCache(filename)
+        cache.load(save_file)
+        self.assertEqual(cache[self.test_key], self.test_value)
+        cache.close()
+        os.remove(filename)
+        os.remove(save_file)
+
+
+class TestPersistentDeterministicCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_key = match_key(TitForTat(), Defector(), 3)
+        cls.test_value = [(C, D), (D, D), (D, D)]
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp(suffix=".db")
+        os.close(file_descriptor)
+        self.cache = PersistentDeterministicCache(self.filename)
+
+    def tearDown(self):
+        self.cache.close()
+        os.remove(self.filename)
+
+    def test_setitem(self):
+        self.assertEqual(len(self.cache), 0)
+        self.cache[self.test_key] = self.test_value
+        self.assertIn(self.test_key, self.cache)
+        self.assertEqual(self.cache[self.test_key], self.test_value)
+        self.assertEqual(list(self.cache), [("Tit For Tat", "Defector", 3)])
+        del self.cache[self.test_key]
+        self.assertNotIn(self.test_key, self.cache)
+        with self.assertRaises(KeyError):
+            self.cache[self.test_key]
+        with self.assertRaises(KeyError):
+            del self.cache[self.test_key]
+
+    def test_setitem_invalid(self):
+        with self.assertRaises(ValueError):
+            self.cache[(GTFT(), TitForTat(), 2)] = self.test_value
+        with self.assertRaises(ValueError):
+            self.cache[self.test_key] = 5
+        self.cache.mutable = False
+        with self.assertRaises(ValueError):
+            self.cache[self.test_key] = self.test_value
+        self.assertNotIn((GTFT(), TitForTat(), 2), self.cache)
+
+    def test_shorter_matches_are_read_from_the_longest(self):
+        self.cache[self.test_key] = self.test_value
+        shorter = match_key(TitForTat(), Defector(), 2)
+        self.assertIn(shorter, self.cache)
+        self.assertEqual(self.cache[shorter], self.test_value[:2])
+        longer = match_key(TitForTat(), Defector(), 4)
+        self.assertNotIn(longer, self.cache)
+
+        # A shorter match does not replace the longest one
+        self.cache[shorter] = self.test_value[:2]
+        self.assertEqual(self.cache[self.test_key], self.test_value)
+        self.cache[longer] = self.test_value + [(D, D)]
+        self.assertEqual(self.cache[self.test_key], self.test_value)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_players_making_use_of_the_length(self):
+        key = match_key(BackStabber(), Cooperator(), 3)
+        self.cache[key] = [(C, C), (D, C), (D, C)]
+        self.assertNotIn(match_key(BackStabber(), Cooperator(), 2),
+                         self.cache)
+        self.cache[match_key(BackStabber(), Cooperator(), 2)] = [(D, C),
+                                                                 (D, C)]
+        self.assertEqual(self.cache[match_key(BackStabber(), Cooperator(), 3)],
+                         [(C, C), (D, C), (D, C)])
+        self.assertEqual(len(self.cache), 2)
+
+        # When the length is not known, the longest match gives the others
+        unknown = float('inf')
+        self.cache[match_key(BackStabber(), Cooperator(), 3,
+                             length=unknown)] = [(C, C)] * 3
+        shorter = match_key(BackStabber(), Cooperator(), 2, length=unknown)
+        self.assertEqual(self.cache[shorter], [(C, C)] * 2)
+        self.assertEqual(len(self.cache), 3)
+
+    def test_entries_are_keyed_by_context(self):
+        self.cache[match_key(BackStabber(), Cooperator(), 3)] = [
+            (C, C), (D, C), (D, C)]
+        self.cache[self.test_key] = self.test_value
+        # The length is not known
+        self.assertNotIn(match_key(BackStabber(), Cooperator(), 3,
+                                   length=float('inf')), self.cache)
+        # The length is not used by the players but is still known
+        self.assertIn(match_key(TitForTat(), Defector(), 2), self.cache)
+        self.assertNotIn(match_key(TitForTat(), Defector(), 2,
+                                   length=float('inf')), self.cache)
+        # Another game
+        game = Game(r=4, s=0, t=5, p=1)
+        self.assertNotIn(match_key(TitForTat(), Defector(), 3, game=game),
+                         self.cache)
+        # The same game with payoffs of another type
+        self.assertIn(match_key(TitForTat(), Defector(), 3,
+                                game=Game(3.0, 0.0, 5.0, 1.0)), self.cache)
+        # Another noise
+        self.assertNotIn(match_key(TitForTat(), Defector(), 3, noise=0.1),
+                         self.cache)
+
+    def test_entries_are_shared(self):
+        other = PersistentDeterministicCache(self.filename)
+        self.cache[self.test_key] = self.test_value
+        self.assertEqual(other[self.test_key], self.test_value)
+        other.close()
+
+        unpickled = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual(unpickled.file_name, self.filename)
+        self.assertEqual(unpickled[self.test_key], self.test_value)
+        unpickled.close()
+
+    def test_save_and_load(self):
+        self.cache[self.test_key] = self.test_value
+        save_file = self.filename + ".pickle"
+        self.cache.save(save_file)
+        self.assertEqual(DeterministicCache(save_file)[self.test_key],
+                         self.test_value)
+
+        file_descriptor, filename = tempfile.mkstemp(suffix=".db")
+        os.close(file_descriptor)
+        cache = PersistentDeterministicCache(filename)
+        cache.load(save_file)
+        self.assertEqual(list(cache), [("Tit For Tat", "Defector", 3)])
+        cache.close()
+        os.remove(filename)
+        os.remove(save_file)
+
+
+class TestBoundedDeterministicCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_key = match_key(TitForTat(), Defector(), 3)
+        cls.test_value = [(C, D), (D, D), (D, D)]
+
+    def test_pack_interactions(self):
+        packed = pack_interactions(self.test_value)
+        self.assertEqual(packed, bytes([0b10000000]))
+        self.assertEqual(unpack_interactions(packed, 3), self.test_value)
+        value = [(C, C), (C, D), (D, C), (D, D), (C, C)]
+        packed = pack_interactions(value)
+        self.assertEqual(len(packed), 2)
+        self.assertEqual(unpack_interactions(packed, 5), value)
+        self.assertEqual(unpack_interactions(pack_interactions([]), 0), [])
+
+    def test_setitem(self):
+        cache = BoundedDeterministicCache()
+        self.assertNotIn(self.test_key, cache)
+        cache[self.test_key] = self.test_value
+        self.assertIn(self.test_key, cache)
+        self.assertEqual(cache[self.test_key], self.test_value)
+        self.assertEqual(cache.data[("Tit For Tat", "Defector", 3)],
+                         (3, bytes([0b10000000])))
+        size = cache.size
+        self.assertGreater(size, 0)
+        cache[self.test_key] = self.test_value
+        self.assertEqual(cache.size, size)
+        del cache[self.test_key]
+        self.assertEqual(cache.size, 0)
+        with self.assertRaises(KeyError):
+            cache[self.test_key]
+        with self.assertRaises(ValueError):
+            cache[(GTFT(), TitForTat(), 2)] = self.test_value
+        cache.mutable = False
+        with self.assertRaises(ValueError):
+            cache[self.test_key] = self.test_value
+
+    def test_counters(self):
+        cache = BoundedDeterministicCache()
+        cache[self.test_key] = self.test_value
+        self.assertIn(self.test_key, cache)
+        cache[self.test_key]
+        self.assertNotIn((Defector(), TitForTat(), 3), cache)
+        with self.assertRaises(KeyError):
+            cache[(Defector(), TitForTat(), 3)]
+        self.assertEqual((cache.hits, cache.misses, cache.evictions),
+                         (1, 2, 0))
+
+    def test_least_recently_used_are_evicted(self):
+        keys = [(TitForTat(), Defector(), 3), (Defector(), TitForTat(), 3),
+                (Alternator(), Defector(), 3)]
+        cache = BoundedDeterministicCache()
+        cache[keys[0]] = self.test_value
+        cache.max_bytes = 2 * cache.size + 50
+        cache[keys[1]] = self.test_value
+        cache[keys[0]]
+        cache[keys[2]] = self.test_value
+        self.assertIn(keys[0], cache)
+        self.assertNotIn(keys[1], cache)
+        self.assertIn(keys[2], cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+        # An entry larger than the budget is not kept
+        cache.max_bytes = 10
+        cache[keys[0]] = self.test_value
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_save_and_load(self):
+        cache = BoundedDeterministicCache()
+        cache[self.test_key] = self.test_value
+        file_descriptor, filename = tempfile.mkstemp()
+        os.close(file_descriptor)
+        cache.save(filename)
+        self.assertEqual(DeterministicCache(filename)[self.test_key],
+                         self.test_value)
+        loaded = BoundedDeterministicCache(filename)
+        self.assertEqual(loaded[self.test_key], self.test_value)
+        self.assertEqual(loaded.size, cache.size)
+        os.remove(filename)
@@ -218,6 +218,27 @@ class TestFingerprint(unittest.TestCase):
         self.assertEqual(edge_keys, self.expected_edges)
         self.assertEqual(coord_keys, self.expected_points)
 
+    def test_fingerprint_interactions(self):
+        af = AshlockFingerprint(self.strategy, self.probe)
+        data = af.fingerprint(turns=10, repetitions=2, step=0.5,
+                              progress_bar=False)
+        interaction = af.interactions[self.expected_edges[0]][0]
+        self.assertEqual(len(interaction), 10)
+        self.assertIsInstance(interaction[0][0], axl.Action)
+
+        # The interactions can be read as arrays, giving the same data
+        af = AshlockFingerprint(self.strategy, self.probe)
+        axl.seed(0)
+        data = af.fingerprint(turns=10, repetitions=2, step=0.5,
+                              progress_bar=False)
+        axl.seed(0)
+        array_data = af.fingerprint(turns=10, repetitions=2, step=0.5,
+                                    progress_bar=False, as_arrays=True)
+        interaction = af.interactions[self.expected_edges[0]][0]
+        self.assertIsInstance(interaction, np.ndarray)
+        self.assertEqual(interaction.shape, (10, 2))
+        self.assertEqual(array_data, data)
+
     def test_parallel_fingerprint(self):
         af = AshlockFingerprint(self.strategy, self.probe)
         af.fingerprint(turns=10, repetitions=2, step=0.5, processes=2,
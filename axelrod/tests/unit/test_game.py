@@ -29,6 +29,15 @@ class TestGame(unittest.TestCase):
         self.assertEqual(self.game.score((C, D)), (0, 5))
         self.assertEqual(self.game.score((D, C)), (5, 0))
 
+    def test_payoff_table(self):
+        table = self.game.payoff_table()
+        self.assertEqual(table.shape, (2, 2, 2))
+        for pair, scores in self.game.scores.items():
+            self.assertEqual(tuple(table[pair[0].value, pair[1].value]),
+                             scores)
+        self.assertEqual(Game(r=2.5).payoff_table()[1, 1].tolist(),
+                         [2.5, 2.5])
+
     def test_equality(self):
         game_1 = Game(1, 2, 3, 4)
         game_2 = Game(1, 2, 3, 4)
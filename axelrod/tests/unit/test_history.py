@@ -0,0 +1,102 @@
+"""Tests for the compact history of a player."""
+import copy
+import pickle
+import unittest
+
+import axelrod
+from axelrod import Action
+from axelrod.history import History
+
+C, D = Action.C, Action.D
+
+
+class TestHistory(unittest.TestCase):
+
+    def test_init(self):
+        history = History()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history, [])
+        history = History([C, D, D])
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history, [C, D, D])
+        self.assertEqual(history.cooperations, 1)
+        self.assertEqual(history.defections, 2)
+
+    def test_from_values(self):
+        history = History.from_values([1, 0, 0])
+        self.assertEqual(history, [C, D, D])
+        self.assertEqual(history.values, bytearray([1, 0, 0]))
+
+    def test_append_extend_pop(self):
+        history = History()
+        history.append(C)
+        history.append(D)
+        history.extend([C, C])
+        history.extend(History([D]))
+        self.assertEqual(history, [C, D, C, C, D])
+        self.assertEqual(history.count(C), 3)
+        self.assertEqual(history.count(D), 2)
+        self.assertEqual(history.pop(), D)
+        self.assertEqual(history.pop(0), C)
+        self.assertEqual(history, [D, C, C])
+        self.assertEqual(history.count(C), 2)
+        self.assertEqual(history.count(D), 1)
+
+    def test_indexing_and_slicing(self):
+        history = History([C, D, D, C])
+        self.assertEqual(history[0], C)
+        self.assertEqual(history[-1], C)
+        self.assertEqual(history[-2], D)
+        self.assertEqual(history[-3:], [D, D, C])
+        self.assertEqual(history[:2], [C, D])
+        self.assertEqual(history[::-1], [C, D, D, C])
+        self.assertIsInstance(history[1:], list)
+        with self.assertRaises(IndexError):
+            history[4]
+
+    def test_sequence_methods(self):
+        history = History([C, D])
+        self.assertEqual(list(history), [C, D])
+        self.assertEqual(list(reversed(history)), [D, C])
+        self.assertIn(C, history)
+        self.assertNotIn(D, History([C]))
+        self.assertEqual(history + [C], [C, D, C])
+        self.assertEqual([C] + history, [C, C, D])
+        self.assertEqual(str(history), "[C, D]")
+        self.assertEqual(list(zip(history, history)), [(C, C), (D, D)])
+
+    def test_equality(self):
+        self.assertEqual(History([C, D]), History([C, D]))
+        self.assertEqual([C, D], History([C, D]))
+        self.assertNotEqual(History([C, D]), History([D, C]))
+        self.assertNotEqual(History([C, D]), [C])
+        self.assertNotEqual(History([C, D]), (C, D))
+
+    def test_copy(self):
+        history = History([C, D])
+        copied = history.copy()
+        copied.append(C)
+        self.assertEqual(history, [C, D])
+        self.assertEqual(copy.deepcopy(history), history)
+
+    def test_pickle(self):
+        actions = [C, D, D, C, C, C, D, C, D, D, D]
+        history = History(actions)
+        state = history.__getstate__()
+        self.assertEqual(state[0], len(actions))
+        self.assertEqual(len(state[1]), 2)  # One bit per action
+        unpickled = pickle.loads(pickle.dumps(history))
+        self.assertEqual(unpickled, actions)
+        self.assertEqual(unpickled.cooperations, 5)
+
+        history = History([C] * 1000)
+        self.assertEqual(len(history.__getstate__()[1]), 125)
+
+    def test_player_history(self):
+        player = axelrod.TitForTat()
+        self.assertIsInstance(player.history, History)
+        player.play(axelrod.Defector())
+        self.assertEqual(player.history, [C])
+        player.reset()
+        self.assertIsInstance(player.history, History)
+        self.assertEqual(player.history, [])
@@ -0,0 +1,178 @@
+"""Tests for the binary interaction store."""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import axelrod
+from axelrod import Action
+import axelrod.interaction_utils as iu
+from axelrod.interaction_store import (EXTENSION, INDEX_SUFFIX,
+                                       InteractionStore, InteractionWriter,
+                                       is_store, is_store_filename, row_dtype)
+
+C, D = Action.C, Action.D
+
+
+class TestInteractionStore(unittest.TestCase):
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp(suffix=EXTENSION)
+        os.close(file_descriptor)
+
+    def tearDown(self):
+        os.remove(self.filename)
+        if os.path.exists(self.filename + INDEX_SUFFIX):
+            os.remove(self.filename + INDEX_SUFFIX)
+
+    def test_is_store_filename(self):
+        self.assertTrue(is_store_filename("results.axl"))
+        self.assertFalse(is_store_filename("results.csv"))
+        self.assertFalse(is_store_filename(None))
+
+    def test_row_dtype(self):
+        dtype = row_dtype(build_results=False)
+        self.assertEqual(dtype.names, ("Interaction index", "Player index",
+                                       "Opponent index", "Repetition",
+                                       "Actions offset", "Actions length"))
+        dtype = row_dtype(score_dtype='<i8')
+        self.assertEqual(len(dtype.names), 27)
+        self.assertEqual(dtype["Score"], np.dtype('<i8'))
+        self.assertEqual(dtype["Score per turn"], np.dtype('<f8'))
+        self.assertEqual(dtype["CC count"], np.dtype('<i4'))
+        self.assertEqual(dtype["Win"], np.dtype('<i1'))
+
+    def test_write_and_read(self):
+        writer = InteractionWriter(self.filename, ["Alice", "Bob"],
+                                   row_dtype(build_results=False))
+        writer.write([(0, 0, 1, 0), (0, 1, 0, 0)],
+                     [np.array([1, 0, 1]), np.array([0, 0, 1])])
+        writer.write([(1, 0, 1, 1), (1, 1, 0, 1)],
+                     [np.ones(10, dtype=np.int8), np.zeros(10, dtype=np.int8)])
+        writer.write([], [])
+        writer.close()
+        self.assertTrue(is_store(self.filename))
+
+        store = InteractionStore(self.filename)
+        self.assertEqual(store.players, ["Alice", "Bob"])
+        self.assertEqual(len(store), 4)
+        self.assertEqual(store.columns, ["Interaction index", "Player index",
+                                         "Opponent index", "Repetition"])
+        self.assertEqual(store.actions(1).tolist(), [0, 0, 1])
+        self.assertEqual(store.actions(2).tolist(), [1] * 10)
+        self.assertEqual(store.index[(1, 0, 1)], [3])
+        self.assertEqual(store.positions(1, 0, 1), [3])
+        self.assertEqual(store.positions(1, 0, 2), [])
+        self.assertEqual(store.interaction(0, 1, 0).tolist(),
+                         [[1, 0], [0, 0], [1, 1]])
+        self.assertEqual(store.interaction(1, 0, 0).tolist(),
+                         [[0, 1], [0, 0], [1, 1]])
+        df = store.dataframe()
+        self.assertEqual(df["Repetition"].tolist(), [0, 0, 1, 1])
+        self.assertEqual(df["Repetition"].dtype, np.int64)
+        self.assertEqual([len(rows) for rows in store.chunks()], [2, 2, 0])
+        rows = store.rows
+        self.assertEqual(rows["Repetition"].tolist(), [0, 0, 1, 1])
+        with self.assertRaises(KeyError):
+            store.interaction(0, 1, 2)
+        with self.assertRaises(IndexError):
+            store.actions(4)
+
+    def _write(self, repetitions):
+        writer = InteractionWriter(self.filename, ["Alice", "Bob"],
+                                   row_dtype(build_results=False),
+                                   append=os.path.getsize(self.filename) > 0)
+        for repetition in repetitions:
+            writer.write([(repetition, 0, 1, repetition),
+                          (repetition, 1, 0, repetition)],
+                         [np.array([1, 0, 1]), np.array([0, 0, 1])])
+        writer.close()
+
+    def test_index_file(self):
+        self._write([0, 1])
+        store = InteractionStore(self.filename)
+        self.assertTrue(os.path.exists(self.filename + INDEX_SUFFIX))
+        self.assertEqual(store.positions(1, 0, 1), [3])
+
+        # The index file is read rather than the chunks of the store
+        with patch.object(InteractionStore, '_scan') as scan:
+            store = InteractionStore(self.filename)
+            self.assertEqual(store.positions(1, 0, 1), [3])
+            self.assertEqual(len(store), 4)
+        self.assertFalse(scan.called)
+
+        # It is built again once the store has changed
+        self._write([2])
+        store = InteractionStore(self.filename)
+        self.assertEqual(len(store), 6)
+        self.assertEqual(store.positions(0, 1, 2), [4])
+        self.assertEqual(store.interaction(1, 0, 2).tolist(),
+                         [[0, 1], [0, 0], [1, 1]])
+
+        # A new store removes the index of the previous one
+        writer = InteractionWriter(self.filename, ["Alice", "Bob"],
+                                   row_dtype(build_results=False))
+        writer.close()
+        self.assertFalse(os.path.exists(self.filename + INDEX_SUFFIX))
+        self.assertEqual(len(InteractionStore(self.filename)), 0)
+
+    def test_index_file_can_not_be_written(self):
+        self._write([0, 1])
+        with patch('axelrod.interaction_store.os.replace',
+                   side_effect=OSError):
+            store = InteractionStore(self.filename)
+            self.assertEqual(store.positions(0, 1, 1), [2])
+        index_filename = self.filename + INDEX_SUFFIX
+        self.assertFalse(os.path.exists(index_filename))
+        self.assertFalse(os.path.exists(
+            "{}.{}".format(index_filename, os.getpid())))
+
+    def test_truncated_chunk_is_ignored(self):
+        writer = InteractionWriter(self.filename, ["Alice", "Bob"],
+                                   row_dtype(build_results=False))
+        writer.write([(0, 0, 1, 0), (0, 1, 0, 0)],
+                     [np.array([1, 0, 1]), np.array([0, 0, 1])])
+        writer.write([(1, 0, 1, 1), (1, 1, 0, 1)],
+                     [np.array([1, 0, 1]), np.array([0, 0, 1])])
+        writer.close()
+        with open(self.filename, 'rb+') as file_obj:
+            file_obj.truncate(os.path.getsize(self.filename) - 1)
+        self.assertEqual(len(InteractionStore(self.filename)), 2)
+
+    def test_not_a_store(self):
+        with open(self.filename, 'w') as file_obj:
+            file_obj.write("Interaction index,Player index\n")
+        self.assertFalse(is_store(self.filename))
+        self.assertFalse(is_store("not_a_file"))
+        with self.assertRaises(ValueError):
+            InteractionStore(self.filename)
+
+    def test_tournament(self):
+        players = [axelrod.TitForTat(), axelrod.Random(), axelrod.Grudger()]
+        axelrod.seed(0)
+        tournament = axelrod.Tournament(players, turns=10, repetitions=2,
+                                        noise=0.1)
+        results = tournament.play(filename=self.filename, progress_bar=False)
+        store = InteractionStore(self.filename)
+        self.assertEqual(store.players, [str(p) for p in players])
+        self.assertEqual(len(store), 2 * 2 * 6)
+
+        axelrod.seed(0)
+        tournament = axelrod.Tournament(players, turns=10, repetitions=2,
+                                        noise=0.1)
+        csv_results = tournament.play(progress_bar=False)
+        self.assertEqual(results, csv_results)
+
+        interactions = iu.read_interactions_from_file(self.filename,
+                                                      progress_bar=False)
+        for (player, opponent), repetitions in interactions.items():
+            for repetition, interaction in enumerate(repetitions):
+                encoded = store.interaction(player, opponent, repetition)
+                self.assertEqual(iu.encode_interactions(interaction).tolist(),
+                                 encoded.tolist())
+        arrays = iu.read_interactions_from_file(
+            self.filename, progress_bar=False, as_arrays=True)
+        self.assertEqual(arrays[(0, 1)][1].tolist(),
+                         store.interaction(0, 1, 1).tolist())
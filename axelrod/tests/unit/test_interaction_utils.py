@@ -2,9 +2,12 @@ from collections import Counter
 import tempfile
 import unittest
 
+import numpy as np
+
 import axelrod
 from axelrod import Action
 import axelrod.interaction_utils as iu
+from axelrod.history import History
 
 
 C, D = Action.C, Action.D
@@ -110,6 +113,40 @@ class TestMatch(unittest.TestCase):
         self.assertEqual(expected_dist,
                          iu.compute_normalised_state_to_action_distribution(inter))
 
+    def test_encode_interactions(self):
+        encoded = iu.encode_interactions([(C, D), (D, D), (C, C)])
+        self.assertEqual(encoded.dtype, np.int8)
+        self.assertEqual(encoded.tolist(), [[1, 0], [0, 0], [1, 1]])
+        self.assertEqual(iu.encode_interactions([]).shape, (0, 2))
+        self.assertIs(iu.encode_interactions(encoded), encoded)
+
+    def test_summarise_interactions(self):
+        game = axelrod.Game(r=4, s=-1, t=6, p=1)
+        interactions = self.interactions[:3] + [
+            [(C, D), (D, C), (C, D), (D, C), (D, D), (C, C), (C, D)],
+            [(C, C)]]
+        for inter in interactions:
+            scores = iu.compute_final_score(inter, game)
+            turns = len(inter)
+            expected = [scores,
+                        (scores[0] - scores[1], scores[1] - scores[0]),
+                        turns,
+                        iu.compute_final_score_per_turn(inter, game),
+                        ((scores[0] - scores[1]) / turns,
+                         (scores[1] - scores[0]) / turns),
+                        tuple(map(bool, iu.compute_cooperations(inter[:1]))),
+                        iu.compute_cooperations(inter),
+                        iu.compute_state_distribution(inter),
+                        iu.compute_state_to_action_distribution(inter),
+                        iu.compute_winner_index(inter, game)]
+            for summary in (iu.summarise_interactions(inter, game),
+                            iu.summarise_interactions(
+                                iu.encode_interactions(inter), game)):
+                self.assertEqual(summary, expected)
+                self.assertIs(summary[9], expected[9])
+        self.assertIsNone(iu.summarise_interactions([]))
+        self.assertEqual(iu.summarise_interactions([(C, D)])[0], (0, 5))
+
     def test_compute_sparklines(self):
         for inter, spark in zip(self.interactions, self.sparklines):
             self.assertEqual(spark, iu.compute_sparklines(inter))
@@ -131,7 +168,135 @@ class TestMatch(unittest.TestCase):
                                                       progress_bar=False)
         self.assertEqual(expected_interactions, interactions)
 
+    def test_read_interactions_from_file_as_arrays(self):
+        tmp_file = tempfile.NamedTemporaryFile(mode='w', delete=False)
+        players = [axelrod.Cooperator(), axelrod.Defector()]
+        tournament = axelrod.Tournament(players=players, turns=2, repetitions=3)
+        tournament.play(filename=tmp_file.name)
+        tmp_file.close()
+        interactions = iu.read_interactions_from_file(
+            tmp_file.name, progress_bar=False, as_arrays=True)
+        self.assertEqual(sorted(interactions), [(0, 0), (0, 1), (1, 1)])
+        for interaction in interactions[(0, 1)]:
+            self.assertEqual(interaction.dtype, np.int8)
+            self.assertEqual(interaction.tolist(), [[1, 0], [1, 0]])
+
+    def test_string_to_values(self):
+        values = iu.string_to_values('CDDC')
+        self.assertEqual(values.dtype, np.int8)
+        self.assertEqual(values.tolist(), [1, 0, 0, 1])
+        self.assertEqual(len(iu.string_to_values('')), 0)
+
     def test_string_to_interactions(self):
         string = 'CDCDDD'
         interactions = [(C, D), (C, D), (D, D)]
         self.assertEqual(iu.string_to_interactions(string), interactions)
+
+
+class TestEncodedInteractions(unittest.TestCase):
+    """Tests that the compute_ functions give the same results for encoded
+    interactions, as NumPy arrays."""
+    interactions = TestMatch.interactions[:3] + [
+        [(C, D), (D, C), (C, D), (D, C), (D, D), (C, C), (C, D)]]
+
+    def encodings(self, interactions):
+        histories = (History([play[0] for play in interactions]),
+                     History([play[1] for play in interactions]))
+        return [iu.encode_interactions(interactions), histories]
+
+    def test_is_encoded(self):
+        self.assertTrue(iu.is_encoded(np.zeros((2, 2))))
+        self.assertTrue(iu.is_encoded((History([C]), History([D]))))
+        self.assertFalse(iu.is_encoded([(C, D)]))
+        self.assertFalse(iu.is_encoded(((C, D), (D, C))))
+
+    def test_encode_histories(self):
+        histories = (History([C, D, D]), History([D, D, C]))
+        encoded = iu.encode_interactions(histories)
+        self.assertEqual(encoded.dtype, np.int8)
+        self.assertEqual(encoded.tolist(), [[1, 0], [0, 0], [0, 1]])
+        with self.assertRaises(ValueError):
+            iu.encode_interactions((History([C]), History([C, D])))
+
+    def test_scores(self):
+        game = axelrod.Game(r=4, s=-1, t=6, p=1)
+        for inter in self.interactions:
+            for encoded in self.encodings(inter):
+                self.assertEqual(iu.compute_scores(encoded, game).tolist(),
+                                 [list(s) for s in iu.compute_scores(inter, game)])
+                self.assertEqual(
+                    tuple(iu.compute_final_score(encoded, game)),
+                    iu.compute_final_score(inter, game))
+                self.assertTrue(np.allclose(
+                    iu.compute_final_score_per_turn(encoded, game),
+                    iu.compute_final_score_per_turn(inter, game)))
+                self.assertEqual(iu.compute_winner_index(encoded, game),
+                                 iu.compute_winner_index(inter, game))
+
+    def test_cooperations(self):
+        for inter in self.interactions:
+            for encoded in self.encodings(inter):
+                self.assertEqual(tuple(iu.compute_cooperations(encoded)),
+                                 iu.compute_cooperations(inter))
+                self.assertTrue(np.allclose(
+                    iu.compute_normalised_cooperation(encoded),
+                    iu.compute_normalised_cooperation(inter)))
+
+    def test_state_distributions(self):
+        for inter in self.interactions:
+            expected = iu.compute_state_distribution(inter)
+            normalised = iu.compute_normalised_state_distribution(inter)
+            for encoded in self.encodings(inter):
+                distribution = iu.compute_state_distribution(encoded)
+                self.assertEqual(distribution.shape, (2, 2))
+                normalised_distribution = \
+                    iu.compute_normalised_state_distribution(encoded)
+                for state in iu.STATES:
+                    index = state[0].value, state[1].value
+                    self.assertEqual(distribution[index], expected[state])
+                    self.assertAlmostEqual(normalised_distribution[index],
+                                           normalised[state])
+
+    def test_state_to_action_distributions(self):
+        for inter in self.interactions:
+            expected = iu.compute_state_to_action_distribution(inter)
+            normalised = \
+                iu.compute_normalised_state_to_action_distribution(inter)
+            for encoded in self.encodings(inter):
+                distribution = iu.compute_state_to_action_distribution(encoded)
+                self.assertEqual(distribution.shape, (2, 2, 2, 2))
+                normalised_distribution = \
+                    iu.compute_normalised_state_to_action_distribution(encoded)
+                for player in range(2):
+                    for state in iu.STATES:
+                        for action in (C, D):
+                            index = (player, state[0].value, state[1].value,
+                                     action.value)
+                            self.assertEqual(distribution[index],
+                                             expected[player][(state, action)])
+                            self.assertAlmostEqual(
+                                normalised_distribution[index],
+                                normalised[player][(state, action)])
+
+    def test_sparklines(self):
+        for inter in self.interactions:
+            for encoded in self.encodings(inter):
+                self.assertEqual(iu.compute_sparklines(encoded),
+                                 iu.compute_sparklines(inter))
+                self.assertEqual(iu.compute_sparklines(encoded, 'c', 'd'),
+                                 iu.compute_sparklines(inter, 'c', 'd'))
+
+    def test_empty(self):
+        for encoded in self.encodings([]):
+            self.assertEqual(len(iu.compute_scores(encoded)), 0)
+            for function in [iu.compute_final_score,
+                             iu.compute_final_score_per_turn,
+                             iu.compute_winner_index,
+                             iu.compute_cooperations,
+                             iu.compute_normalised_cooperation,
+                             iu.compute_state_distribution,
+                             iu.compute_normalised_state_distribution,
+                             iu.compute_state_to_action_distribution,
+                             iu.compute_normalised_state_to_action_distribution,
+                             iu.compute_sparklines]:
+                self.assertIsNone(function(encoded))
@@ -0,0 +1,131 @@
+"""Tests for the exact analysis of matches between memory one players."""
+import unittest
+
+import numpy as np
+
+import axelrod
+from axelrod import Action
+from axelrod.markov import (MarkovChain, STATES, expected_length,
+                            geometric_matrix_sum, initial_distribution,
+                            is_memory_one, noisy_probabilities,
+                            transition_matrix)
+
+C, D = Action.C, Action.D
+
+
+class TestIsMemoryOne(unittest.TestCase):
+
+    def test_memory_one_players(self):
+        for player in [axelrod.WinStayLoseShift(), axelrod.GTFT(),
+                       axelrod.Joss(), axelrod.ZDExtort2(),
+                       axelrod.StochasticWSLS()]:
+            self.assertTrue(is_memory_one(player))
+
+    def test_other_players(self):
+        for player in [axelrod.TitForTat(), axelrod.Cooperator(),
+                       axelrod.ALLCorALLD(), axelrod.Grudger()]:
+            self.assertFalse(is_memory_one(player))
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_noisy_probabilities(self):
+        probabilities = [1, 0, 0.5, 0.25]
+        self.assertTrue(np.allclose(
+            noisy_probabilities(probabilities), probabilities))
+        self.assertTrue(np.allclose(
+            noisy_probabilities(probabilities, noise=0.1),
+            [0.9, 0.1, 0.5, 0.3]))
+        self.assertTrue(np.allclose(
+            noisy_probabilities(probabilities, noise=0.1, noise_bias=True),
+            [0.9, 0, 0.45, 0.225]))
+
+    def test_transition_matrix(self):
+        # Win Stay Lose Shift against Tit For Tat
+        matrix = transition_matrix((1, 0, 0, 1), (1, 0, 1, 0))
+        expected = np.array([[1, 0, 0, 0],
+                             [0, 0, 1, 0],
+                             [0, 0, 0, 1],
+                             [0, 1, 0, 0]])
+        self.assertTrue(np.array_equal(matrix, expected))
+
+        matrix = transition_matrix((0.5, 0.5, 0.5, 0.5), (1, 0, 1, 0),
+                                   noise=0.1)
+        self.assertTrue(np.allclose(matrix.sum(axis=1), 1))
+
+    def test_initial_distribution(self):
+        self.assertTrue(np.array_equal(initial_distribution(C, D),
+                                       [0, 1, 0, 0]))
+        self.assertTrue(np.allclose(initial_distribution(C, C, noise=0.5),
+                                    [0.25, 0.25, 0.25, 0.25]))
+        self.assertTrue(np.allclose(
+            initial_distribution(D, C, noise=0.5, noise_bias=True),
+            [0, 0, 0.5, 0.5]))
+
+    def test_geometric_matrix_sum(self):
+        matrix = np.array([[0.5, 0.5], [0.25, 0.75]])
+        for n in range(10):
+            expected = sum((np.linalg.matrix_power(matrix, t)
+                            for t in range(n)), np.zeros((2, 2)))
+            self.assertTrue(np.allclose(geometric_matrix_sum(matrix, n),
+                                        expected))
+
+    def test_expected_length(self):
+        self.assertEqual(expected_length(200), 200)
+        self.assertAlmostEqual(expected_length(float('inf'), 0.25), 4)
+        self.assertAlmostEqual(expected_length(2, 0.5), 1.5)
+        with self.assertRaises(ValueError):
+            expected_length(float('inf'), 0)
+
+
+class TestMarkovChain(unittest.TestCase):
+
+    def test_deterministic_chain(self):
+        """Compare with the outcome of an actual deterministic match."""
+        players = (axelrod.WinStayLoseShift(),
+                   axelrod.MemoryOnePlayer((0, 0, 1, 1), initial=D))
+        match = axelrod.Match(players, turns=7)
+        match.play()
+
+        chain = MarkovChain(players, turns=7)
+        self.assertEqual(chain.expected_length(), 7)
+        self.assertTrue(np.allclose(
+            chain.expected_state_counts(),
+            [match.state_distribution()[state] for state in STATES]))
+        self.assertTrue(np.allclose(chain.expected_cooperations(),
+                                    match.cooperation()))
+        self.assertTrue(np.allclose(chain.expected_scores(),
+                                    match.final_score()))
+
+        expected = axelrod.interaction_utils.compute_state_to_action_distribution(
+            match.result)
+        distributions = chain.expected_state_to_action_distributions()
+        for player_index in range(2):
+            for key, value in distributions[player_index].items():
+                self.assertAlmostEqual(value, expected[player_index][key])
+
+    def test_stochastic_chain(self):
+        """Compare with a sample of noisy matches."""
+        axelrod.seed(0)
+        players = (axelrod.GTFT(), axelrod.ZDExtort2())
+        match = axelrod.Match(players, turns=20, noise=0.1)
+        repetitions = 2000
+        cooperations = np.zeros(2)
+        for _ in range(repetitions):
+            match.play()
+            cooperations += match.cooperation()
+
+        chain = MarkovChain(match.players, turns=20, noise=0.1)
+        self.assertTrue(np.allclose(cooperations / repetitions,
+                                    chain.expected_cooperations(),
+                                    rtol=0.05))
+
+    def test_counts_sum_to_expected_length(self):
+        players = (axelrod.Joss(), axelrod.StochasticWSLS())
+        for turns, prob_end in [(10, 0), (10, 0.1), (float('inf'), 0.1)]:
+            chain = MarkovChain(players, turns=turns, prob_end=prob_end,
+                                noise=0.05, noise_bias=True)
+            self.assertAlmostEqual(sum(chain.expected_state_counts()),
+                                   chain.expected_length())
+            self.assertAlmostEqual(chain.expected_transition_counts().sum(),
+                                   chain.expected_length() - 1)
@@ -1,12 +1,16 @@
 from collections import Counter
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from hypothesis import given, example
 from hypothesis.strategies import integers, floats, assume
 
 import axelrod
 from axelrod import Action
-from axelrod.deterministic_cache import DeterministicCache
+from axelrod.deterministic_cache import (DeterministicCache,
+                                         PersistentDeterministicCache)
 from axelrod.tests.property import games
 
 C, D = Action.C, Action.D
@@ -176,6 +180,57 @@ class TestMatch(unittest.TestCase):
         match = axelrod.Match(players, 3, deterministic_cache=cache)
         self.assertEqual(match.play(), expected_result)
 
+    def test_play_with_persistent_cache(self):
+        file_descriptor, filename = tempfile.mkstemp(suffix=".db")
+        os.close(file_descriptor)
+        cache = PersistentDeterministicCache(filename)
+        players = (axelrod.AntiCycler(), axelrod.Alternator())
+        axelrod.Match(players, 10, deterministic_cache=cache).play()
+
+        # A longer match is played from the start and replaces the shorter
+        match = axelrod.Match(players, 25, deterministic_cache=cache)
+        with patch.object(players[0], 'play', wraps=players[0].play) as play:
+            result = match.play()
+        self.assertEqual(play.call_count, 25)
+        expected = axelrod.Match((axelrod.AntiCycler(), axelrod.Alternator()),
+                                 25).play()
+        self.assertEqual(result, expected)
+        self.assertEqual(len(cache), 1)
+
+        # Shorter matches are read from the longest one
+        match = axelrod.Match(players, 5, deterministic_cache=cache)
+        with patch.object(players[0], 'play') as play:
+            self.assertEqual(match.play(), expected[:5])
+        self.assertFalse(play.called)
+        cache.close()
+        os.remove(filename)
+
+    def test_persistent_cache_is_keyed_by_context(self):
+        file_descriptor, filename = tempfile.mkstemp(suffix=".db")
+        os.close(file_descriptor)
+        cache = PersistentDeterministicCache(filename)
+        players = (axelrod.BackStabber(), axelrod.Cooperator())
+        result = axelrod.Match(players, 10, deterministic_cache=cache).play()
+        self.assertEqual(result, [(C, C)] * 8 + [(D, C)] * 2)
+
+        # BackStabber does not defect when the length is not known
+        match = axelrod.Match(players, prob_end=0.5,
+                              deterministic_cache=cache)
+        with patch('axelrod.match.sample_length', return_value=10):
+            self.assertEqual(match.play(), [(C, C)] * 10)
+        self.assertEqual(len(cache), 2)
+
+        # Nor is a match with another game read from the cache
+        game = axelrod.Game(r=4, s=0, t=5, p=1)
+        match = axelrod.Match(players, 10, game=game,
+                              deterministic_cache=cache)
+        with patch.object(players[0], 'play', wraps=players[0].play) as play:
+            match.play()
+        self.assertEqual(play.call_count, 10)
+        self.assertEqual(len(cache), 3)
+        cache.close()
+        os.remove(filename)
+
     def test_scores(self):
         player1 = axelrod.TitForTat()
         player2 = axelrod.Defector()
@@ -324,6 +379,121 @@ class TestMatch(unittest.TestCase):
         expected_sparklines = 'XXXX\nXYXY'
         self.assertEqual(match.sparklines('X', 'Y'), expected_sparklines)
 
+    def test_analytic(self):
+        players = (axelrod.WinStayLoseShift(), axelrod.Joss())
+        match = axelrod.Match(players, turns=10, noise=0.1, analytic=True)
+        self.assertTrue(match._analytic)
+        self.assertEqual(match.play(), [])
+        self.assertIsInstance(match.markov_chain,
+                              axelrod.markov.MarkovChain)
+
+        scores = match.final_score()
+        self.assertAlmostEqual(sum(match.state_distribution().values()), 10)
+        self.assertAlmostEqual(
+            sum(match.normalised_state_distribution().values()), 1)
+        self.assertEqual(match.final_score_per_turn(),
+                         (scores[0] / 10, scores[1] / 10))
+        cooperations = match.cooperation()
+        self.assertEqual(match.normalised_cooperation(),
+                         (cooperations[0] / 10, cooperations[1] / 10))
+        self.assertIn(match.winner(), list(players) + [False])
+
+    def test_analytic_deterministic_matches_play(self):
+        players = (axelrod.WinStayLoseShift(),
+                   axelrod.MemoryOnePlayer((0, 0, 1, 1), initial=D))
+        match = axelrod.Match(players, turns=9)
+        match.play()
+        analytic_match = axelrod.Match(players, turns=9, analytic=True)
+        analytic_match.play()
+        self.assertEqual(analytic_match.final_score(), match.final_score())
+        self.assertEqual(analytic_match.cooperation(), match.cooperation())
+        self.assertEqual(analytic_match.winner(), match.winner())
+
+    def test_analytic_not_memory_one(self):
+        players = (axelrod.TitForTat(), axelrod.Joss())
+        match = axelrod.Match(players, turns=5, analytic=True)
+        self.assertFalse(match._analytic)
+        self.assertEqual(len(match.play()), 5)
+        self.assertIsNone(match.markov_chain)
+
+    def test_periodic(self):
+        for players in [(axelrod.TitForTat(), axelrod.Alternator()),
+                        (axelrod.Cooperator(), axelrod.Defector())]:
+            match = axelrod.Match(players, turns=5)
+            self.assertTrue(match._periodic)
+        for players, noise in [((axelrod.TitForTat(), axelrod.Random()), 0),
+                               ((axelrod.TitForTat(), axelrod.GoByMajority()),
+                                0),
+                               ((axelrod.TitForTat(), axelrod.Alternator()),
+                                0.1)]:
+            match = axelrod.Match(players, turns=5, noise=noise)
+            self.assertFalse(match._periodic)
+
+    def test_periodic_play_matches_play(self):
+        turns = 103
+        for strategies in [(axelrod.Colbert, axelrod.Alternator),
+                           (axelrod.ShortMem, axelrod.Defector),
+                           (axelrod.TitFor2Tats, axelrod.CyclerCCD),
+                           (axelrod.Cooperator, axelrod.Bully)]:
+            players = [s() for s in strategies]
+            match = axelrod.Match(players, turns=turns)
+            self.assertTrue(match._periodic)
+            result = match.play()
+
+            expected_players = [s() for s in strategies]
+            for player in expected_players:
+                player.set_match_attributes(length=turns)
+            for _ in range(turns):
+                expected_players[0].play(expected_players[1])
+            self.assertEqual(result, list(zip(expected_players[0].history,
+                                              expected_players[1].history)))
+            for player, expected in zip(players, expected_players):
+                self.assertEqual(player.history, expected.history)
+                self.assertEqual(player.cooperations, expected.cooperations)
+                self.assertEqual(player.defections, expected.defections)
+                self.assertEqual(player.state_distribution,
+                                 expected.state_distribution)
+                self.assertEqual(player, expected)
+
+    def test_periodic_play_with_unpicklable_state(self):
+        player = axelrod.TitForTat()
+        player.generator = (action for action in [C, D])
+        match = axelrod.Match((player, axelrod.Alternator()), turns=6)
+        self.assertEqual(match.play(), [(C, C), (C, D), (D, C), (C, D),
+                                        (D, C), (C, D)])
+
+    def test_fsm(self):
+        match = axelrod.Match((axelrod.Fortress3(), axelrod.Predator()))
+        self.assertTrue(match._fsm)
+        match = axelrod.Match((axelrod.Fortress3(), axelrod.TitForTat()))
+        self.assertFalse(match._fsm)
+
+    def test_fsm_play_matches_play(self):
+        turns = 57
+        for strategies, noise in [((axelrod.Fortress4, axelrod.Predator), 0),
+                                  ((axelrod.EvolvedFSM16, axelrod.Colbert),
+                                   0.1)]:
+            players = [s() for s in strategies]
+            match = axelrod.Match(players, turns=turns, noise=noise)
+            self.assertTrue(match._fsm)
+            axelrod.seed(1)
+            result = match.play()
+
+            expected_players = [s() for s in strategies]
+            for player in expected_players:
+                player.set_match_attributes(length=turns, noise=noise)
+            axelrod.seed(1)
+            for _ in range(turns):
+                expected_players[0].play(expected_players[1], noise)
+            self.assertEqual(result, list(zip(expected_players[0].history,
+                                              expected_players[1].history)))
+            for player, expected in zip(players, expected_players):
+                self.assertEqual(player.cooperations, expected.cooperations)
+                self.assertEqual(player.defections, expected.defections)
+                self.assertEqual(player.state_distribution,
+                                 expected.state_distribution)
+                self.assertEqual(player, expected)
+
 
 class TestSampleLength(unittest.TestCase):
     def test_sample_length(self):
@@ -4,7 +4,9 @@ from hypothesis import given, example, settings
 from hypothesis.strategies import floats, integers
 
 import axelrod
-from axelrod.match_generator import graph_is_connected
+from axelrod.match_generator import (chunk_repetitions, complete_graph,
+                                     complete_graph_pairs,
+                                     graph_is_connected)
 
 
 test_strategies = [axelrod.Cooperator, axelrod.TitForTat, axelrod.Defector,
@@ -181,6 +183,27 @@ class TestMatchGenerator(unittest.TestCase):
         self.assertEqual(sorted(match_definitions),
                          sorted(expected_match_definitions))
 
+    def test_build_match_chunks_of_a_range_of_pairs(self):
+        rr = axelrod.MatchGenerator(players=self.players, turns=test_turns,
+                                    repetitions=3)
+        pairs = [chunk[0] for chunk in rr.build_match_chunks()]
+        self.assertEqual([chunk[0] for chunk in rr.build_match_chunks(4, 9)],
+                         pairs[4:9])
+        self.assertEqual([chunk[0] for chunk in rr.build_match_chunks(12)],
+                         pairs[12:])
+        self.assertEqual(list(rr.build_match_chunks(15, 20)), [])
+
+        cycle = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 1)]
+        rr = axelrod.MatchGenerator(players=self.players, turns=test_turns,
+                                    repetitions=3, edges=cycle)
+        self.assertEqual([chunk[0] for chunk in rr.build_match_chunks(1, 3)],
+                         cycle[1:3])
+
+    def test_chunk_repetitions(self):
+        self.assertEqual(chunk_repetitions(((0, 1), {}, 5)), range(5))
+        self.assertEqual(chunk_repetitions(((0, 1), {}, range(2, 5))),
+                         range(2, 5))
+
     def test_len(self):
         turns = 5
         repetitions = 10
@@ -199,6 +222,15 @@ class TestMatchGenerator(unittest.TestCase):
 
 
 class TestUtilityFunctions(unittest.TestCase):
+
+    def test_complete_graph_pairs(self):
+        for n in range(5):
+            edges = list(complete_graph(range(n)))
+            for start in range(len(edges) + 1):
+                for stop in range(start, len(edges) + 1):
+                    self.assertEqual(
+                        list(complete_graph_pairs(n, start, stop)),
+                        edges[start:stop])
     def test_connected_graph(self):
         edges = [(0, 0), (0, 1), (1, 1)]
         players = ["Cooperator", "Defector"]
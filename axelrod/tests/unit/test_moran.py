@@ -336,6 +336,24 @@ class TestMoranProcess(unittest.TestCase):
         mp = MoranProcess((p1, p2), deterministic_cache=cache)
         self.assertEqual(cache, mp.deterministic_cache)
 
+        # A bounded cache counts the matches found in it
+        cache = axelrod.BoundedDeterministicCache(max_bytes=10000)
+        players = (axelrod.Cooperator(), axelrod.Defector(),
+                   axelrod.TitForTat())
+        mp = MoranProcess(players, turns=20, deterministic_cache=cache)
+        mp.play()
+        self.assertGreater(cache.hits, 0)
+        self.assertLessEqual(cache.misses, 6)
+        self.assertLessEqual(cache.size, 10000)
+
+    def test_analytic(self):
+        players = (axelrod.WinStayLoseShift(), axelrod.Joss())
+        mp = MoranProcess(players, turns=10, noise=0.1, analytic=True)
+        scores = mp.score_all()
+        match = axelrod.Match(players, turns=10, noise=0.1, analytic=True)
+        match.play()
+        self.assertEqual(scores, list(match.final_score_per_turn()))
+
     def test_iter(self):
         p1, p2 = axelrod.Cooperator(), axelrod.Defector()
         mp = MoranProcess((p1, p2))
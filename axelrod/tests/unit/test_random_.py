@@ -3,7 +3,7 @@ from collections import Counter
 import random
 import unittest
 import numpy
-from axelrod import random_choice, seed, Action, Pdf
+from axelrod import random_choice, seed, derive_seed, Action, Pdf
 
 C, D = Action.C, Action.D
 
@@ -41,6 +41,16 @@ class TestRandom_(unittest.TestCase):
             random_choice(p)
             self.assertEqual(r, random.random())
 
+    def test_derive_seed(self):
+        self.assertEqual(derive_seed(0, (0, 1), 2), derive_seed(0, (0, 1), 2))
+        self.assertNotEqual(derive_seed(0, (0, 1), 2),
+                            derive_seed(1, (0, 1), 2))
+        self.assertNotEqual(derive_seed(0, (0, 1), 2),
+                            derive_seed(0, (1, 0), 2))
+        self.assertNotEqual(derive_seed(0, (0, 1), 2),
+                            derive_seed(0, (0, 1), 3))
+        self.assertTrue(0 <= derive_seed(0, 1) < 2 ** 32)
+
 
 class TestPdf(unittest.TestCase):
     """A suite of tests for the Pdf class"""
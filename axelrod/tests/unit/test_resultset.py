@@ -4,12 +4,14 @@ import unittest
 
 from hypothesis import given, settings
 from numpy import mean, std, nanmedian
-from dask.dataframe.core import DataFrame
+import numpy as np
 import pandas as pd
 
 import axelrod
 import axelrod.interaction_utils as iu
-from axelrod.result_set import create_counter_dict
+from axelrod.interaction_store import KEY_COLUMNS, RESULT_COLUMNS
+from axelrod.result_set import (ResultAccumulator, add_at, group_keys,
+                                read_cooperation)
 from axelrod.tests.property import tournaments, prob_end_tournaments
 
 
@@ -207,13 +209,17 @@ class TestResultSet(unittest.TestCase):
         self.assertEqual(rs.num_players, len(self.players))
 
     def test_init_multiprocessing(self):
-        rs = axelrod.ResultSet(self.filename, self.players, self.repetitions,
-                               progress_bar=False, processes=2)
+        with self.assertWarns(DeprecationWarning):
+            rs = axelrod.ResultSet(self.filename, self.players,
+                                   self.repetitions, progress_bar=False,
+                                   processes=2)
         self.assertEqual(rs.players, self.players)
         self.assertEqual(rs.num_players, len(self.players))
 
-        rs = axelrod.ResultSet(self.filename, self.players, self.repetitions,
-                               progress_bar=False, processes=0)
+        with self.assertWarns(DeprecationWarning):
+            rs = axelrod.ResultSet(self.filename, self.players,
+                                   self.repetitions, progress_bar=False,
+                                   processes=0)
         self.assertEqual(rs.players, self.players)
         self.assertEqual(rs.num_players, len(self.players))
 
@@ -440,6 +446,42 @@ class TestResultSet(unittest.TestCase):
         for j, rate in enumerate(rs.eigenmoses_rating):
             self.assertAlmostEqual(rate, self.expected_eigenmoses_rating[j])
 
+    def test_from_accumulator(self):
+        df = pd.read_csv(self.filename,
+                         converters={"Initial cooperation": read_cooperation})
+        rows = df[KEY_COLUMNS + RESULT_COLUMNS].values.tolist()
+        accumulator = ResultAccumulator(len(self.players), self.repetitions,
+                                        score_dtype='<i8', count_dtype='<i4')
+        accumulator.add(rows[:3])
+        accumulator.add(rows[3:])
+        accumulator.add([])
+        rs = axelrod.ResultSet.from_accumulator(accumulator, self.players,
+                                                progress_bar=False)
+        self.assertIsNone(rs.filename)
+        self.assertEqual(rs.players, self.players)
+        self.assertEqual(rs.repetitions, self.repetitions)
+        self.assertEqual(rs, axelrod.ResultSet(self.filename, self.players,
+                                               self.repetitions,
+                                               progress_bar=False))
+        self.assertEqual(rs.match_lengths, self.expected_match_lengths)
+        self.assertEqual(rs.state_distribution,
+                         self.expected_state_distribution)
+        self.assertEqual(rs.initial_cooperation_count,
+                         self.expected_initial_cooperation_count)
+
+    def test_read_in_chunks(self):
+        accumulator = ResultAccumulator.read(self.filename, len(self.players),
+                                             self.repetitions, chunksize=2)
+        self.assertEqual(accumulator.pair_sums.dtype, np.int64)
+        self.assertEqual(accumulator.scores.dtype, np.int64)
+        rs = axelrod.ResultSet.from_accumulator(accumulator, self.players,
+                                                progress_bar=False)
+        self.assertEqual(rs, axelrod.ResultSet(self.filename, self.players,
+                                               self.repetitions,
+                                               progress_bar=False))
+        self.assertEqual(rs.state_distribution,
+                         self.expected_state_distribution)
+
     def test_self_interaction_for_random_strategies(self):
         # Based on https://github.com/Axelrod-Python/Axelrod/issues/670
         # Note that the conclusion of #670 is incorrect and only includes one of
@@ -1148,13 +1190,24 @@ class TestSummary(unittest.TestCase):
             self.assertTrue(0 <= player.Initial_C_rate <= 1)
 
 
-class TestCreateCounterDict(unittest.TestCase):
+class TestAddAt(unittest.TestCase):
     """Separate test for a helper function"""
     def test_basic_use(self):
-        key_map = {"Col 1": "Var 1", "Col 2": "Var 2"}
-        df = pd.DataFrame({"Col 1": [10, 20, 30], "Col 2": [1, 2, 0]},
-                          index=[[5, 6, 7], [1, 2, 3]])
-        self.assertEqual(create_counter_dict(df, 6, 2, key_map),
-                         Counter({"Var 1": 20, "Var 2": 2}))
-        self.assertEqual(create_counter_dict(df, 7, 3, key_map),
-                         Counter({"Var 1": 30}))
+        keys = (np.array([0, 1, 0, 2]), np.array([1, 0, 1, 2]))
+        values = np.array([0.1, 0.2, 0.3, 0.4])
+        expected = np.zeros((3, 3))
+        np.add.at(expected, keys, values)
+        array = np.zeros((3, 3))
+        add_at(array, group_keys(keys, array.shape), values)
+        self.assertTrue(np.array_equal(array, expected))
+
+        array = np.zeros((3, 3), dtype=np.int64)
+        add_at(array, group_keys(keys, array.shape), 1)
+        self.assertEqual(array.tolist(), [[0, 2, 0], [1, 0, 0], [0, 0, 1]])
+
+    def test_rows_of_values(self):
+        keys = (np.array([2, 0, 2]),)
+        array = np.zeros((3, 2), dtype=np.int64)
+        add_at(array, group_keys(keys, (3,)), np.array([[1, 2], [3, 4],
+                                                          [5, 6]]))
+        self.assertEqual(array.tolist(), [[3, 4], [0, 0], [6, 8]])
@@ -0,0 +1,133 @@
+"""Tests for the scheduling of the chunks of matches of a tournament."""
+import os
+import tempfile
+import unittest
+
+import axelrod
+from axelrod.match_generator import chunk_repetitions
+from axelrod.scheduling import (LONG_RUN_TIME_COST, TimingProfile,
+                                chunk_cost, expected_turns, player_costs,
+                                schedule_chunks, split_chunk)
+
+
+class TestTimingProfile(unittest.TestCase):
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp(suffix=".json")
+        os.close(file_descriptor)
+        os.remove(self.filename)
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_record_save_and_load(self):
+        player, opponent = axelrod.TitForTat(), axelrod.DBS()
+        profile = TimingProfile(self.filename)
+        self.assertNotIn(player, profile)
+        profile.record([player, opponent], seconds=2, turns=100)
+        self.assertEqual(profile.cost_per_turn(player), 0.01)
+        self.assertEqual(profile.cost_per_turn(opponent), 0.01)
+        # The time is shared in proportion to the costs of the players
+        profile.record([player, player], seconds=1, turns=100)
+        self.assertEqual(profile.timings[str(player)], [2, 300])
+        profile.record([player, opponent], seconds=10, turns=100)
+        self.assertEqual(profile.timings[str(player)], [6, 400])
+        self.assertEqual(profile.timings[str(opponent)], [7, 200])
+        profile.record([player, opponent], seconds=0, turns=0)
+        profile.save()
+
+        loaded = TimingProfile(self.filename)
+        self.assertIn(opponent, loaded)
+        self.assertEqual(loaded.timings, profile.timings)
+
+
+class TestScheduling(unittest.TestCase):
+
+    def setUp(self):
+        self.players = [axelrod.TitForTat(), axelrod.DBS(),
+                        axelrod.WinStayLoseShift(), axelrod.GTFT()]
+        self.match_generator = axelrod.MatchGenerator(
+            self.players, repetitions=10, turns=20, noise=0.1)
+
+    def test_expected_turns(self):
+        self.assertEqual(expected_turns(turns=20), 20)
+        self.assertEqual(expected_turns(prob_end=0.5), 2)
+        self.assertEqual(expected_turns(turns=20, prob_end=0.01), 20)
+        self.assertEqual(expected_turns(), float('inf'))
+
+    def test_player_costs(self):
+        self.assertEqual(player_costs(self.players),
+                         [1, LONG_RUN_TIME_COST, 1, 1])
+        profile = TimingProfile()
+        profile.timings = {str(self.players[0]): [1, 100],
+                           str(self.players[2]): [3, 100]}
+        self.assertEqual(player_costs(self.players, profile),
+                         [0.01, LONG_RUN_TIME_COST * 0.03, 0.03, 0.03])
+
+    def test_chunk_cost(self):
+        costs = [1, 2, 3, 4]
+        chunk = ((0, 1), {"turns": 20, "noise": 0.1}, 10)
+        self.assertEqual(chunk_cost(chunk, self.players, costs), 600)
+        # A deterministic match of a fixed length is played once for all
+        # repetitions
+        chunk = ((0, 1), {"turns": 20}, 10)
+        self.assertEqual(chunk_cost(chunk, self.players, costs), 60)
+        chunk = ((2, 3), {"turns": 20}, 10)
+        self.assertEqual(chunk_cost(chunk, self.players, costs), 1400)
+        chunk = ((2, 3), {"turns": 20, "prob_end": 0.5}, range(4, 8))
+        self.assertEqual(chunk_cost(chunk, self.players, costs), 56)
+        # An analytic match is computed once for all repetitions
+        chunk = ((2, 3), {"turns": 20, "analytic": True}, 10)
+        self.assertEqual(chunk_cost(chunk, self.players, costs), 140)
+
+    def test_split_chunk(self):
+        chunk = ((0, 1), {"turns": 20}, range(2, 12))
+        chunks = split_chunk(chunk, 3)
+        self.assertEqual([chunk_repetitions(c) for c in chunks],
+                         [range(2, 6), range(6, 9), range(9, 12)])
+        self.assertEqual([c[0] for c in chunks], [(0, 1)] * 3)
+        self.assertIsNot(chunks[0][1], chunks[1][1])
+        self.assertEqual(len(split_chunk(((0, 1), {}, 2), 5)), 2)
+
+    def test_schedule_chunks(self):
+        chunks = schedule_chunks(self.match_generator.build_match_chunks(),
+                                 self.players, processes=2)
+        # The chunks of DBS are split and played first
+        self.assertEqual({c[0] for c in chunks[:10]},
+                         {(0, 1), (1, 1), (1, 2), (1, 3)})
+        self.assertEqual(len(chunks), 6 + 10)
+        costs = player_costs(self.players)
+        chunk_costs = [chunk_cost(c, self.players, costs) for c in chunks]
+        self.assertEqual(chunk_costs, sorted(chunk_costs, reverse=True))
+
+        played = {}
+        for chunk in chunks:
+            played.setdefault(chunk[0], []).extend(chunk_repetitions(chunk))
+        self.assertEqual(len(played), len(self.match_generator))
+        for repetitions in played.values():
+            self.assertEqual(sorted(repetitions), list(range(10)))
+
+    def test_schedule_chunks_without_splitting(self):
+        chunks = schedule_chunks(self.match_generator.build_match_chunks(),
+                                 self.players, processes=2, split=False)
+        self.assertEqual(len(chunks), len(self.match_generator))
+        self.assertEqual({c[0] for c in chunks[:4]},
+                         {(0, 1), (1, 1), (1, 2), (1, 3)})
+
+    def test_schedule_deterministic_chunks(self):
+        match_generator = axelrod.MatchGenerator(
+            self.players[:3], repetitions=10, turns=20)
+        chunks = schedule_chunks(match_generator.build_match_chunks(),
+                                 self.players[:3], processes=2)
+        # The chunks are played once for all repetitions: they are not split
+        self.assertEqual(len(chunks), len(match_generator))
+
+    def test_schedule_uniform_chunks(self):
+        players = [axelrod.TitForTat(), axelrod.Cooperator(),
+                   axelrod.Defector()]
+        match_generator = axelrod.MatchGenerator(players, repetitions=10,
+                                                 turns=20)
+        chunks = schedule_chunks(match_generator.build_match_chunks(),
+                                 players, processes=1)
+        self.assertEqual(chunks, list(match_generator.build_match_chunks()))
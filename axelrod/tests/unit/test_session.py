@@ -0,0 +1,162 @@
+"""Tests for the sessions of worker processes."""
+from multiprocessing import cpu_count
+import os
+import tempfile
+import unittest
+
+import axelrod
+from axelrod.session import Session, n_workers
+
+
+def square(x):
+    return x * x
+
+
+def fail_on_two(x):
+    if x == 2:
+        raise ValueError("Two")
+    return x
+
+
+class Job(object):
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    def add(self, x):
+        return x + self.offset
+
+
+class TestSession(unittest.TestCase):
+
+    players = [axelrod.TitForTat(), axelrod.Grudger(), axelrod.Alternator(),
+               axelrod.WinStayLoseShift(), axelrod.Cooperator()]
+
+    def test_n_workers(self):
+        self.assertEqual(n_workers(1), 1)
+        for processes in (None, 0, cpu_count() + 1):
+            self.assertEqual(n_workers(processes), cpu_count())
+        self.assertEqual(n_workers(1, minimum=2), cpu_count())
+        self.assertEqual(n_workers(cpu_count(), minimum=2), cpu_count())
+
+    def test_processes(self):
+        self.assertEqual(Session(processes=1).processes, 1)
+        self.assertEqual(Session().processes, Session(processes=0).processes)
+
+    def test_start_and_close(self):
+        session = Session(processes=2)
+        self.assertFalse(session.running)
+        with self.assertRaises(RuntimeError):
+            session.register(Job(1))
+        with session:
+            self.assertTrue(session.running)
+            self.assertEqual(len(session._workers), session.processes)
+        self.assertFalse(session.running)
+
+    def test_map(self):
+        with Session(processes=2) as session:
+            self.assertEqual(session.map(square, range(10)),
+                             [x * x for x in range(10)])
+            self.assertEqual(session.map(square, []), [])
+            with self.assertRaises(ValueError):
+                session.map(fail_on_two, range(5))
+            # The session can still be used after an error
+            self.assertEqual(session.map(square, [3]), [9])
+
+    def test_jobs(self):
+        with Session(processes=2) as session:
+            first = session.register(Job(1))
+            second = session.register(Job(10))
+            self.assertEqual(
+                sorted(session.imap_unordered(first, 'add', [(1,), (2,)])),
+                [2, 3])
+            self.assertEqual(
+                sorted(session.imap_unordered(second, 'add', [(1,), (2,)])),
+                [11, 12])
+            session.forget(first)
+            self.assertEqual(
+                list(session.imap_unordered(second, 'add', [(0,)])), [10])
+
+    def test_unread_results_are_ignored(self):
+        with Session(processes=2) as session:
+            job = session.register(Job(1))
+            results = session.imap_unordered(job, 'add', [(1,), (2,), (3,)])
+            next(results)
+            results.close()
+            self.assertEqual(
+                list(session.imap_unordered(job, 'add', [(10,)])), [11])
+
+    def test_job_that_can_not_be_pickled(self):
+        with Session(processes=1) as session:
+            with self.assertRaises(Exception):
+                session.register(lambda x: x)
+
+    def test_tournaments(self):
+        tournament = axelrod.Tournament(self.players, turns=10,
+                                        repetitions=2)
+        expected = tournament.play(progress_bar=False)
+        file_descriptor, filename = tempfile.mkstemp()
+        os.close(file_descriptor)
+        with Session(processes=2) as session:
+            for _ in range(2):
+                results = tournament.play(session=session,
+                                          progress_bar=False)
+                self.assertEqual(results, expected)
+            results = tournament.play(session=session, progress_bar=False,
+                                      filename=filename, in_memory=True)
+            self.assertEqual(results, expected)
+        os.remove(filename)
+
+    def test_deterministic_caches(self):
+        tournament = axelrod.Tournament(self.players, turns=10,
+                                        repetitions=2)
+        with Session(processes=2) as session:
+            cache = session.deterministic_cache(tournament._cache_context())
+            self.assertIsInstance(cache, axelrod.SharedDeterministicCache)
+            self.assertIs(
+                session.deterministic_cache(tournament._cache_context()),
+                cache)
+            other = axelrod.Tournament(self.players, turns=20)
+            self.assertIsNot(
+                session.deterministic_cache(other._cache_context()), cache)
+
+            # The matches played by the workers fill the cache of the
+            # session, used by the later tournaments
+            expected = tournament.play(progress_bar=False)
+            results = tournament.play(session=session, progress_bar=False)
+            self.assertEqual(results, expected)
+            self.assertEqual(len(cache), 15)
+            results = tournament.play(session=session, progress_bar=False)
+            self.assertEqual(results, expected)
+            self.assertEqual(len(cache), 15)
+            directory = os.path.dirname(cache.file_name)
+        self.assertFalse(os.path.exists(directory))
+
+    def test_play_all(self):
+        players = [axelrod.Cooperator(), axelrod.Defector(),
+                   axelrod.TitForTat()]
+        moran_processes = [axelrod.MoranProcess(players, turns=10)
+                           for _ in range(3)]
+        with Session(processes=2) as session:
+            played = session.play_all(moran_processes)
+        for moran_process in played:
+            self.assertIsInstance(moran_process, axelrod.MoranProcess)
+            self.assertIsNotNone(moran_process.winning_strategy_name)
+        # The original processes are not played
+        self.assertEqual(len(moran_processes[0].populations), 1)
+
+    def test_fingerprints(self):
+        with Session(processes=2) as session:
+            fingerprint = axelrod.TransitiveFingerprint(
+                axelrod.TitForTat, number_of_opponents=5)
+            data = fingerprint.fingerprint(turns=10, repetitions=2,
+                                           session=session,
+                                           progress_bar=False)
+            self.assertEqual(data.shape, (5, 10))
+
+            fingerprint = axelrod.AshlockFingerprint(axelrod.TitForTat,
+                                                     axelrod.Random)
+            data = fingerprint.fingerprint(turns=10, repetitions=2,
+                                           step=0.5, session=session,
+                                           progress_bar=False)
+            self.assertEqual(len(data), 9)
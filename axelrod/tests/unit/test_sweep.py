@@ -0,0 +1,106 @@
+"""Tests for the sweeps of tournaments."""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import axelrod
+from axelrod.sweep import TournamentSweep
+
+
+class TestTournamentSweep(unittest.TestCase):
+
+    players = [axelrod.TitForTat(), axelrod.Random(), axelrod.Grudger(),
+               axelrod.Alternator()]
+    grid = {"noise": [0, 0.1], "seed": [0, 1]}
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp(suffix=".csv")
+        os.close(file_descriptor)
+        os.remove(self.filename)
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def _sweep(self, grid=None):
+        return TournamentSweep(self.players, grid or self.grid, turns=10,
+                               repetitions=2)
+
+    def test_configs(self):
+        sweep = TournamentSweep(self.players,
+                                {"seed": [0, 1], "noise": [0, 0.1],
+                                 "turns": [5]})
+        self.assertEqual(len(sweep), 4)
+        self.assertEqual(list(sweep.configs[1].items()),
+                         [("turns", 5), ("noise", 0), ("seed", 1)])
+        self.assertEqual([t.noise for t in sweep.tournaments],
+                         [0, 0, 0.1, 0.1])
+        self.assertEqual([t.seed for t in sweep.tournaments], [0, 1, 0, 1])
+        self.assertEqual(sweep.tournaments[0].turns, 5)
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            TournamentSweep(self.players, {"players": [1]})
+
+    def test_deterministic_caches(self):
+        sweep = self._sweep({"noise": [0, 0.1], "seed": [0, 1],
+                             "turns": [5, 10]})
+        tournaments = sweep.tournaments
+        self.assertIs(tournaments[0]._deterministic_cache,
+                      tournaments[1]._deterministic_cache)
+        self.assertIsNone(tournaments[2]._deterministic_cache)
+        self.assertIsNot(tournaments[0]._deterministic_cache,
+                         tournaments[4]._deterministic_cache)
+
+    def test_play(self):
+        sweep = self._sweep()
+        table = sweep.play(progress_bar=False)
+        self.assertEqual(len(table), 4 * len(self.players))
+        self.assertEqual(list(table.columns[:4]),
+                         ["Config", "noise", "seed", "Rank"])
+        self.assertEqual(sorted(sweep.results), [0, 1, 2, 3])
+        for index, results in sweep.results.items():
+            self.assertIsInstance(results, axelrod.ResultSet)
+            rows = table[table["Config"] == index]
+            self.assertEqual(list(rows["Name"]),
+                             [summary.Name for summary in results.summarise()])
+
+        # The results do not depend on the processes playing the matches
+        other = self._sweep()
+        self.assertTrue(other.play(processes=2, progress_bar=False)
+                        .equals(table))
+        self.assertEqual(other.results, sweep.results)
+        with axelrod.Session(processes=2) as session:
+            other = self._sweep()
+            self.assertTrue(other.play(session=session, progress_bar=False)
+                            .equals(table))
+
+        # As for a tournament
+        tournament = axelrod.Tournament(self.players, turns=10,
+                                        repetitions=2, noise=0.1, seed=1)
+        self.assertEqual(tournament.play(progress_bar=False),
+                         sweep.results[3])
+
+    def test_resume(self):
+        table = self._sweep().play(progress_bar=False, filename=self.filename)
+        saved = pd.read_csv(self.filename)
+        saved[saved["Config"] < 2].to_csv(self.filename, index=False)
+
+        sweep = self._sweep()
+        resumed = sweep.play(progress_bar=False, filename=self.filename)
+        self.assertEqual(sorted(sweep.results), [2, 3])
+        self.assertEqual(list(resumed["Name"]), list(table["Name"]))
+        numeric = table.select_dtypes("number").columns
+        self.assertTrue(np.allclose(resumed[numeric].astype(float),
+                                    table[numeric].astype(float)))
+
+        sweep = self._sweep()
+        sweep.play(progress_bar=False, filename=self.filename)
+        self.assertEqual(sweep.results, {})
+
+        with self.assertRaises(ValueError):
+            self._sweep({"noise": [0.2]}).play(progress_bar=False,
+                                               filename=self.filename)
@@ -2,10 +2,13 @@
 
 import csv
 import io
+import json
 import logging
 from multiprocessing import Queue, cpu_count
 import os
 import pickle
+import random
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 import warnings
@@ -576,6 +579,89 @@ class TestTournament(unittest.TestCase):
         queue_stop = done_queue.get()
         self.assertEqual(queue_stop, 'STOP')
 
+    def test_worker_with_ranges_of_pairs(self):
+        tournament = axelrod.Tournament(
+            name=self.test_name,
+            players=self.players,
+            game=self.game,
+            turns=axelrod.DEFAULT_TURNS,
+            repetitions=self.test_repetitions)
+
+        work_queue = Queue()
+        work_queue.put(range(0, 4))
+        work_queue.put(range(4, 15))
+        work_queue.put('STOP')
+
+        done_queue = Queue()
+        tournament._worker(work_queue, done_queue)
+        index_pairs = []
+        for _ in range(15):
+            index_pairs.extend(done_queue.get())
+        self.assertEqual(index_pairs,
+                         [chunk[0] for chunk in
+                          tournament.match_generator.build_match_chunks()])
+        self.assertEqual(done_queue.get(), 'STOP')
+
+    def test_parallel_play_with_shared_cache(self):
+        players = [axelrod.TitForTat(), axelrod.Grudger(),
+                   axelrod.Alternator(), axelrod.TitForTat()]
+        expected = axelrod.Tournament(players, turns=10, repetitions=2).play(
+            progress_bar=False)
+
+        # The workers share a temporary cache, removed once played
+        tournament = axelrod.Tournament(players, turns=10, repetitions=2)
+        with patch('axelrod.tournament.SharedDeterministicCache',
+                   wraps=axelrod.SharedDeterministicCache) as shared_cache:
+            results = tournament.play(processes=2, progress_bar=False)
+        self.assertEqual(results.scores, expected.scores)
+        filename = shared_cache.call_args[0][0]
+        self.assertFalse(os.path.exists(filename))
+        self.assertIsNone(tournament._deterministic_cache)
+
+        # A given cache is used by all the matches
+        cache = axelrod.DeterministicCache()
+        tournament = axelrod.Tournament(players, turns=10, repetitions=2,
+                                        deterministic_cache=cache)
+        results = tournament.play(progress_bar=False)
+        self.assertEqual(results.scores, expected.scores)
+        self.assertEqual(len(cache), 8)
+        self.assertIs(tournament._deterministic_cache, cache)
+
+        # Matches with noise do not use a cache
+        tournament = axelrod.Tournament(players, turns=10, repetitions=2,
+                                        noise=0.1)
+        with patch('axelrod.tournament.SharedDeterministicCache') as shared:
+            tournament.play(processes=2, progress_bar=False)
+        self.assertFalse(shared.called)
+
+    def test_parallel_play_with_pairs_per_task(self):
+        players = [axelrod.Random(), axelrod.GTFT(), axelrod.Grudger(),
+                   axelrod.Alternator()]
+        tournament = axelrod.Tournament(players, turns=10, repetitions=3,
+                                        noise=0.1, seed=0)
+        expected = tournament.play(progress_bar=False)
+        for pairs_per_task in (1, 3, 20):
+            self.assertEqual(
+                tournament.play(progress_bar=False, processes=2,
+                                pairs_per_task=pairs_per_task), expected)
+
+    def test_feed_work_queue(self):
+        tournament = axelrod.Tournament(players=self.players)
+        work_queue = Queue()
+        errors = []
+        tournament._feed_work_queue(work_queue, iter([1, 2]), 2, errors)
+        self.assertEqual([work_queue.get() for _ in range(4)],
+                         [1, 2, 'STOP', 'STOP'])
+        self.assertEqual(errors, [])
+
+        def tasks():
+            yield 1
+            raise ValueError("No more tasks")
+
+        tournament._feed_work_queue(work_queue, tasks(), 1, errors)
+        self.assertEqual([work_queue.get() for _ in range(2)], [1, 'STOP'])
+        self.assertIsInstance(errors[0], ValueError)
+
     def test_build_result_set(self):
         tournament = axelrod.Tournament(
             name=self.test_name,
@@ -660,6 +746,211 @@ class TestTournament(unittest.TestCase):
         for player_scores in results.scores:
             self.assertEqual(player_scores[0], player_scores[1])
 
+    def test_analytic_tournament(self):
+        players = [axelrod.WinStayLoseShift(), axelrod.GTFT(),
+                   axelrod.TitForTat()]
+        tournament = axelrod.Tournament(players, turns=10, repetitions=3,
+                                        noise=0.1, analytic=True)
+        results = tournament.play(progress_bar=False)
+        self.assertEqual(results.match_lengths[0][0], [10, 10, 10])
+
+        # Repetitions of an analytic match are identical
+        match = axelrod.Match(players[:2], turns=10, noise=0.1,
+                              analytic=True)
+        match.play()
+        expected = match.final_score_per_turn()
+        for payoff in results.payoffs[0][1]:
+            self.assertAlmostEqual(payoff, expected[0])
+        for payoff in results.payoffs[1][0]:
+            self.assertAlmostEqual(payoff, expected[1])
+        self.assertIsInstance(results.initial_cooperation_rate[0], float)
+
+    def test_deterministic_repetitions_are_played_once(self):
+        players = [axelrod.TitForTat(), axelrod.Alternator()]
+        tournament = axelrod.Tournament(players, turns=10, repetitions=4)
+        tournament._seed = None
+        match = axelrod.Match(players, turns=10)
+        with patch.object(match, 'play', wraps=match.play) as play:
+            interactions = tournament._play_repetitions(match, range(4))
+        self.assertEqual(play.call_count, 1)
+        self.assertEqual(len(interactions), 4)
+        for interaction, results in interactions:
+            self.assertEqual(interaction, match.result)
+            self.assertIs(results, interactions[0][1])
+
+        # A stochastic or probabilistically ending match is played for every
+        # repetition
+        for match in (axelrod.Match(players, turns=10, noise=0.1),
+                      axelrod.Match(players, prob_end=0.1)):
+            with patch.object(match, 'play', wraps=match.play) as play:
+                tournament._play_repetitions(match, range(4))
+            self.assertEqual(play.call_count, 4)
+
+        # So is a match of a player classified as deterministic that draws
+        # random numbers
+        class DrawingCooperator(axelrod.Cooperator):
+            def strategy(self, opponent):
+                random.random()
+                return C
+
+        match = axelrod.Match((DrawingCooperator(), axelrod.Alternator()),
+                              turns=10)
+        with patch.object(match, 'play', wraps=match.play) as play:
+            interactions = tournament._play_repetitions(match, range(4))
+        self.assertEqual(play.call_count, 4)
+        self.assertEqual(len(interactions), 4)
+
+        results = tournament.play(progress_bar=False)
+        self.assertEqual(results.match_lengths[3][0][1], 10)
+        self.assertEqual(results.scores, [[23] * 4, [28] * 4])
+
+    def test_batch_tournament(self):
+        players = [axelrod.WinStayLoseShift(), axelrod.GTFT(),
+                   axelrod.EvolvedHMM5(), axelrod.TitForTat()]
+        tournament = axelrod.Tournament(players, turns=10, repetitions=3,
+                                        noise=0.1, batch=True)
+        axelrod.seed(0)
+        results = tournament.play(progress_bar=False)
+        for repetition in results.match_lengths:
+            for lengths in repetition:
+                self.assertEqual(lengths, [10, 10, 10, 10])
+
+        # A deterministic batch of repetitions is the same as playing them
+        players = [axelrod.Fortress3(), axelrod.EvolvedLookerUp2_2_2()]
+        batch_results = axelrod.Tournament(
+            players, turns=10, repetitions=2, batch=True).play(
+                progress_bar=False)
+        results = axelrod.Tournament(players, turns=10, repetitions=2).play(
+            progress_bar=False)
+        self.assertEqual(batch_results.scores, results.scores)
+        self.assertEqual(batch_results.cooperation, results.cooperation)
+
+    def test_in_memory_play(self):
+        players = [axelrod.TitForTat(), axelrod.Grudger(),
+                   axelrod.Alternator(), axelrod.WinStayLoseShift()]
+        tournament = axelrod.Tournament(players, turns=10, repetitions=2)
+        expected = tournament.play(progress_bar=False)
+        with patch('axelrod.tournament.mkstemp') as mkstemp:
+            results = tournament.play(progress_bar=False, in_memory=True)
+            self.assertFalse(mkstemp.called)
+        self.assertIsNone(tournament.filename)
+        self.assertIsNone(results.filename)
+        self.assertEqual(results, expected)
+        self.assertEqual(results.scores, expected.scores)
+
+        results = tournament.play(progress_bar=False, in_memory=True,
+                                  processes=2)
+        self.assertEqual(results, expected)
+
+        # The interactions are still written to a given file
+        results = tournament.play(progress_bar=False, in_memory=True,
+                                  filename=self.filename)
+        self.assertEqual(results, expected)
+        self.assertEqual(axelrod.ResultSet(self.filename,
+                                           [str(p) for p in players],
+                                           repetitions=2,
+                                           progress_bar=False), expected)
+
+        # Matches that are not played by all pairs of players
+        tournament = axelrod.Tournament(players, turns=10, repetitions=2,
+                                        edges=[(0, 1), (1, 1), (2, 3)])
+        self.assertEqual(tournament.play(progress_bar=False, in_memory=True),
+                         tournament.play(progress_bar=False))
+
+    def test_play_matches_with_range_of_repetitions(self):
+        players = [axelrod.TitForTat(), axelrod.Alternator()]
+        tournament = axelrod.Tournament(players, turns=5, repetitions=4)
+        chunk = ((0, 1), {"turns": 5}, range(1, 3))
+        interactions = tournament._play_matches(chunk)
+        self.assertEqual(interactions.repetitions, range(1, 3))
+        self.assertGreaterEqual(interactions.elapsed, 0)
+        self.assertEqual(len(interactions[(0, 1)]), 2)
+
+    def test_parallel_play_with_split_chunks(self):
+        players = [axelrod.TitForTat(), axelrod.DBS(), axelrod.Grudger(),
+                   axelrod.Alternator()]
+        tournament = axelrod.Tournament(players, turns=10, repetitions=4)
+        expected = tournament.play(progress_bar=False)
+
+        profile = self.filename + ".profile.json"
+        results = tournament.play(progress_bar=False, processes=2,
+                                  filename=self.filename, profile=profile)
+        self.assertEqual(results, expected)
+        df = pd.read_csv(self.filename)
+        self.assertEqual(len(df), 4 * 2 * 10)
+        for _, group in df.groupby(["Player index", "Opponent index"]):
+            self.assertEqual(sorted(set(group["Repetition"])), [0, 1, 2, 3])
+
+        with open(profile) as profile_file:
+            timings = json.load(profile_file)
+        self.assertEqual(sorted(timings), sorted(str(p) for p in players))
+        os.remove(profile)
+
+    def test_seeded_play(self):
+        players = [axelrod.Random(), axelrod.GTFT(), axelrod.Grudger(),
+                   axelrod.Alternator()]
+
+        def play(processes=None, seed=0, session=None):
+            axelrod.seed(processes)  # The global state is not used
+            tournament = axelrod.Tournament(players, turns=10, repetitions=4,
+                                            prob_end=0.2, noise=0.1,
+                                            seed=seed)
+            return tournament.play(progress_bar=False, processes=processes,
+                                   session=session)
+
+        expected = play()
+        self.assertEqual(play(), expected)
+        self.assertEqual(play(processes=2), expected)
+        with axelrod.Session(processes=2) as session:
+            self.assertEqual(play(session=session), expected)
+        self.assertNotEqual(play(seed=1), expected)
+
+    def test_seeded_repetitions_are_independent(self):
+        players = [axelrod.Random(), axelrod.Random(0.3)]
+        tournament = axelrod.Tournament(players, turns=20, repetitions=4,
+                                        seed=0)
+        tournament._seed = tournament.seed
+        chunk = ((0, 1), {"turns": 20, "noise": 0.1}, 4)
+        interactions = tournament._play_matches(chunk)[(0, 1)]
+        for repetition in range(4):
+            chunk = ((0, 1), {"turns": 20, "noise": 0.1},
+                     range(repetition, repetition + 1))
+            self.assertEqual(tournament._play_matches(chunk)[(0, 1)],
+                             interactions[repetition:repetition + 1])
+
+    def test_seeded_batch_chunks_are_not_split(self):
+        tournament = axelrod.Tournament(self.players, batch=True, seed=0)
+        tournament._seed = tournament.seed
+        self.assertFalse(tournament._can_split_chunks())
+        tournament.batch = False
+        self.assertTrue(tournament._can_split_chunks())
+
+    def test_batch_play_matches(self):
+        players = [axelrod.WinStayLoseShift(), axelrod.EvolvedFSM4()]
+        tournament = axelrod.Tournament(players, turns=5, repetitions=4,
+                                        prob_end=0.5, batch=True)
+        chunk = next(tournament.match_generator.build_match_chunks())
+        interactions = tournament._play_matches(chunk)
+        self.assertEqual(len(interactions[(0, 0)]), 4)
+        for interaction, results in interactions[(0, 0)]:
+            self.assertLessEqual(len(interaction), 5)
+            self.assertEqual(results[2], len(interaction))
+
+    def test_calculate_expected_results(self):
+        players = (axelrod.WinStayLoseShift(),
+                   axelrod.MemoryOnePlayer((0, 0, 1, 1), initial=D))
+        tournament = axelrod.Tournament(players, turns=5)
+        match = axelrod.Match(players, turns=5)
+        interactions = match.play()
+        match = axelrod.Match(players, turns=5, analytic=True)
+        match.play()
+        expected = tournament._calculate_results(interactions)
+        results = tournament._calculate_expected_results(match.markov_chain)
+        self.assertEqual(len(results), 10)
+        for result, expected_result in zip(results[:7], expected[:7]):
+            self.assertTrue(np.allclose(result, expected_result))
+        self.assertEqual(results[9], expected[9])
+
     def test_write_interactions(self):
         tournament = axelrod.Tournament(
 
@@ -760,6 +1051,26 @@ class TestProbEndTournament(unittest.TestCase):
         self.assertEqual(results.num_players, len(tournament.players))
         self.assertEqual(results.players, [str(p) for p in tournament.players])
 
+    def test_play_with_persistent_cache(self):
+        players = [axelrod.TitForTat(), axelrod.AntiCycler(),
+                   axelrod.Alternator(), axelrod.Grudger()]
+        expected = axelrod.Tournament(players, prob_end=0.1, repetitions=5,
+                                      seed=1).play(progress_bar=False)
+        file_descriptor, filename = tempfile.mkstemp(suffix=".db")
+        os.close(file_descriptor)
+        cache = axelrod.PersistentDeterministicCache(filename)
+        for _ in range(2):
+            tournament = axelrod.Tournament(players, prob_end=0.1,
+                                            repetitions=5, seed=1,
+                                            deterministic_cache=cache)
+            results = tournament.play(progress_bar=False)
+            self.assertEqual(results.scores, expected.scores)
+            self.assertEqual(results.match_lengths, expected.match_lengths)
+        # A single entry (the longest match) per ordered pair
+        self.assertEqual(len(cache), 10)
+        cache.close()
+        os.remove(filename)
+
 
 class TestSpatialTournament(unittest.TestCase):
 
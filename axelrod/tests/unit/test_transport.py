@@ -0,0 +1,167 @@
+"""Tests for the transport of results from the workers of a tournament."""
+import io
+from multiprocessing import Process, Queue
+import os
+import unittest
+
+import numpy as np
+
+import axelrod
+from axelrod.checkpoint import Manifest
+from axelrod.interaction_store import pack_rows, row_dtype
+from axelrod.transport import (BackgroundWriter, PackedChunk, SharedSlots,
+                               SlotMessage, TextWriter, actions_to_text,
+                               pack_chunk)
+
+
+def _send(slots, records, done_queue):
+    for record in records:
+        done_queue.put(slots.send(record))
+
+
+class TestTransport(unittest.TestCase):
+
+    dtype = row_dtype(build_results=False)
+
+    def _record(self, repetitions=range(2, 4), turns=10):
+        rows = []
+        actions = []
+        for repetition in repetitions:
+            rows.extend([(0, 0, 1, repetition), (0, 1, 0, repetition)])
+            actions.extend([[1] * turns, [0, 1] * (turns // 2)])
+        array, blob = pack_rows(rows, actions, self.dtype)
+        text = "".join("{},{},{}\n".format(*row[1:]) for row in rows)
+        return pack_chunk(array, blob, repetitions, 0.5, text=text)
+
+    def test_actions_to_text(self):
+        self.assertEqual(actions_to_text(np.array([1, 0, 0, 1])), "CDDC")
+        self.assertEqual(actions_to_text(np.array([], dtype=int)), "")
+
+    def test_packed_chunk(self):
+        chunk = PackedChunk(self._record(), self.dtype)
+        self.assertEqual(chunk.repetitions, range(2, 4))
+        self.assertEqual(chunk.elapsed, 0.5)
+        self.assertEqual(list(chunk.rows["Repetition"]), [2, 2, 3, 3])
+        self.assertEqual(list(chunk.rows["Player index"]), [0, 1, 0, 1])
+        self.assertEqual(chunk.actions(0), "C" * 10)
+        self.assertEqual(chunk.actions(3), "DC" * 5)
+        self.assertEqual(chunk.counts(), {(0, 1): (2, 20)})
+        self.assertEqual(chunk.text, "0,1,2\n1,0,2\n0,1,3\n1,0,3\n")
+
+    def test_empty_packed_chunk(self):
+        chunk = PackedChunk(self._record(range(0)), self.dtype)
+        self.assertEqual(len(chunk.rows), 0)
+        self.assertEqual(chunk.counts(), {})
+
+    def test_shared_slots(self):
+        slots = SharedSlots(2)
+        records = [self._record(range(r, r + 1)) for r in range(5)]
+        done_queue = Queue()
+        process = Process(target=_send, args=(slots, records, done_queue))
+        process.start()
+        # The worker waits for the slots to be freed
+        received = [slots.receive(done_queue.get(), self.dtype)
+                    for _ in records]
+        process.join()
+        self.assertEqual([chunk.repetitions for chunk in received],
+                         [range(r, r + 1) for r in range(5)])
+        self.assertEqual(received[4].actions(1), "DC" * 5)
+
+    def test_record_larger_than_a_slot(self):
+        slots = SharedSlots(1, slot_size=16)
+        record = self._record()
+        message = slots.send(record)
+        self.assertEqual(message, SlotMessage(None, len(record), record))
+        self.assertEqual(slots.receive(message, self.dtype).counts(),
+                         {(0, 1): (2, 20)})
+
+
+class TestWriters(unittest.TestCase):
+
+    def test_text_writer(self):
+        file_obj = io.StringIO()
+        writer = TextWriter(file_obj)
+        writer.write(3, "a\nb\nc\nd\n")
+        writer.write(5, "")
+        self.assertEqual(file_obj.getvalue(), "3,a\n3,b\n4,c\n4,d\n")
+
+    def test_background_writer(self):
+        written = []
+        writer = BackgroundWriter(pending=2)
+        for value in range(10):
+            writer.submit(written.append, value)
+        writer.close()
+        self.assertEqual(written, list(range(10)))
+
+    def test_background_writer_error(self):
+        def fail(value):
+            raise ValueError(value)
+
+        writer = BackgroundWriter()
+        writer.submit(fail, 1)
+        with self.assertRaises(ValueError):
+            writer.close()
+
+
+class TestPackedTournament(unittest.TestCase):
+
+    def test_pack_chunk(self):
+        players = [axelrod.TitForTat(), axelrod.Alternator()]
+        tournament = axelrod.Tournament(players, turns=5, repetitions=3)
+        chunk = ((0, 1), {"turns": 5}, range(1, 3))
+        results = tournament._play_matches(chunk)
+        dtype = tournament._row_dtype()
+        packed = PackedChunk(tournament._pack_chunk(results), dtype)
+        self.assertEqual(packed.repetitions, range(1, 3))
+        self.assertEqual(packed.counts(), results.counts())
+        self.assertEqual(packed.actions(0), "CCDCD")
+        self.assertEqual(packed.actions(1), "CDCDC")
+        self.assertEqual(list(packed.rows["Score"]), [13, 13, 13, 13])
+
+        self.assertEqual(packed.text, "")
+
+        tournament.filename = "results.csv"
+        packed = PackedChunk(tournament._pack_chunk(results), dtype)
+        lines = packed.text.split("\n")
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[0][:38],
+                         "0,1,1,Tit For Tat,Alternator,CCDCD,13,")
+
+        tournament._accumulator = None
+        tournament.num_interactions = 4
+        tournament._write_interactions_to_file(packed, None)
+        self.assertEqual(tournament.num_interactions, 6)
+        self.assertEqual(list(packed.rows["Interaction index"]),
+                         [4, 4, 5, 5])
+
+    def test_parallel_csv_matches_serial_csv(self):
+        players = [axelrod.Random(), axelrod.GTFT(), axelrod.Grudger()]
+        for analytic in (False, True):
+            tournament = axelrod.Tournament(players, turns=5, repetitions=2,
+                                            analytic=analytic, seed=0)
+            lines = []
+            for processes in (None, 2):
+                filename = "test_outputs/test_transport.csv"
+                tournament.play(filename=filename, processes=processes,
+                                progress_bar=False)
+                with open(filename) as output:
+                    # Without the interaction index, which depends on the
+                    # order in which the chunks are played
+                    lines.append(sorted(line.split(",", 1)[1]
+                                        for line in output))
+            self.assertEqual(lines[0], lines[1])
+
+    def test_parallel_checkpoint(self):
+        players = [axelrod.Random(), axelrod.GTFT(), axelrod.Grudger()]
+        tournament = axelrod.Tournament(players, turns=5, repetitions=2,
+                                        seed=0)
+        filename = "test_outputs/test_transport_checkpoint.csv"
+        for name in (filename, filename + ".manifest"):
+            if os.path.exists(name):
+                os.remove(name)
+        results = tournament.play(filename=filename, processes=2,
+                                  checkpoint=True, progress_bar=False)
+        self.assertEqual(results, tournament.play(progress_bar=False))
+        manifest = Manifest(filename, tournament._description())
+        self.assertEqual(manifest.offset, os.path.getsize(filename))
+        self.assertEqual(manifest.num_interactions, 12)
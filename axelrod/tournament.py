@@ -1,27 +1,44 @@
-from collections import defaultdict
+import copy
 import csv
+import io
 import logging
-from multiprocessing import Process, Queue, cpu_count
+from multiprocessing import Process, Queue
 from tempfile import mkstemp
+import threading
+import time
 import warnings
 import os
 
+import numpy as np
 import tqdm
 
 from axelrod import DEFAULT_TURNS
 from axelrod.player import Player
 from axelrod.action import actions_to_str
+from .batch import is_batchable, play_repetitions, to_interactions
+from .checkpoint import Manifest
+from .deterministic_cache import DeterministicCache, SharedDeterministicCache
 from .game import Game
-from .match import Match
-from .match_generator import MatchGenerator
-from .result_set import ResultSet
+from .interaction_store import (InteractionWriter, KEY_COLUMNS,
+                                RESULT_COLUMNS, is_store_filename, pack_rows,
+                                row_dtype)
+from .match import Match, random_state
+from .match_generator import MatchGenerator, chunk_repetitions
+from .result_set import ResultAccumulator, ResultSet
+from .scheduling import (QUEUED_TASKS_PER_WORKER, TimingProfile,
+                         schedule_chunks)
+from .session import Session, n_workers
+from .transport import (BackgroundWriter, PackedChunk, SharedSlots,
+                        SLOTS_PER_WORKER, TextWriter, actions_to_text,
+                        pack_chunk)
 from axelrod.action import Action, str_to_actions
+from axelrod.random_ import derive_seed, seed
 
 import axelrod.interaction_utils as iu
 
 C, D = Action.C, Action.D
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 
 class Tournament(object):
@@ -30,7 +47,9 @@ class Tournament(object):
                  name: str = 'axelrod', game: Game = None, turns: int = None,
                  prob_end: float = None, repetitions: int = 10,
                  noise: float = 0, noise_bias: bool = False, edges: List[Tuple] = None,
-                 match_attributes: dict = None) -> None:
+                 match_attributes: dict = None, analytic: bool = False,
+                 batch: bool = False, seed: int = None,
+                 deterministic_cache: DeterministicCache = None) -> None:
         """
         Parameters
         ----------
@@ -56,6 +75,25 @@ class Tournament(object):
             Mapping attribute names to values which should be passed to players.
             The default is to use the correct values for turns, game and noise
             but these can be overridden if desired.
+        analytic : bool
+            If True, matches between two memory one players are not played:
+            each repetition records their exact expected outcome instead.
+        batch : bool
+            If True, all the repetitions of a match between two players
+            supported by axelrod.batch (memory one, lookup table, hidden
+            Markov model and finite state machine players) are simulated at
+            once with NumPy.
+        seed : int
+            If given, every repetition of every match is played from its own
+            random seed, derived from this one, the player indices and the
+            repetition (see axelrod.derive_seed). The results then do not
+            depend on the number of processes or on the order in which the
+            matches are played.
+        deterministic_cache : axelrod.DeterministicCache
+            A cache of the results of the deterministic matches, used by all
+            the matches of the tournament. If None, the matches played in
+            parallel (without noise) share a SharedDeterministicCache: a
+            temporary one or the one of the session.
         """
         if game is None:
             self.game = Game()
@@ -68,6 +106,9 @@ class Tournament(object):
         self.players = players
         self.repetitions = repetitions
         self.edges = edges
+        self.analytic = analytic
+        self.batch = batch
+        self.seed = seed
 
         if turns is None and prob_end is None:
             turns = DEFAULT_TURNS
@@ -81,12 +122,22 @@ class Tournament(object):
                                               noise=self.noise,
                                               noise_bias=self.noise_bias,
                                               edges=edges,
-                                              match_attributes=match_attributes)
+                                              match_attributes=match_attributes,
+                                              analytic=analytic)
         self._logger = logging.getLogger(__name__)
 
         self.use_progress_bar = True
         self.filename = None  # type: str
         self._temp_file_descriptor = None  # type: int
+        self._accumulator = None  # type: ResultAccumulator
+        self._manifest = None  # type: Manifest
+        self._profile = None  # type: TimingProfile
+        self._repetitions_left = None  # type: dict
+        self._background_writer = None  # type: BackgroundWriter
+        # The seed of the repetitions played: the seed of the tournament or
+        # of its checkpoint
+        self._seed = None  # type: int
+        self._deterministic_cache = deterministic_cache
 
     def setup_output(self, filename=None):
         """assign/create `filename` to `self`. If file should be deleted once
@@ -101,7 +152,9 @@ class Tournament(object):
 
     def play(self, build_results: bool = True, filename: str = None,
              processes: int = None, progress_bar: bool = True,
-             ) -> ResultSet:
+             in_memory: bool = False, checkpoint: bool = False,
+             profile: str = None, session: Session = None,
+             pairs_per_task: int = None) -> ResultSet:
         """
         Plays the tournament and passes the results to the ResultSet class
 
@@ -110,11 +163,41 @@ class Tournament(object):
         build_results : bool
             whether or not to build a results st
         filename : string
-            name of output file
+            name of output file: a binary interaction store (see
+            axelrod.interaction_store) if it ends with '.axl' and a CSV file
+            otherwise
         processes : integer
             The number of processes to be used for parallel processing
         progress_bar : bool
             Whether or not to create a progress bar which will be updated
+        in_memory : bool
+            If True, the results of the matches are accumulated in memory as
+            they are played and the result set is built from them: no
+            temporary file is written and no file is read back. The
+            interactions are still written if a filename is given.
+        checkpoint : bool
+            If True, the completed chunks of matches are recorded in a
+            manifest next to the output file (see axelrod.checkpoint) and
+            every repetition is played from its own seed (derived from the
+            seed of the tournament or from a random one if it has none).
+            Playing the tournament
+            again with the same filename resumes it: only the chunks that
+            were not completed are played and appended to the file. The
+            result set is then read from the file. Requires a filename.
+        profile : string
+            The name of a JSON file of the measured time per turn of the
+            players (see axelrod.scheduling.TimingProfile). It is used to
+            schedule the matches when playing in parallel and is updated with
+            the timings of the matches played.
+        session : axelrod.Session
+            A started session: the matches are played by its worker
+            processes (and `processes` is ignored).
+        pairs_per_task : int
+            When playing in parallel (with `processes`), the workers are sent
+            ranges of this many pairs of players and build their chunks of
+            matches themselves. The memory used to feed the workers then does
+            not grow with the number of players, but the matches are not
+            scheduled longest first.
 
         Returns
         -------
@@ -124,24 +207,61 @@ class Tournament(object):
 
         self.use_progress_bar = progress_bar
 
-        self.setup_output(filename)
+        self._manifest = None
+        self._seed = self.seed
+        if checkpoint:
+            if filename is None:
+                raise ValueError(
+                    "A filename is required to checkpoint a tournament.")
+            self._manifest = Manifest(filename,
+                                      self._description(build_results),
+                                      seed=self.seed)
+            self.num_interactions = self._manifest.num_interactions
+            self._seed = self._manifest.seed
+
+        self._profile = None
+        if profile is not None:
+            self._profile = TimingProfile(profile)
+
+        self._accumulator = None
+        if in_memory and build_results and not checkpoint:
+            score_dtype, count_dtype = self._result_dtypes()
+            self._accumulator = ResultAccumulator(
+                len(self.players), self.repetitions,
+                score_dtype=score_dtype, count_dtype=count_dtype)
+
+        if self._accumulator is not None and filename is None:
+            self.filename = None
+            self._temp_file_descriptor = None
+        else:
+            self.setup_output(filename)
 
         if not build_results and not filename:
             warnings.warn(
                 "Tournament results will not be accessible since "
                 "build_results=False and no filename was supplied.")
 
-        if processes is None:
+        if session is not None:
+            self._run_session(session, build_results=build_results)
+        elif processes is None:
             self._run_serial(build_results=build_results)
         else:
-            self._run_parallel(build_results=build_results, processes=processes)
+            self._run_parallel(build_results=build_results, processes=processes,
+                               pairs_per_task=pairs_per_task)
+
+        if self._profile is not None:
+            self._profile.save()
 
         result_set = None
-        if build_results:
+        if self._accumulator is not None:
+            result_set = ResultSet.from_accumulator(
+                self._accumulator, players=[str(p) for p in self.players],
+                progress_bar=progress_bar)
+            self._accumulator = None
+        elif build_results:
             result_set = ResultSet(filename=self.filename,
                                    players=[str(p) for p in self.players],
                                    repetitions=self.repetitions,
-                                   processes=processes,
                                    progress_bar=progress_bar)
         if self._temp_file_descriptor is not None:
             os.close(self._temp_file_descriptor)
@@ -150,10 +270,65 @@ class Tournament(object):
         return result_set
 
 
+    def _description(self, build_results: bool = True) -> dict:
+        """A description of the tournament, used to check that a checkpoint
+        is resumed by the same tournament."""
+        return {"players": [str(p) for p in self.players],
+                "repetitions": self.repetitions,
+                "turns": self.turns,
+                "prob_end": self.prob_end,
+                "noise": self.noise,
+                "noise_bias": self.noise_bias,
+                "game": self.game.RPST(),
+                "edges": self.edges,
+                "analytic": self.analytic,
+                "batch": self.batch,
+                "build_results": build_results}
+
+    def _build_match_chunks(self, start: int = 0, stop: int = None):
+        """The chunks of matches to play (of the pairs of players from the
+        position start to stop): all of them, or (when resuming a
+        checkpointed tournament) the repetitions of the matches that are not
+        recorded as completed."""
+        chunks = self.match_generator.build_match_chunks(start, stop)
+        if self._manifest is None:
+            return chunks
+        return ((index_pair, match_params, repetitions)
+                for index_pair, match_params, total in chunks
+                for repetitions in self._manifest.remaining(
+                    (index_pair, match_params, total)))
+
+    def _finish_chunk(self, results, out_file, progress_bar):
+        """Once the interactions of a chunk are written: record the chunk in
+        the manifest and the timing profile (if any) and update the progress
+        bar when all the repetitions of a match are played."""
+        repetitions = getattr(results, "repetitions", None)
+        if self._manifest is not None:
+            out_file.flush()
+            for index_pair in results.counts():
+                key = (tuple(index_pair), (repetitions.start,
+                                           repetitions.stop))
+                self._manifest.record(key, self.num_interactions,
+                                      out_file.tell())
+
+        if self._profile is not None:
+            for index_pair, (_, turns) in results.counts().items():
+                self._profile.record([self.players[i] for i in index_pair],
+                                     results.elapsed, turns)
+
+        if progress_bar is not None:
+            for index_pair, (played, _) in results.counts().items():
+                left = self._repetitions_left.get(index_pair,
+                                                  self.repetitions)
+                left -= played
+                self._repetitions_left[index_pair] = left
+                if left <= 0:
+                    progress_bar.update(1)
+
     def _run_serial(self, build_results: bool=True) -> bool:
         """Run all matches in serial."""
 
-        chunks = self.match_generator.build_match_chunks()
+        chunks = self._build_match_chunks()
 
         out_file, writer = self._get_file_objects(build_results)
         progress_bar = self._get_progress_bar()
@@ -161,9 +336,7 @@ class Tournament(object):
         for chunk in chunks:
             results = self._play_matches(chunk, build_results=build_results)
             self._write_interactions_to_file(results, writer=writer)
-
-            if self.use_progress_bar:
-                progress_bar.update(1)
+            self._finish_chunk(results, out_file, progress_bar)
 
         _close_objects(out_file, progress_bar)
 
@@ -171,103 +344,208 @@ class Tournament(object):
 
     def _get_file_objects(self, build_results=True):
         """Returns the file object and writer for writing results or
-        (None, None) if self.filename is None"""
+        (None, None) if self.filename is None. For a binary interaction store
+        the writer is also the file object."""
         file_obj = None
         writer = None
+        # When resuming a checkpointed tournament, the interactions of the
+        # completed chunks are kept and the others are appended
+        append = self._manifest is not None and self._manifest.resuming
+        if append:
+            with open(self.filename, 'r+b') as existing_file:
+                existing_file.truncate(self._manifest.offset)
+
+        if self.filename is not None and is_store_filename(self.filename):
+            writer = InteractionWriter(self.filename,
+                                       [str(p) for p in self.players],
+                                       self._row_dtype(build_results),
+                                       append=append)
+            return writer, writer
+
         if self.filename is not None:
-            file_obj = open(self.filename, 'w')
+            file_obj = open(self.filename, 'a' if append else 'w')
             writer = csv.writer(file_obj, lineterminator='\n')
+            if append:
+                return file_obj, writer
 
-            header = ["Interaction index",
-                      "Player index",
-                      "Opponent index",
-                      "Repetition",
-                      "Player name",
-                      "Opponent name",
-                      "Actions"]
+            header = KEY_COLUMNS + ["Player name",
+                                    "Opponent name",
+                                    "Actions"]
             if build_results:
-                header.extend(["Score",
-                               "Score difference",
-                               "Turns",
-                               "Score per turn",
-                               "Score difference per turn",
-                               "Win",
-                               "Initial cooperation",
-                               "Cooperation count",
-                               "CC count",
-                               "CD count",
-                               "DC count",
-                               "DD count",
-                               "CC to C count",
-                               "CC to D count",
-                               "CD to C count",
-                               "CD to D count",
-                               "DC to C count",
-                               "DC to D count",
-                               "DD to C count",
-                               "DD to D count",
-                               "Good partner"])
+                header.extend(RESULT_COLUMNS)
 
             writer.writerow(header)
         return file_obj, writer
 
+    def _result_dtypes(self):
+        """Returns the dtypes of the scores and of the counts of the results:
+        floats for the expected values of analytic matches."""
+        if self.analytic:
+            return '<f8', '<f8'
+        return self.game.payoff_table().dtype.str, '<i4'
+
     def _get_progress_bar(self):
         if self.use_progress_bar:
+            # The number of repetitions left to play for each match, as a
+            # chunk may hold part of the repetitions of a match
+            self._repetitions_left = {}
+            initial = 0
+            if self._manifest is not None:
+                for chunk in self.match_generator.build_match_chunks():
+                    left = sum(len(repetitions) for repetitions in
+                               self._manifest.remaining(chunk))
+                    self._repetitions_left[tuple(chunk[0])] = left
+                    initial += left == 0
             return tqdm.tqdm(total=self.match_generator.size,
-                             desc="Playing matches")
+                             initial=initial, desc="Playing matches")
         return None
 
+    def _interaction_rows(self, index_pair, results, interaction_index,
+                          repetition):
+        """Return the rows (with the numeric columns of the tournament file)
+        of the two players of a match repetition."""
+        if results is not None:
+            (scores,
+             score_diffs,
+             turns, score_per_turns,
+             score_diffs_per_turns,
+             initial_cooperation,
+             cooperations,
+             state_distribution,
+             state_to_action_distributions,
+             winner_index) = results
+        rows = []
+        for index, player_index in enumerate(index_pair):
+            opponent_index = index_pair[index - 1]
+            row = [interaction_index, player_index, opponent_index,
+                   repetition]
+
+            if results is not None:
+                row.append(scores[index])
+                row.append(score_diffs[index])
+                row.append(turns)
+                row.append(score_per_turns[index])
+                row.append(score_diffs_per_turns[index])
+                row.append(int(winner_index is index))
+                row.append(initial_cooperation[index])
+                row.append(cooperations[index])
+
+                states = [(C, C), (C, D), (D, C), (D, D)]
+                if index == 1:
+                    states = [s[::-1] for s in states]
+                for state in states:
+                    row.append(state_distribution[state])
+                for state in states:
+                    row.append(state_to_action_distributions[index][(state, C)])
+                    row.append(state_to_action_distributions[index][(state, D)])
+
+                row.append(int(cooperations[index] >= cooperations[index - 1]))
+            rows.append(row)
+        return rows
+
     def _write_interactions_to_file(self, results, writer):
-        """Write the interactions to csv."""
+        """Write the interactions to csv or to a binary interaction store
+        (if there is a writer) and accumulate their results in memory (if
+        required)."""
+        if isinstance(results, PackedChunk):
+            return self._write_packed_chunk(results, writer)
+        store = isinstance(writer, InteractionWriter)
+        rows = []
+        histories = []
+        first_repetition = getattr(results, "repetitions", range(0)).start
         for index_pair, interactions in results.items():
-            repetition = 0
+            repetition = first_repetition
             for interaction, results in interactions:
-
-                if results is not None:
-                    (scores,
-                     score_diffs,
-                     turns, score_per_turns,
-                     score_diffs_per_turns,
-                     initial_cooperation,
-                     cooperations,
-                     state_distribution,
-                     state_to_action_distributions,
-                     winner_index) = results
-                for index, player_index in enumerate(index_pair):
-                    opponent_index = index_pair[index - 1]
-                    row = [self.num_interactions, player_index, opponent_index,
-                           repetition]
-                    row.append(str(self.players[player_index]))
-                    row.append(str(self.players[opponent_index]))
-                    history = actions_to_str([i[index] for i in interaction])
-                    row.append(history)
-
-                    if results is not None:
-                        row.append(scores[index])
-                        row.append(score_diffs[index])
-                        row.append(turns)
-                        row.append(score_per_turns[index])
-                        row.append(score_diffs_per_turns[index])
-                        row.append(int(winner_index is index))
-                        row.append(initial_cooperation[index])
-                        row.append(cooperations[index])
-
-                        states = [(C, C), (C, D), (D, C), (D, D)]
-                        if index == 1:
-                            states = [s[::-1] for s in states]
-                        for state in states:
-                            row.append(state_distribution[state])
-                        for state in states:
-                            row.append(state_to_action_distributions[index][(state, C)])
-                            row.append(state_to_action_distributions[index][(state, D)])
-
-                        row.append(int(cooperations[index] >= cooperations[index - 1]))
-
-                    writer.writerow(row)
+                if store:
+                    actions = iu.encode_interactions(interaction)
+                interaction_rows = self._interaction_rows(
+                    index_pair, results, self.num_interactions, repetition)
+                for index, row in enumerate(interaction_rows):
+                    if store or self._accumulator is not None:
+                        rows.append(row)
+                    if store:
+                        histories.append(actions[:, index])
+                    elif writer is not None:
+                        player_index, opponent_index = row[1:3]
+                        history = actions_to_str(
+                            [i[index] for i in interaction])
+                        writer.writerow(
+                            row[:4] + [str(self.players[player_index]),
+                                       str(self.players[opponent_index]),
+                                       history] + row[4:])
                 repetition += 1
                 self.num_interactions += 1
 
-    def _run_parallel(self, processes: int=2, build_results: bool=True) -> bool:
+        if store:
+            writer.write(rows, histories)
+        if self._accumulator is not None:
+            self._accumulator.add(rows)
+
+    def _pack_chunk(self, results, build_results=True) -> bytes:
+        """Pack the interactions and results of a chunk of matches (and their
+        CSV lines if the tournament writes a CSV file) into a record (see
+        axelrod.transport), in a worker process."""
+        rows = []
+        histories = []
+        text = None
+        if self.filename is not None and not is_store_filename(self.filename):
+            text = io.StringIO()
+            csv_writer = csv.writer(text, lineterminator='\n')
+        for index_pair, interactions in results.items():
+            repetition = results.repetitions.start
+            for interaction, match_results in interactions:
+                actions = iu.encode_interactions(interaction)
+                # The interaction index is set by the parent process
+                interaction_rows = self._interaction_rows(
+                    index_pair, match_results, 0, repetition)
+                for index, row in enumerate(interaction_rows):
+                    rows.append(row)
+                    histories.append(actions[:, index])
+                    if text is not None:
+                        player_index, opponent_index = row[1:3]
+                        csv_writer.writerow(
+                            row[1:4] + [str(self.players[player_index]),
+                                        str(self.players[opponent_index]),
+                                        actions_to_text(actions[:, index])] +
+                            row[4:])
+                repetition += 1
+        array, blob = pack_rows(rows, histories, self._row_dtype(build_results))
+        return pack_chunk(array, blob, results.repetitions, results.elapsed,
+                          text=text.getvalue() if text is not None else '')
+
+    def _write_packed_chunk(self, results: PackedChunk, writer):
+        """Write the rows of a chunk packed by a worker process (with a
+        background writer if there is one) and accumulate their results in
+        memory (if required)."""
+        rows = results.rows
+        first_index = self.num_interactions
+        rows["Interaction index"] = first_index + np.arange(len(rows)) // 2
+        self.num_interactions += len(rows) // 2
+
+        if isinstance(writer, InteractionWriter):
+            self._submit_write(writer.write_packed, rows, results.blob)
+        elif isinstance(writer, TextWriter):
+            self._submit_write(writer.write, first_index, results.text)
+        if self._accumulator is not None:
+            columns = KEY_COLUMNS + RESULT_COLUMNS
+            self._accumulator.add(np.column_stack(
+                [rows[column].astype(np.float64) for column in columns]))
+
+    def _submit_write(self, function, *args):
+        if self._background_writer is not None:
+            self._background_writer.submit(function, *args)
+        else:
+            function(*args)
+
+    def _row_dtype(self, build_results=True):
+        """The dtype of the rows of a binary interaction store or of a packed
+        chunk."""
+        score_dtype, count_dtype = self._result_dtypes()
+        return row_dtype(build_results, score_dtype=score_dtype,
+                         count_dtype=count_dtype)
+
+    def _run_parallel(self, processes: int=2, build_results: bool=True,
+                      pairs_per_task: int = None) -> bool:
         """
         Run all matches in parallel
 
@@ -276,22 +554,138 @@ class Tournament(object):
 
         processes : int
             How many processes to use.
+        pairs_per_task : int
+            If given, the workers build the chunks of matches themselves
+            from ranges of this many pairs of players (rather than being
+            sent scheduled chunks).
         """
         # At first sight, it might seem simpler to use the multiprocessing Pool
         # Class rather than Processes and Queues. However, this way is faster.
-        work_queue = Queue()  # type: Queue
-        done_queue = Queue()  # type: Queue
         workers = self._n_workers(processes=processes)
+        # The work queue is bounded and fed by a thread as the workers take
+        # the tasks, so that the tasks are not all held by the queue
+        work_queue = Queue(workers * QUEUED_TASKS_PER_WORKER)  # type: Queue
+        done_queue = Queue()  # type: Queue
 
-        chunks = self.match_generator.build_match_chunks()
-        for chunk in chunks:
-            work_queue.put(chunk)
+        if pairs_per_task is None:
+            tasks = schedule_chunks(self._build_match_chunks(), self.players,
+                                    processes=workers, profile=self._profile,
+                                    split=self._can_split_chunks())
+        else:
+            size = len(self.match_generator)
+            tasks = (range(start, min(start + pairs_per_task, size))
+                     for start in range(0, size, pairs_per_task))
+
+        # The results are packed by the workers and sent through shared
+        # memory (see axelrod.transport)
+        slots = SharedSlots(workers * SLOTS_PER_WORKER)
+
+        # The results of the deterministic matches played by a worker are
+        # found by the others in a cache shared through a temporary file
+        cache_filename = None
+        if self._deterministic_cache is None and not self.noise:
+            cache_descriptor, cache_filename = mkstemp(suffix='.cache')
+            os.close(cache_descriptor)
+            self._deterministic_cache = SharedDeterministicCache(
+                cache_filename)
+
+        try:
+            self._start_workers(workers, work_queue, done_queue,
+                                build_results, slots=slots, stops=False)
+
+            errors = []  # type: List[Exception]
+            feeder = threading.Thread(
+                target=self._feed_work_queue,
+                args=(work_queue, tasks, workers, errors), daemon=True)
+            feeder.start()
+            self._process_done_queue(workers, done_queue, build_results,
+                                     slots=slots)
+            feeder.join()
+            if errors:
+                raise errors[0]
+        finally:
+            if cache_filename is not None:
+                self._deterministic_cache.close()
+                self._deterministic_cache = None
+                os.remove(cache_filename)
+
+        return True
+
+    def _feed_work_queue(self, work_queue: Queue, tasks, workers: int,
+                         errors: list) -> None:
+        """Put the tasks and then a 'STOP' for every worker on the work
+        queue (waiting while it is full). An exception raised while building
+        the tasks is appended to the errors."""
+        try:
+            for task in tasks:
+                work_queue.put(task)
+        except Exception as exception:
+            errors.append(exception)
+        finally:
+            for _ in range(workers):
+                work_queue.put('STOP')
+
+    def _run_session(self, session: Session,
+                     build_results: bool = True) -> bool:
+        """
+        Run all matches in the worker processes of a session.
 
-        self._start_workers(workers, work_queue, done_queue, build_results)
-        self._process_done_queue(workers, done_queue, build_results)
+        Parameters
+        ----------
+        session : axelrod.Session
+            A started session
+        """
+        chunks = schedule_chunks(self._build_match_chunks(), self.players,
+                                 processes=session.processes,
+                                 profile=self._profile,
+                                 split=self._can_split_chunks())
+
+        out_file, writer = self._get_file_objects(build_results)
+        progress_bar = self._get_progress_bar()
+
+        # The tournament (with its players) is sent once to every worker and
+        # only the chunks are sent with every task
+        job_id = session.register(self._session_job(session))
+        try:
+            for results in session.imap_unordered(
+                    job_id, '_play_matches',
+                    ((chunk, build_results) for chunk in chunks)):
+                self._write_interactions_to_file(results, writer)
+                self._finish_chunk(results, out_file, progress_bar)
+        finally:
+            session.forget(job_id)
 
+        _close_objects(out_file, progress_bar)
         return True
 
+    def _can_split_chunks(self) -> bool:
+        """Whether the chunks can be split between processes without
+        changing the results: not when all the repetitions of a batch are
+        played from the seed of the chunk."""
+        return self._seed is None or not self.batch
+
+    def _session_job(self, session: Session = None) -> 'Tournament':
+        """A copy of the tournament to send to the workers of a session,
+        without the state that is only used to collect the results. Without
+        a cache of its own, the copy uses the shared cache of the session for
+        the matches of the tournament (if they have no noise)."""
+        job = copy.copy(self)
+        job._accumulator = None
+        job._profile = None
+        job._repetitions_left = None
+        if (session is not None and self._deterministic_cache is None and
+                not self.noise):
+            job._deterministic_cache = session.deterministic_cache(
+                self._cache_context())
+        return job
+
+    def _cache_context(self) -> tuple:
+        """The parameters (other than the players and the number of turns)
+        the cached results of the deterministic matches depend on: only the
+        tournaments with the same context can share a cache."""
+        return (self.turns, self.prob_end, self.game.RPST(),
+                repr(self.match_generator.match_attributes))
+
     def _n_workers(self, processes: int = 2) -> int:
         """
         Determines the number of parallel processes to use.
@@ -300,14 +694,11 @@ class Tournament(object):
         -------
         integer
         """
-        if (2 <= processes <= cpu_count()):
-            n_workers = processes
-        else:
-            n_workers = cpu_count()
-        return n_workers
+        return n_workers(processes, minimum=2)
 
     def _start_workers(self, workers: int, work_queue: Queue,
-                       done_queue: Queue, build_results: bool=True) -> bool:
+                       done_queue: Queue, build_results: bool=True,
+                       slots: SharedSlots = None, stops: bool = True) -> bool:
         """
         Initiates the sub-processes to carry out parallel processing.
 
@@ -319,16 +710,25 @@ class Tournament(object):
             A queue containing an entry for each round robin to be processed
         done_queue : multiprocessing.Queue
             A queue containing the output dictionaries from each round robin
+        slots : axelrod.transport.SharedSlots
+            The shared memory the packed results are sent through (if None,
+            the output dictionaries are put on the done queue)
+        stops : bool
+            Whether to put a 'STOP' on the work queue for every worker (or
+            leave it to the feeder of the queue)
         """
         for worker in range(workers):
             process = Process(
-                target=self._worker, args=(work_queue, done_queue, build_results))
-            work_queue.put('STOP')
+                target=self._worker,
+                args=(work_queue, done_queue, build_results, slots))
+            if stops:
+                work_queue.put('STOP')
             process.start()
         return True
 
     def _process_done_queue(self, workers: int, done_queue: Queue,
-                            build_results: bool=True):
+                            build_results: bool=True,
+                            slots: SharedSlots = None):
         """
         Retrieves the matches from the parallel sub-processes
 
@@ -338,26 +738,46 @@ class Tournament(object):
             The number of sub-processes in existence
         done_queue : multiprocessing.Queue
             A queue containing the output dictionaries from each round robin
+        slots : axelrod.transport.SharedSlots
+            The shared memory the packed results are read from
         """
         out_file, writer = self._get_file_objects(build_results)
         progress_bar = self._get_progress_bar()
-
-        stops = 0
-        while stops < workers:
-            results = done_queue.get()
-            if results == 'STOP':
-                stops += 1
-            else:
-                self._write_interactions_to_file(results, writer)
-
-                if self.use_progress_bar:
-                    progress_bar.update(1)
+        dtype = self._row_dtype(build_results)
+
+        if slots is not None:
+            # The CSV lines are formatted by the workers
+            if writer is not None and not isinstance(writer,
+                                                     InteractionWriter):
+                writer = TextWriter(out_file)
+            # The chunks are written by a thread while the next ones are
+            # read, unless the size of the file must be recorded once each
+            # chunk is written
+            if writer is not None and self._manifest is None:
+                self._background_writer = BackgroundWriter()
+
+        try:
+            stops = 0
+            while stops < workers:
+                results = done_queue.get()
+                if results == 'STOP':
+                    stops += 1
+                else:
+                    if slots is not None:
+                        results = slots.receive(results, dtype)
+                    self._write_interactions_to_file(results, writer)
+                    self._finish_chunk(results, out_file, progress_bar)
+        finally:
+            if self._background_writer is not None:
+                background_writer = self._background_writer
+                self._background_writer = None
+                background_writer.close()
 
         _close_objects(out_file, progress_bar)
         return True
 
     def _worker(self, work_queue: Queue, done_queue: Queue,
-                build_results: bool=True):
+                build_results: bool=True, slots: SharedSlots = None):
         """
         The work for each parallel sub-process to execute.
 
@@ -365,12 +785,24 @@ class Tournament(object):
         ----------
         work_queue : multiprocessing.Queue
             A queue containing an entry for each round robin to be processed
+            (a chunk of matches or a range of positions of pairs of players
+            to build the chunks of)
         done_queue : multiprocessing.Queue
             A queue containing the output dictionaries from each round robin
+        slots : axelrod.transport.SharedSlots
+            The shared memory the packed results are sent through
         """
-        for chunk in iter(work_queue.get, 'STOP'):
-            interactions = self._play_matches(chunk, build_results)
-            done_queue.put(interactions)
+        for task in iter(work_queue.get, 'STOP'):
+            if isinstance(task, range):
+                chunks = self._build_match_chunks(task.start, task.stop)
+            else:
+                chunks = [task]
+            for chunk in chunks:
+                interactions = self._play_matches(chunk, build_results)
+                if slots is not None:
+                    interactions = slots.send(
+                        self._pack_chunk(interactions, build_results))
+                done_queue.put(interactions)
         done_queue.put('STOP')
         return True
 
@@ -381,23 +813,100 @@ class Tournament(object):
         Parameters
         ----------
         chunk : tuple (index pair, match_parameters, repetitions)
-            match_parameters are also a tuple: (turns, game, noise)
+            match_parameters are also a tuple: (turns, game, noise) and
+            repetitions is a number of repetitions or a range of repetitions
 
         Returns
         -------
-        interactions : dictionary
+        interactions : ChunkInteractions
             Mapping player index pairs to results of matches:
 
                 (0, 1) -> [(C, D), (D, C),...]
         """
-        interactions = defaultdict(list)
-        index_pair, match_params, repetitions = chunk
+        start = time.perf_counter()
+        index_pair, match_params, _ = chunk
+        repetitions = chunk_repetitions(chunk)
+        if self._seed is not None:
+            # For the players drawing random numbers when they are built
+            seed(derive_seed(self._seed, tuple(index_pair)))
         p1_index, p2_index = index_pair
         player1 = self.players[p1_index].clone()
         player2 = self.players[p2_index].clone()
         match_params["players"] = (player1, player2)
+        if self._deterministic_cache is not None:
+            match_params["deterministic_cache"] = self._deterministic_cache
         match = Match(**match_params)
-        for _ in range(repetitions):
+
+        interactions = ChunkInteractions(repetitions)
+        interactions[index_pair] = self._play_repetitions(
+            match, repetitions, build_results, index_pair=index_pair)
+        interactions.elapsed = time.perf_counter() - start
+        return interactions
+
+    def _play_repetitions(self, match, repetitions: range,
+                          build_results=True, index_pair=None):
+        """Play the repetitions of a match and return the list of the
+        interactions and results of each repetition. Analytic matches and
+        deterministic matches of a fixed length are played once for all their
+        repetitions. If the tournament is seeded, every repetition is played
+        from a seed derived from the seed of the tournament, the player index
+        pair and the repetition (a batch of repetitions is played from a seed
+        derived from its range)."""
+        player1, player2 = match.players
+        if isinstance(repetitions, int):
+            repetitions = range(repetitions)
+        seeded = self._seed is not None
+        index_pair = tuple(index_pair) if index_pair is not None else None
+
+        if match._analytic:
+            # The expected outcome is the same for every repetition
+            match.play()
+            if build_results:
+                results = self._calculate_expected_results(match.markov_chain)
+            else:
+                results = None
+            return [[match.result, results] for _ in repetitions]
+
+        interactions = []
+        if (not match._stochastic and not match.prob_end and
+                len(repetitions) > 0):
+            # Every repetition of a deterministic match of a fixed length
+            # has the same outcome: it is played once
+            if seeded:
+                seed(derive_seed(self._seed, index_pair, repetitions.start))
+            before = random_state()
+            match.play()
+            if build_results:
+                results = self._calculate_results(match.result)
+            else:
+                results = None
+            if random_state() == before:
+                return [[match.result, results] for _ in repetitions]
+            # Some players are classified as deterministic but still draw
+            # random numbers: the other repetitions are played
+            interactions.append([match.result, results])
+            repetitions = repetitions[1:]
+
+        if self.batch and is_batchable(player1) and is_batchable(player2):
+            # All repetitions are simulated at once
+            if seeded:
+                seed(derive_seed(self._seed, index_pair,
+                                 (repetitions.start, repetitions.stop)))
+            for actions in play_repetitions(
+                    (player1, player2), turns=match.turns,
+                    repetitions=len(repetitions), noise=match.noise,
+                    noise_bias=match.noise_bias, prob_end=match.prob_end):
+                interaction = to_interactions(actions)
+                if build_results:
+                    results = self._calculate_results(actions)
+                else:
+                    results = None
+                interactions.append([interaction, results])
+            return interactions
+
+        for repetition in repetitions:
+            if seeded:
+                seed(derive_seed(self._seed, index_pair, repetition))
             match.play()
 
             if build_results:
@@ -405,48 +914,87 @@ class Tournament(object):
             else:
                 results = None
 
-            interactions[index_pair].append([match.result, results])
+            interactions.append([match.result, results])
         return interactions
 
     def _calculate_results(self, interactions):
+        """Return the results of a set of interactions (a list of pairs of
+        actions or their encoding as an array) to be written to file."""
+        return iu.summarise_interactions(interactions, self.game)
+
+    def _calculate_expected_results(self, markov_chain):
+        """
+        Return the exact expected values of the results computed by
+        `_calculate_results` for a match between two memory one players.
+        """
         results = []
 
-        scores = iu.compute_final_score(interactions, self.game)
+        scores = markov_chain.expected_scores(self.game)
         results.append(scores)
 
         score_diffs = scores[0] - scores[1], scores[1] - scores[0]
         results.append(score_diffs)
 
-        turns = len(interactions)
+        turns = markov_chain.expected_length()
         results.append(turns)
 
-        score_per_turns = iu.compute_final_score_per_turn(interactions,
-                                                          self.game)
+        score_per_turns = scores[0] / turns, scores[1] / turns
         results.append(score_per_turns)
 
         score_diffs_per_turns = score_diffs[0] / turns, score_diffs[1] / turns
         results.append(score_diffs_per_turns)
 
-        initial_coops = tuple(map(
-                                bool,
-                                iu.compute_cooperations(interactions[:1])))
+        initial = markov_chain.initial_distribution
+        initial_coops = (initial[0] + initial[1], initial[0] + initial[2])
         results.append(initial_coops)
 
-        cooperations = iu.compute_cooperations(interactions)
+        cooperations = markov_chain.expected_cooperations()
         results.append(cooperations)
 
-        state_distribution = iu.compute_state_distribution(interactions)
+        state_distribution = markov_chain.expected_state_distribution()
         results.append(state_distribution)
 
-        state_to_action_distributions = iu.compute_state_to_action_distribution(interactions)
+        state_to_action_distributions = \
+            markov_chain.expected_state_to_action_distributions()
         results.append(state_to_action_distributions)
 
-        winner_index = iu.compute_winner_index(interactions, self.game)
+        if scores[0] == scores[1]:
+            winner_index = False
+        else:
+            winner_index = max([0, 1], key=lambda i: scores[i])
         results.append(winner_index)
 
         return results
 
 
+class ChunkInteractions(dict):
+    """
+    The interactions of a chunk of matches: a dictionary mapping the player
+    index pair to the interactions and results of each repetition played.
+
+    Attributes
+    ----------
+    repetitions : range
+        The range of the repetitions played
+    elapsed : float
+        The time taken to play the chunk (in seconds)
+    """
+
+    def __init__(self, repetitions: range = range(0),
+                 elapsed: float = 0) -> None:
+        super().__init__()
+        self.repetitions = repetitions
+        self.elapsed = elapsed
+
+    def counts(self) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """Map every player index pair to the number of repetitions and the
+        total number of turns played."""
+        return {index_pair: (len(interactions),
+                             sum(len(interaction)
+                                 for interaction, _ in interactions))
+                for index_pair, interactions in self.items()}
+
+
 def _close_objects(*objs):
     """If the objects have a `close` method, closes them."""
     for obj in objs:
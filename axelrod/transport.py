@@ -0,0 +1,221 @@
+"""
+Transport of the results of the chunks of matches played by the worker
+processes of a parallel tournament to the parent process.
+
+Rather than putting the interactions (lists of pairs of actions) and results
+(counters...) of every chunk on a queue, where they are pickled and
+unpickled, a worker packs them into a compact record:
+
+- a header with the number of rows, the size of the packed actions, the size
+  of the text, the range of repetitions and the time taken to play the chunk,
+- the rows as a NumPy structured array (as in a binary interaction store,
+  see axelrod.interaction_store), one row per player per repetition,
+- the actions of the player of each row packed to one bit each,
+- when the tournament writes a CSV file, the rows formatted as CSV lines
+  without their first column (the interaction index, which is only known by
+  the parent).
+
+The record is copied into a free slot of a block of shared memory and only
+the slot and the size of the record are put on the queue. The parent reads
+the record from the slot and frees it. As a worker waits for a free slot,
+the workers can not get far ahead of the parent.
+
+The parent hands the writes to a BackgroundWriter, so that it keeps reading
+records while a thread writes to the output file.
+"""
+from collections import namedtuple
+from multiprocessing import SimpleQueue
+from multiprocessing.sharedctypes import RawArray
+import queue
+import struct
+import threading
+
+import numpy as np
+
+from typing import Callable, Dict, Tuple
+
+SLOT_SIZE = 1 << 18
+SLOTS_PER_WORKER = 4
+PENDING_WRITES = 64
+
+_HEADER = struct.Struct('<QQQqqd')
+_ACTIONS = bytes.maketrans(b'\x00\x01', b'DC')
+
+# A record in a slot of shared memory (data is None) or, for a record that
+# does not fit in a slot, the record itself
+SlotMessage = namedtuple('SlotMessage', ['slot', 'size', 'data'])
+
+
+def actions_to_text(values: np.ndarray) -> str:
+    """The values of actions (C = 1, D = 0) as a string of C and D."""
+    values = np.asarray(values, dtype=np.uint8)
+    return values.tobytes().translate(_ACTIONS).decode('ascii')
+
+
+def pack_chunk(rows: np.ndarray, blob: bytes, repetitions: range,
+               elapsed: float, text: str = '') -> bytes:
+    """Pack the rows (with the Interaction index column left to the parent)
+    and actions of a chunk of matches, as given by
+    axelrod.interaction_store.pack_rows, and their CSV lines (if any) into a
+    record."""
+    text = text.encode('utf-8')
+    header = _HEADER.pack(len(rows), len(blob), len(text), repetitions.start,
+                          repetitions.stop, elapsed)
+    return b''.join([header, rows.tobytes(), blob, text])
+
+
+class PackedChunk(object):
+    """
+    The results of a chunk of matches read from a record.
+
+    Attributes
+    ----------
+    rows : numpy.ndarray
+        The rows as a structured array
+    blob : bytes
+        The packed actions of the rows
+    repetitions : range
+        The range of the repetitions played
+    elapsed : float
+        The time taken to play the chunk (in seconds)
+    text : str
+        The CSV lines of the rows, without their interaction index
+    """
+
+    def __init__(self, record, dtype: np.dtype) -> None:
+        """
+        Parameters
+        ----------
+        record : bytes-like
+            A record, as given by pack_chunk
+        dtype : numpy.dtype
+            The dtype of the rows
+        """
+        record = memoryview(record)
+        (n_rows, size, text_size, start, stop,
+         self.elapsed) = _HEADER.unpack_from(record)
+        self.repetitions = range(start, stop)
+        offset = _HEADER.size
+        self.rows = np.frombuffer(record, dtype=dtype, count=n_rows,
+                                  offset=offset).copy()
+        offset += n_rows * dtype.itemsize
+        self.blob = record[offset:offset + size].tobytes()
+        offset += size
+        self.text = record[offset:offset + text_size].tobytes().decode(
+            'utf-8')
+
+    def counts(self) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """Map every player index pair to the number of repetitions and the
+        total number of turns played."""
+        counts = {}
+        players = self.rows["Player index"]
+        opponents = self.rows["Opponent index"]
+        # The two rows of a repetition are consecutive, the first one is for
+        # the first player of the pair
+        for position in range(0, len(self.rows), 2):
+            index_pair = (int(players[position]), int(opponents[position]))
+            repetitions, turns = counts.get(index_pair, (0, 0))
+            counts[index_pair] = (
+                repetitions + 1,
+                turns + int(self.rows["Actions length"][position]))
+        return counts
+
+    def actions(self, position: int) -> str:
+        """The actions of the player of a row, as a string of C and D."""
+        row = self.rows[position]
+        length = int(row["Actions length"])
+        offset = int(row["Actions offset"])
+        packed = np.frombuffer(self.blob, dtype=np.uint8,
+                               count=(length + 7) // 8, offset=offset)
+        return actions_to_text(np.unpackbits(packed)[:length])
+
+
+class SharedSlots(object):
+    """
+    A block of shared memory split into slots of the same size, with a queue
+    of the free slots. It must be built before the worker processes are
+    started.
+    """
+
+    def __init__(self, slots: int, slot_size: int = SLOT_SIZE) -> None:
+        self.slot_size = slot_size
+        self.buffer = RawArray('B', slots * slot_size)
+        self.free = SimpleQueue()  # type: SimpleQueue
+        for slot in range(slots):
+            self.free.put(slot)
+
+    def send(self, record: bytes) -> SlotMessage:
+        """Copy a record into a free slot (waiting for one) and return the
+        message to put on a queue (in a worker process)."""
+        if len(record) > self.slot_size:
+            return SlotMessage(None, len(record), record)
+        slot = self.free.get()
+        start = slot * self.slot_size
+        view = memoryview(self.buffer).cast('B')
+        view[start:start + len(record)] = record
+        return SlotMessage(slot, len(record), None)
+
+    def receive(self, message: SlotMessage, dtype: np.dtype) -> PackedChunk:
+        """Read the record of a message and free its slot (in the parent
+        process)."""
+        if message.slot is None:
+            return PackedChunk(message.data, dtype)
+        start = message.slot * self.slot_size
+        view = memoryview(self.buffer).cast('B')
+        chunk = PackedChunk(view[start:start + message.size], dtype)
+        self.free.put(message.slot)
+        return chunk
+
+
+class TextWriter(object):
+    """Write the CSV lines of packed chunks to a file, with their interaction
+    indices."""
+
+    def __init__(self, file_obj) -> None:
+        self.file_obj = file_obj
+
+    def write(self, first_index: int, text: str) -> None:
+        """Write the lines of a chunk: two lines (one per player) for every
+        interaction, numbered from the given index."""
+        lines = text.split('\n')[:-1]
+        self.file_obj.write(''.join(
+            '{},{}\n'.format(first_index + position // 2, line)
+            for position, line in enumerate(lines)))
+
+
+class BackgroundWriter(object):
+    """
+    Make the writes of the parent process in a thread, in the order they are
+    submitted. At most PENDING_WRITES writes are waiting at any time: a write
+    submitted when they are waits for the thread. An exception raised by a
+    write is raised again by the next submission or by `close`.
+    """
+
+    def __init__(self, pending: int = PENDING_WRITES) -> None:
+        self._queue = queue.Queue(pending)  # type: queue.Queue
+        self._error = None  # type: Exception
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        for function, args in iter(self._queue.get, None):
+            # After an error the writes are dropped, so that submissions do
+            # not wait for ever
+            if self._error is None:
+                try:
+                    function(*args)
+                except Exception as exception:
+                    self._error = exception
+
+    def submit(self, function: Callable, *args) -> None:
+        """Call a function with the given arguments in the thread."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put((function, args))
+
+    def close(self) -> None:
+        """Wait for all the writes to be made."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
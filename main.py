@@ -1,3 +1,5 @@
+from functools import partial
+
 import axelrod as axl
 import typing
 import sys, inspect
@@ -19,8 +21,7 @@ def do_axelrod_tournament(players: list, output_file_name: str,
         prob_end: The probability of ending a match between a pair of players after each game
         seed: random seed for the current tournament (for reproducibility)
     """
-    axl.seed(seed)
-    tournament = axl.Tournament(players, noise=noise, noise_bias=noise_bias, prob_end=prob_end)  # Create a tournament
+    tournament = axl.Tournament(players, noise=noise, noise_bias=noise_bias, prob_end=prob_end, seed=seed)  # Create a tournament
     results = tournament.play()  # Play the tournament
     plot = axl.Plot(results)
     plot.boxplot()
@@ -59,6 +60,10 @@ def do_case_tournament(players: list, output_file_name: str,
     plt.savefig(output_file_name, format='png', bbox_inches='tight')
     plt.close()
 
+def run_job(job) -> None:
+    """Run a tournament or a simulation (a partial function call)."""
+    job()
+
 # The list of agents playing in the Axelrod's first tournament, except Graaskamp
 axl_first_players = [
     axl.TitForTat(),
@@ -159,32 +164,39 @@ best_players = [
 # Seed list. Contains twenty different seeds
 seeds = [1, 771923, 1143728, 291358764, 901236547, 4750670, 511161, 603276, 83281327, 34293471, 918273645, 135792468, 243165978, 9100021, 43238133, 0, 19192831, 5665363, 2231145, 123456]
 
-players = []
-player_name = ''
-for i in range(5):
-    if i == 0:
-        players = axl_first_players
-        player_name = 'axelrod_first'
-    elif i == 1:
-        players = axl_first_players + axl_second_players
-        player_name = 'axelrod_second'
-    elif i == 2:
-        players = case_players
-        player_name = 'case'
-    elif i == 3:
-        players = steward_plotkin_players + case_players
-        player_name = 'steward_plotkin'
-    else:
-        players = best_players
-        player_name = 'best'
-    for seed in seeds:
-        do_axelrod_tournament(players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_seed_' + str(seed) + '.png', seed=seed, prob_end=0.005)
-        do_axelrod_tournament(players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_noise_0.05_seed_' + str(seed) + '.png', seed=seed, prob_end=0.005, noise=0.05)
-        do_axelrod_tournament(players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_noise_0.05_biasnoise_seed_' + str(seed) + '.png', seed=seed, prob_end=0.005, noise=0.05, noise_bias=True)
-        do_axelrod_tournament(players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_noise_0.2_seed_' + str(seed) + '.png', seed=seed, noise=0.2, prob_end=0.005)
-        do_axelrod_tournament(players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_noise_0.2_biasnoise_seed_' + str(seed) + '.png', seed=seed, noise=0.2, prob_end=0.005, noise_bias=True)
-        do_case_tournament(players, 'tournament_case_players_' + player_name + '_param_turns_200_seed_' + str(seed) + '.png', turns=200, maximum_round=50, seed=seed, prob_end=0.005)
-        do_case_tournament(players, 'tournament_case_players_' + player_name + '_param_turns_200_round_50_noise_0.05_seed_'  + str(seed) + '.png', turns=200, maximum_round=50, noise=0.05, seed=seed, prob_end=0.005)
-        do_case_tournament(players, 'tournament_case_players_' + player_name + '_param_turns_200_round_50_noise_0.2_seed_' + str(seed) + '.png', turns=200, maximum_round=50, noise=0.2, seed=seed, prob_end=0.005)
-        do_case_tournament(players, 'tournament_case_players_' + player_name + '_param_turns_200_round_50_noise_0.05_biasnoise_seed_'  + str(seed) + '.png', turns=200, maximum_round=50, noise=0.05, noise_bias=True, seed=seed, prob_end=0.005)
-        do_case_tournament(players, 'tournament_case_players_' + player_name + '_param_turns_200_round_50_noise_0.2_biasnoise_seed_'  + str(seed) + '.png', turns=200, maximum_round=50, noise=0.2, noise_bias=True, seed=seed, prob_end=0.005)
\ No newline at end of file
+if __name__ == "__main__":
+    jobs = []
+    players = []
+    player_name = ''
+    for i in range(5):
+        if i == 0:
+            players = axl_first_players
+            player_name = 'axelrod_first'
+        elif i == 1:
+            players = axl_first_players + axl_second_players
+            player_name = 'axelrod_second'
+        elif i == 2:
+            players = case_players
+            player_name = 'case'
+        elif i == 3:
+            players = steward_plotkin_players + case_players
+            player_name = 'steward_plotkin'
+        else:
+            players = best_players
+            player_name = 'best'
+        for seed in seeds:
+            jobs.append(partial(do_axelrod_tournament, players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_seed_' + str(seed) + '.png', seed=seed, prob_end=0.005))
+            jobs.append(partial(do_axelrod_tournament, players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_noise_0.05_seed_' + str(seed) + '.png', seed=seed, prob_end=0.005, noise=0.05))
+            jobs.append(partial(do_axelrod_tournament, players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_noise_0.05_biasnoise_seed_' + str(seed) + '.png', seed=seed, prob_end=0.005, noise=0.05, noise_bias=True))
+            jobs.append(partial(do_axelrod_tournament, players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_noise_0.2_seed_' + str(seed) + '.png', seed=seed, noise=0.2, prob_end=0.005))
+            jobs.append(partial(do_axelrod_tournament, players, 'tournament_axelrod_players_' + player_name + '_param_turns_200_prob_end_0.005_noise_0.2_biasnoise_seed_' + str(seed) + '.png', seed=seed, noise=0.2, prob_end=0.005, noise_bias=True))
+            jobs.append(partial(do_case_tournament, players, 'tournament_case_players_' + player_name + '_param_turns_200_seed_' + str(seed) + '.png', turns=200, maximum_round=50, seed=seed, prob_end=0.005))
+            jobs.append(partial(do_case_tournament, players, 'tournament_case_players_' + player_name + '_param_turns_200_round_50_noise_0.05_seed_'  + str(seed) + '.png', turns=200, maximum_round=50, noise=0.05, seed=seed, prob_end=0.005))
+            jobs.append(partial(do_case_tournament, players, 'tournament_case_players_' + player_name + '_param_turns_200_round_50_noise_0.2_seed_' + str(seed) + '.png', turns=200, maximum_round=50, noise=0.2, seed=seed, prob_end=0.005))
+            jobs.append(partial(do_case_tournament, players, 'tournament_case_players_' + player_name + '_param_turns_200_round_50_noise_0.05_biasnoise_seed_'  + str(seed) + '.png', turns=200, maximum_round=50, noise=0.05, noise_bias=True, seed=seed, prob_end=0.005))
+            jobs.append(partial(do_case_tournament, players, 'tournament_case_players_' + player_name + '_param_turns_200_round_50_noise_0.2_biasnoise_seed_'  + str(seed) + '.png', turns=200, maximum_round=50, noise=0.2, noise_bias=True, seed=seed, prob_end=0.005))
+
+    # The tournaments and simulations are independent (each one sets its own seed)
+    # so they are run by the worker processes of a single session
+    with axl.Session() as session:
+        session.map(run_job, jobs)
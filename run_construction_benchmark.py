@@ -0,0 +1,48 @@
+"""
+Benchmark the construction of every strategy in axelrod.strategies.
+
+The init parameters of a player are bound using a spec of its __init__
+method that is computed once per class. This script times constructing (and
+cloning) the full list of strategies with that cache, and with the cache
+cleared before each construction, which is the cost of inspecting the
+signature of __init__ every time.
+
+Usage: python run_construction_benchmark.py [repetitions]
+"""
+import sys
+import timeit
+
+import axelrod as axl
+
+
+def clear_init_specs(classes):
+    """Remove the cached __init__ specs of the given classes."""
+    for cls in classes:
+        for class_ in cls.mro():
+            if '_cached_init_spec' in class_.__dict__:
+                delattr(class_, '_cached_init_spec')
+
+
+def construct(strategies, cached=True):
+    for strategy in strategies:
+        if not cached:
+            clear_init_specs([strategy])
+        strategy().clone()
+
+
+def main(repetitions=10):
+    strategies = axl.strategies
+    construct(strategies)  # Warm up the imports and the cache
+    uncached = timeit.timeit(lambda: construct(strategies, cached=False),
+                             number=repetitions) / repetitions
+    cached = timeit.timeit(lambda: construct(strategies, cached=True),
+                           number=repetitions) / repetitions
+    print("Constructing and cloning {} strategies:".format(len(strategies)))
+    print("    without the init spec cache: {:.4f}s".format(uncached))
+    print("    with the init spec cache:    {:.4f}s".format(cached))
+    print("    speedup: {:.2f}x".format(uncached / cached))
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    main(repetitions)